@@ -6,22 +6,49 @@ de l'application (jeu, login, WebSocket) et gère le démarrage
 du serveur HTTP/HTTPS.
 
 Fonctionnalités principales :
-- Servir les fichiers statiques (HTML, JS, CSS)
-- Initialiser l'objet Game pour gérer l'état de la partie
-- Enregistrer les routes HTTP et WebSocket
+- Servir les fichiers statiques (CSS, JS, images, polices) depuis la
+  mémoire, avec des URL versionnées (StaticAssets)
+- Initialiser le registre des salles (RoomManager) pour gérer les parties,
+  borné en nombre de salles et de spectateurs, et nettoyé périodiquement
+  (RoomReaper)
+- Écrire les parties terminées par lots (GameWriter)
+- Relier les workers par un bus de messages (Backplane), afin que les
+  joueurs d'une salle partagent un seul plateau
+- Compiler les templates au démarrage et servir les pages rendues depuis
+  la mémoire (TemplateCache)
+- Signer les jetons de session (SessionManager) avec une clé partagée
+  par les workers
+- Limiter la taille et le débit des messages WebSocket (MessageGuard)
+- Enregistrer les routes HTTP, WebSocket et de métriques
 - Démarrer le serveur en HTTP (ou HTTPS si SSL activé)
 """
+from functools import partial
 from sanic import Sanic
-from classes.Game import Game
+from classes.ConnectionPool import ConnectionPool
+from classes.DBExecutor import DBExecutor
+from classes.GameWriter import GameWriter
+from classes.GridGame import create_game
+from classes.LeaderboardHelper import LeaderboardHelper
+from classes.LocalBackplane import LocalBackplane
+from classes.MessageGuard import MessageGuard
+from classes.RoomManager import RoomManager
+from classes.RoomReaper import RoomReaper
+from classes.SessionManager import SessionManager
+from classes.SQLiteBackplane import SQLiteBackplane
+from classes.StaticAssets import StaticAssets
+from classes.TemplateCache import TemplateCache
 from routes.game_routes import register_game_routes
 from routes.login_routes import register_login_routes
+from routes.static_routes import register_static_routes
+from routes.stats_routes import register_stats_routes
 from routes.websocket_routes import register_websocket_routes
 
 # Création de l'application Sanic
 app = Sanic("TicTacToe")
 
-# Servir les fichiers statiques pour les chemins src="" dans le HTML
-app.static('/', './')
+# Fichiers statiques (css, js, img, fonts) préparés au démarrage : seuls
+# ces dossiers sont servis, depuis la mémoire, avec des URL versionnées
+assets = StaticAssets(".")
 
 # Configuration SSL pour HTTPS (certificat et clé privée)
 ssl = {
@@ -29,13 +56,157 @@ ssl = {
     "key": "../cert/privkey.pem",
 }
 
-# Initialisation de l'objet Game pour gérer l'état du plateau
-game = Game()
+# Base de données des utilisateurs et des parties (ajustable avec
+# SANIC_DB_PATH)
+db_path = app.config.get("DB_PATH", "tictactoe.db")
 
-# Enregistrement des routes
-register_game_routes(app)
-register_login_routes(app)
-register_websocket_routes(app, game)
+# Leaderboard partagé, complété périodiquement par les parties
+# enregistrées en base par tous les workers (délai en secondes, ajustable
+# avec SANIC_LEADERBOARD_REFRESH)
+leaderboard = LeaderboardHelper(
+    db_path=db_path,
+    refresh_interval=float(app.config.get(
+        "LEADERBOARD_REFRESH", LeaderboardHelper.REFRESH_INTERVAL
+    )),
+)
+
+# Tampon d'écriture groupée des parties terminées : le leaderboard lit
+# les parties de chaque lot dès qu'il est écrit
+writer = GameWriter(
+    db_path, on_write=lambda written: leaderboard.schedule_refresh()
+)
+
+# Initialisation du registre des salles, chacune avec son propre plateau
+# (3×3 en bits par défaut, ou N×N selon les options de la salle). Les
+# limites sont ajustables avec SANIC_MAX_ROOMS et SANIC_MAX_SPECTATORS.
+rooms = RoomManager(
+    game_factory=partial(create_game, leaderboard=leaderboard, writer=writer),
+    max_rooms=int(app.config.get("MAX_ROOMS", 10_000)),
+    max_spectators=int(app.config.get("MAX_SPECTATORS", 100)),
+)
+
+# Nettoyage des salles inactives et des clients qui ne répondent plus aux
+# pings (délais en secondes, ajustables avec SANIC_ROOM_IDLE_TIMEOUT,
+# SANIC_ROOM_WAITING_TIMEOUT et SANIC_ROOM_PING_TIMEOUT)
+reaper = RoomReaper(
+    rooms,
+    idle_timeout=float(
+        app.config.get("ROOM_IDLE_TIMEOUT", RoomReaper.IDLE_TIMEOUT)
+    ),
+    waiting_timeout=float(
+        app.config.get("ROOM_WAITING_TIMEOUT", RoomReaper.WAITING_TIMEOUT)
+    ),
+    ping_timeout=float(
+        app.config.get("ROOM_PING_TIMEOUT", RoomReaper.PING_TIMEOUT)
+    ),
+)
+
+# Bus de messages entre workers : en mémoire pour un seul worker, ou
+# SQLite pour plusieurs workers (variable d'environnement
+# SANIC_BACKPLANE=sqlite, avec `sanic app:app --workers=N`). Les salles
+# d'un worker arrêté sont reprises après l'expiration de son bail (en
+# secondes, ajustable avec SANIC_BACKPLANE_LEASE).
+if app.config.get("BACKPLANE") == "sqlite":
+    backplane = SQLiteBackplane(
+        "backplane.db",
+        lease=float(app.config.get("BACKPLANE_LEASE", SQLiteBackplane.LEASE)),
+    )
+else:
+    backplane = LocalBackplane()
+
+# Jetons de session signés, vérifiés sans accès à la base de données.
+# La clé est partagée par tous les workers : variable d'environnement
+# SANIC_SESSION_SECRET, ou fichier session.key créé au premier démarrage.
+# Les révocations (/logout) sont partagées par la base de données.
+sessions = SessionManager(
+    app.config.get("SESSION_SECRET")
+    or SessionManager.load_secret("session.key"),
+    db_path=db_path,
+)
+
+# Limitation des messages WebSocket : débit par connexion et par
+# utilisateur (messages par seconde, ajustable avec SANIC_WS_RATE et
+# SANIC_WS_USER_RATE) et taille maximale d'un message
+guard = MessageGuard(
+    rate=float(app.config.get("WS_RATE", 10)),
+    burst=int(app.config.get("WS_BURST", 20)),
+    user_rate=float(app.config.get("WS_USER_RATE", 20)),
+    user_burst=int(app.config.get("WS_USER_BURST", 40)),
+)
+
+# Les trames plus grandes que la limite du filtre (un caractère UTF-8 fait
+# au plus 4 octets) sont refusées par le protocole avant d'être lues en
+# entier (fermeture 1009) ; MessageGuard reste une seconde protection
+app.config.WEBSOCKET_MAX_SIZE = 4 * guard.max_frame_size
+
+# Templates compilés au démarrage et pages rendues conservées en mémoire
+pages = TemplateCache("templates", assets=assets)
+
+# Enregistrement des routes. Les métriques (/stats) exigent le jeton
+# SANIC_STATS_TOKEN (en-tête `Authorization: Bearer <jeton>`)
+register_game_routes(app, leaderboard, sessions, pages, db_path)
+register_login_routes(app, sessions, pages, db_path)
+register_websocket_routes(app, rooms, backplane, sessions, guard)
+register_stats_routes(
+    app, writer, rooms, reaper, guard,
+    token=app.config.get("STATS_TOKEN"),
+)
+register_static_routes(app, assets)
+
+
+@app.before_server_start
+async def load_leaderboard(app):
+    """Charge les scores du leaderboard avant d'accepter des connexions,
+    puis démarre la lecture périodique des nouvelles parties."""
+    await leaderboard.get_leaderboard()
+    leaderboard.start()
+
+
+@app.before_server_start
+async def start_backplane(app):
+    """Démarre la réception des messages des autres workers."""
+    await backplane.start()
+
+
+@app.before_server_start
+async def start_sessions(app):
+    """Démarre la lecture des jetons révoqués par les autres workers."""
+    sessions.start()
+
+
+@app.after_server_stop
+async def stop_sessions(app):
+    """Arrête la lecture des jetons révoqués."""
+    await sessions.stop()
+
+
+@app.before_server_start
+async def start_reaper(app):
+    """Démarre le nettoyage périodique des salles."""
+    reaper.start()
+
+
+@app.after_server_stop
+async def stop_reaper(app):
+    """Arrête le nettoyage périodique des salles."""
+    await reaper.stop()
+
+
+@app.after_server_stop
+async def close_database(app):
+    """Arrête les accès à la base de données à l'arrêt du serveur.
+
+    Les salles du worker sont libérées, les parties en attente sont
+    écrites et comptées, la lecture des nouvelles parties est arrêtée,
+    le dernier instantané du leaderboard est écrit, les écritures en cours
+    sont terminées, puis les connexions SQLite de la réserve sont fermées.
+    """
+    await backplane.close()
+    await writer.close()
+    await leaderboard.stop()
+    await leaderboard.persist_leaderboard()
+    DBExecutor.shutdown_default()
+    ConnectionPool.close_all()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,166 @@
+"""
+Bus de messages entre les workers Sanic.
+
+Ce module définit la classe Backplane, l'interface commune des bus de
+messages (« backplane ») qui relient les workers d'un même serveur.
+Chaque salle de jeu appartient à un seul worker, qui conserve son
+plateau et ses connexions ; les autres workers lui transmettent les
+messages de leurs clients et reçoivent en retour les messages à
+envoyer à ces clients. Les joueurs d'une même partie partagent ainsi un
+seul plateau, quel que soit le worker qui a accepté leur connexion.
+
+Chaque worker possède une boîte de réception identifiée par
+`worker_id`. Les messages reçus sont traités dans l'ordre, un à la fois,
+par le gestionnaire enregistré avec `subscribe`.
+
+Implémentations disponibles :
+- LocalBackplane : workers d'un même processus (tests, un seul worker),
+- SQLiteBackplane : workers de plusieurs processus d'une même machine.
+"""
+import asyncio
+import base64
+import os
+import socket
+import uuid
+
+
+class Backplane:
+    """Interface d'un bus de messages entre workers.
+
+    Cette classe :
+    - identifie le worker courant (`worker_id`),
+    - transmet les messages reçus au gestionnaire enregistré, dans
+      l'ordre d'arrivée,
+    - définit les opérations à fournir par chaque implémentation
+      (`publish`, `claim`, `release`).
+    """
+
+    def __init__(self, worker_id=None):
+        """Initialise le bus de messages.
+
+        Args:
+            worker_id (str | None): Identifiant du worker courant. Un
+                identifiant unique est généré s'il n'est pas fourni.
+        """
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self.handler = None
+        self._inbox = asyncio.Queue()
+        self._consumer = None
+
+    def subscribe(self, handler):
+        """Enregistre le gestionnaire des messages reçus par ce worker.
+
+        Args:
+            handler (callable): Coroutine appelée avec chaque message
+                (dict) reçu.
+        """
+        self.handler = handler
+
+    def deliver(self, message):
+        """Dépose un message dans la boîte de réception du worker.
+
+        Args:
+            message (dict): Message reçu.
+        """
+        self._inbox.put_nowait(message)
+
+    async def start(self):
+        """Démarre le traitement des messages reçus."""
+        if self._consumer is None:
+            self._consumer = asyncio.ensure_future(self._consume())
+
+    async def close(self):
+        """Arrête le traitement des messages reçus."""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+
+    async def _consume(self):
+        """Traite les messages reçus, un à la fois, dans l'ordre."""
+        while True:
+            message = await self._inbox.get()
+            if self.handler is None:
+                continue
+
+            try:
+                await self.handler(message)
+            except Exception as e:
+                print(f"Erreur de traitement d'un message du bus : {e}")
+
+    async def publish(self, worker_id, message):
+        """Envoie un message à la boîte de réception d'un worker.
+
+        Args:
+            worker_id (str): Identifiant du worker destinataire.
+            message (dict): Message sérialisable en JSON.
+
+        Returns:
+            bool: True si le message a été transmis, sinon False.
+        """
+        raise NotImplementedError
+
+    async def claim(self, room_id):
+        """Attribue une salle au worker courant si elle est libre.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+
+        Returns:
+            str: Identifiant du worker propriétaire de la salle.
+        """
+        raise NotImplementedError
+
+    async def release(self, room_id):
+        """Libère une salle appartenant au worker courant.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+        """
+        raise NotImplementedError
+
+    def owns(self, owner):
+        """Indique si un propriétaire désigne le worker courant.
+
+        Args:
+            owner (str): Identifiant retourné par `claim`.
+
+        Returns:
+            bool: True si le worker courant est le propriétaire.
+        """
+        return owner == self.worker_id
+
+    @staticmethod
+    def pack(data):
+        """Prépare le contenu d'un message WebSocket pour le bus.
+
+        Args:
+            data (str | bytes): Message texte ou binaire.
+
+        Returns:
+            dict: Champ `text`, ou champ `binary` encodé en base64.
+        """
+        if isinstance(data, bytes):
+            return {"binary": base64.b64encode(data).decode("ascii")}
+
+        return {"text": data}
+
+    @staticmethod
+    def unpack(message):
+        """Retrouve le contenu d'un message WebSocket transmis par le bus.
+
+        Args:
+            message (dict): Message produit avec `pack`.
+
+        Returns:
+            str | bytes: Message texte ou binaire.
+        """
+        if "binary" in message:
+            return base64.b64decode(message["binary"])
+
+        return message["text"]
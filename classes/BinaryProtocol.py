@@ -0,0 +1,147 @@
+"""
+Format binaire compact des messages WebSocket.
+
+Ce module définit la classe BinaryProtocol, qui encode les messages du
+serveur et décode les messages des clients ayant choisi le protocole
+binaire (`?proto=binary`). Chaque message commence par un octet de type ;
+les symboles sont codés sur un octet et les cases d'un instantané sur
+deux bits. Les clients texte continuent d'utiliser le protocole texte
+(`YOU|X`, `WIN|O`, `DISC|...`, `SNAP|...`, `D|...`, etc.).
+
+Messages du serveur :
+- YOU      : type, symbole
+- SNAPSHOT : type, seq (u32), taille (u8), joueur courant, cases (2 bits)
+- DELTA    : type, seq (u32), case (u16), symbole, joueur courant
+- WIN      : type, symbole
+- DRAW     : type
+- DISC     : type, raison (UTF-8)
+- WAIT     : type, symbole du joueur déconnecté
+- BACK     : type, symbole du joueur de retour
+
+Messages du client :
+- MOVE : type, case (u16)
+- SYNC : type
+"""
+import math
+import struct
+
+# Types des messages du serveur
+YOU = 0x01
+SNAPSHOT = 0x02
+DELTA = 0x03
+WIN = 0x04
+DRAW = 0x05
+DISC = 0x06
+WAIT = 0x07
+BACK = 0x08
+
+# Types des messages du client
+MOVE = 0x10
+SYNC = 0x11
+
+# Codes des symboles
+SYMBOLS = {"": 0, "X": 1, "O": 2, "S": 3}
+
+_SNAPSHOT_HEADER = struct.Struct(">BIBB")
+_DELTA = struct.Struct(">BIHBB")
+_MOVE = struct.Struct(">BH")
+
+
+class BinaryProtocol:
+    """Encodage et décodage des messages binaires.
+
+    Cette classe :
+    - encode les instantanés et les coups d'une partie,
+    - traduit les messages de contrôle texte en messages binaires,
+    - décode les coups et les demandes de resynchronisation des clients.
+    """
+
+    @staticmethod
+    def encode_snapshot(seq, board, current_player):
+        """Encode l'état complet du plateau.
+
+        Les cases sont regroupées par quatre dans chaque octet (deux
+        bits par case, la première case dans les bits de poids faible).
+
+        Args:
+            seq (int): Numéro de séquence du dernier coup.
+            board (list[str]): Cases du plateau (N×N).
+            current_player (str): Symbole du joueur dont c'est le tour.
+
+        Returns:
+            bytes: Message SNAPSHOT.
+        """
+        packed = bytearray((len(board) + 3) // 4)
+        for i, cell in enumerate(board):
+            packed[i >> 2] |= SYMBOLS[cell] << ((i & 3) << 1)
+
+        header = _SNAPSHOT_HEADER.pack(
+            SNAPSHOT, seq, math.isqrt(len(board)), SYMBOLS[current_player]
+        )
+
+        return header + bytes(packed)
+
+    @staticmethod
+    def encode_delta(seq, cell, symbol, current_player):
+        """Encode un coup joué.
+
+        Args:
+            seq (int): Numéro de séquence du coup.
+            cell (int): Index de la case jouée.
+            symbol (str): Symbole inscrit dans la case.
+            current_player (str): Symbole du joueur suivant.
+
+        Returns:
+            bytes: Message DELTA.
+        """
+        return _DELTA.pack(
+            DELTA, seq, cell, SYMBOLS[symbol], SYMBOLS[current_player]
+        )
+
+    @staticmethod
+    def encode_text(text):
+        """Traduit un message de contrôle texte en message binaire.
+
+        Args:
+            text (str): Message texte (`YOU|X`, `WIN|O`, `DRAW`,
+                `DISC|raison`, `WAIT|X` ou `BACK|X`).
+
+        Returns:
+            bytes | None: Message binaire, ou None si le message n'a pas
+            d'équivalent binaire (il est alors envoyé en texte).
+        """
+        kind, _, value = text.partition("|")
+
+        if kind == "YOU" and value in SYMBOLS:
+            return bytes((YOU, SYMBOLS[value]))
+        if kind == "WIN" and value in SYMBOLS:
+            return bytes((WIN, SYMBOLS[value]))
+        if kind == "WAIT" and value in SYMBOLS:
+            return bytes((WAIT, SYMBOLS[value]))
+        if kind == "BACK" and value in SYMBOLS:
+            return bytes((BACK, SYMBOLS[value]))
+        if text == "DRAW":
+            return bytes((DRAW,))
+        if kind == "DISC":
+            return bytes((DISC,)) + value.encode("utf-8")
+
+        return None
+
+    @staticmethod
+    def decode(data):
+        """Décode un message binaire envoyé par un client.
+
+        Args:
+            data (bytes): Contenu du message.
+
+        Returns:
+            int | str | None: Index de la case jouée, "SYNC" pour une
+            demande de resynchronisation, ou None si le message est
+            invalide.
+        """
+        if len(data) == _MOVE.size and data[0] == MOVE:
+            return _MOVE.unpack(data)[1]
+        if data == bytes((SYNC,)):
+            return "SYNC"
+
+        return None
@@ -0,0 +1,183 @@
+"""
+Partie de Tic-Tac-Toe représentée par des masques de bits.
+
+Ce module définit la classe BitboardGame, une variante de `Game` qui
+conserve le plateau sous la forme de deux entiers de 9 bits : un pour
+les cases occupées par "X" et un pour celles occupées par "O". Les
+combinaisons gagnantes sont précalculées sous forme de masques, ce qui
+rend la détection d'une victoire ou d'un plateau plein indépendante du
+contenu du plateau. L'interface publique de `Game` (`validate_move`,
+`check_winner`, `board_state`, etc.) est conservée.
+"""
+from classes.Game import Game
+
+# Masque des 9 cases du plateau.
+FULL_MASK = 0b111111111
+
+# Masques des combinaisons gagnantes (bit i = case i).
+WIN_MASKS = tuple(
+    (1 << a) | (1 << b) | (1 << c) for a, b, c in Game.WIN_LINES
+)
+
+
+class BitboardGame(Game):
+    """Partie de Tic-Tac-Toe dont le plateau est stocké en bits.
+
+    Cette classe :
+    - stocke les cases de "X" et de "O" dans deux entiers de 9 bits,
+    - vérifie une victoire avec 8 masques précalculés,
+    - vérifie un plateau plein avec une seule comparaison,
+    - reconstruit la liste des cases uniquement lorsqu'elle est demandée.
+    """
+
+    __slots__ = ("x_bits", "o_bits")
+
+    @property
+    def board(self):
+        """list[str]: Les 9 cases du plateau, reconstruites des bits.
+
+        La liste retournée est une copie : les coups doivent être joués
+        avec `play_move`.
+        """
+        x_bits = self.x_bits
+        o_bits = self.o_bits
+
+        return [
+            "X" if x_bits >> i & 1 else "O" if o_bits >> i & 1 else ""
+            for i in range(9)
+        ]
+
+    @board.setter
+    def board(self, board):
+        self.x_bits = self._to_bits(board, "X")
+        self.o_bits = self._to_bits(board, "O")
+        self.last_move = None
+        self._invalidate()
+
+    def _to_bits(self, board, symbol):
+        """Convertit une liste de cases en masque de bits.
+
+        Args:
+            board (list[str]): Plateau à convertir.
+            symbol (str): Symbole dont les cases sont retenues.
+
+        Returns:
+            int: Masque des cases occupées par `symbol`.
+        """
+        bits = 0
+        for i, cell in enumerate(board):
+            if cell == symbol:
+                bits |= 1 << i
+
+        return bits
+
+    def _winner_of(self, x_bits, o_bits):
+        """Détermine le gagnant à partir des masques de bits.
+
+        Args:
+            x_bits (int): Masque des cases de "X".
+            o_bits (int): Masque des cases de "O".
+
+        Returns:
+            str | None: Symbole du gagnant ("X" ou "O") s’il existe,
+            sinon None.
+        """
+        for mask in WIN_MASKS:
+            if (x_bits & mask) == mask:
+                return "X"
+            if (o_bits & mask) == mask:
+                return "O"
+
+        return None
+
+    def validate_move(self, player, move):
+        """Valide un coup proposé par un joueur.
+
+        Les vérifications sont les mêmes que pour `Game.validate_move` ;
+        l'occupation de la case est lue directement dans les bits.
+
+        Args:
+            player (str): Symbole du joueur ("X" ou "O").
+            move (str): Coup envoyé par le client.
+
+        Returns:
+            int | None: Index de la cellule valide, ou None si le coup
+            est invalide.
+        """
+        try:
+            cell = int(move)
+        except (ValueError, TypeError):
+            return None
+
+        if cell < 0 or cell > 8:
+            return None
+
+        if player not in ("X", "O"):
+            return None
+
+        if player != self._current_player:
+            return None
+
+        if (self.x_bits | self.o_bits) >> cell & 1:
+            return None
+
+        return cell
+
+    def play_move(self, cell, player):
+        """Inscrit un coup validé sur le plateau.
+
+        Args:
+            cell (int): Index de la cellule, validé par `validate_move`.
+            player (str): Symbole du joueur ("X" ou "O").
+        """
+        if player == "X":
+            self.x_bits |= 1 << cell
+        else:
+            self.o_bits |= 1 << cell
+
+        self._record_move(cell)
+
+    def check_winner(self, board_state):
+        """Détermine s’il existe un gagnant sur un plateau donné.
+
+        Args:
+            board_state (list[str]): Plateau à analyser.
+
+        Returns:
+            str | None: Symbole du gagnant ("X" ou "O") s’il existe,
+            sinon None.
+        """
+        return self._winner_of(
+            self._to_bits(board_state, "X"), self._to_bits(board_state, "O")
+        )
+
+    def winner(self):
+        """Détermine le gagnant de la partie en cours.
+
+        Returns:
+            str | None: Symbole du gagnant ("X" ou "O") s’il existe,
+            sinon None.
+        """
+        return self._winner_of(self.x_bits, self.o_bits)
+
+    def is_full(self):
+        """Indique si le plateau de la partie en cours est rempli.
+
+        Returns:
+            bool: True si toutes les cases sont occupées, sinon False.
+        """
+        return (self.x_bits | self.o_bits) == FULL_MASK
+
+    def board_state(self):
+        """Retourne l’état du jeu sous forme sérialisée.
+
+        Le format est identique à celui de `Game.board_state` et l’état
+        est conservé en cache jusqu’au prochain changement.
+
+        Returns:
+            str: Représentation textuelle du plateau et du joueur actif.
+        """
+        if self._state is None:
+            self._state = ",".join(self.board) + "|" + self._current_player
+
+        return self._state
@@ -0,0 +1,155 @@
+"""
+Réserve de connexions SQLite partagées pour l'application Tic-Tac-Toe.
+
+Ce module définit la classe ConnectionPool, qui conserve des connexions
+SQLite ouvertes afin de les réutiliser d'une requête à l'autre. Chaque
+fichier de base de données possède une seule réserve, partagée par tous
+les DAO. Les connexions sont configurées une seule fois à leur ouverture
+(mode WAL et pragmas de performance), et la vérification du schéma de
+chaque DAO n'est exécutée qu'une seule fois par réserve.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """Réserve de connexions SQLite réutilisables pour une base de données.
+
+    Cette classe :
+    - ouvre les connexions à la demande et les configure,
+    - remet les connexions dans la réserve après utilisation,
+    - exécute une seule fois les vérifications de schéma des DAO,
+    - ferme proprement les connexions à l'arrêt du serveur.
+    """
+
+    # Réserves existantes. clé: chemin de la base, valeur: ConnectionPool
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    # Pragmas appliqués à chaque nouvelle connexion.
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -8000",
+        "PRAGMA busy_timeout = 5000",
+    )
+
+    def __init__(self, db_path, max_idle=8):
+        """Initialise une réserve de connexions.
+
+        Args:
+            db_path (str): Chemin vers le fichier de base de données SQLite.
+            max_idle (int): Nombre maximal de connexions inactives
+                conservées dans la réserve.
+        """
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+        self._schema_ready = set()
+        self._schema_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, db_path):
+        """Retourne la réserve partagée associée à une base de données.
+
+        La réserve est créée lors du premier appel pour ce chemin.
+
+        Args:
+            db_path (str): Chemin vers le fichier de base de données SQLite.
+
+        Returns:
+            ConnectionPool: Réserve de connexions de cette base.
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get(db_path)
+            if pool is None:
+                pool = cls(db_path)
+                cls._pools[db_path] = pool
+
+            return pool
+
+    @classmethod
+    def close_all(cls):
+        """Ferme toutes les réserves de connexions existantes.
+
+        Cette méthode est généralement appelée à l'arrêt du serveur.
+        """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+
+        for pool in pools:
+            pool.close()
+
+    def _open(self):
+        """Ouvre et configure une nouvelle connexion.
+
+        Cette méthode effectue la gestion des erreurs.
+
+        Returns:
+            sqlite3.Connection: Nouvelle connexion configurée.
+        """
+        try:
+            conn = sqlite3.connect(
+                self.db_path, timeout=5, check_same_thread=False
+            )
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            return conn
+        except sqlite3.Error as e:
+            print(f"Erreur de connexion sqlite3 : {e}")
+            print(f"Emplacement de la base de données : {self.db_path}")
+            raise
+
+    @contextmanager
+    def connection(self):
+        """Fournit une connexion de la réserve le temps d'un bloc `with`.
+
+        La transaction est validée à la sortie du bloc, ou annulée si une
+        exception est levée. La connexion est ensuite remise dans la
+        réserve, ou fermée si la réserve est déjà pleine.
+
+        Yields:
+            sqlite3.Connection: Connexion prête à être utilisée.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.row_factory = None
+            if self._idle.qsize() < self.max_idle:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    def ensure_schema(self, name, create_schema):
+        """Exécute une seule fois la création du schéma d'un DAO.
+
+        Args:
+            name (str): Nom identifiant le schéma (ex.: nom du DAO).
+            create_schema (callable): Fonction créant les tables requises.
+        """
+        if name in self._schema_ready:
+            return
+
+        with self._schema_lock:
+            if name not in self._schema_ready:
+                create_schema()
+                self._schema_ready.add(name)
+
+    def close(self):
+        """Ferme toutes les connexions inactives de la réserve."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
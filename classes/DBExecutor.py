@@ -0,0 +1,88 @@
+"""
+Exécution non bloquante des accès aux données pour Sanic.
+
+Ce module définit la classe DBExecutor, qui exécute les opérations
+synchrones (requêtes sqlite3, écriture de fichiers) dans un groupe de
+threads dédié. Les routes asynchrones peuvent ainsi attendre (`await`)
+le résultat d'une requête sans bloquer la boucle d'événements, et donc
+sans ralentir les autres connexions WebSocket du même worker.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+class DBExecutor:
+    """Groupe de threads dédié aux accès à la base de données.
+
+    Cette classe :
+    - exécute une fonction synchrone hors de la boucle d'événements,
+    - retourne son résultat (ou son exception) à la coroutine appelante,
+    - fournit une instance partagée par processus.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, max_workers=4, thread_name_prefix="db"):
+        """Initialise le groupe de threads.
+
+        Args:
+            max_workers (int): Nombre maximal de threads exécutant des
+                opérations en parallèle.
+            thread_name_prefix (str): Préfixe du nom des threads.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+
+    @classmethod
+    def default(cls):
+        """Retourne l'instance partagée, en la créant au besoin.
+
+        Returns:
+            DBExecutor: Instance partagée par le processus courant.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+
+            return cls._default
+
+    @classmethod
+    def shutdown_default(cls):
+        """Arrête l'instance partagée, si elle existe.
+
+        Les opérations en cours sont terminées avant le retour. Une
+        nouvelle instance sera créée lors du prochain appel à `default`.
+        """
+        with cls._default_lock:
+            executor, cls._default = cls._default, None
+
+        if executor is not None:
+            executor.shutdown()
+
+    async def run(self, func, *args, **kwargs):
+        """Exécute une fonction synchrone dans le groupe de threads.
+
+        Args:
+            func (callable): Fonction à exécuter.
+            *args: Arguments positionnels de la fonction.
+            **kwargs: Arguments nommés de la fonction.
+
+        Returns:
+            Any: Valeur retournée par la fonction.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self, wait=True):
+        """Arrête le groupe de threads.
+
+        Args:
+            wait (bool): Attendre la fin des opérations en cours.
+        """
+        self.executor.shutdown(wait=wait)
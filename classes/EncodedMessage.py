@@ -0,0 +1,48 @@
+"""
+Message WebSocket construit une seule fois pour plusieurs destinataires.
+
+Ce module définit la classe EncodedMessage, qui conserve le contenu d'un
+message diffusé (texte ou binaire). Le contenu est construit une seule
+fois par état de la partie, puis le même objet est envoyé à chaque
+destinataire d'une diffusion, au lieu d'être reconstruit pour chacun.
+
+L'envoi passe par l'API publique `ws.send` : la construction de la trame
+et l'état de la connexion (fermeture, keepalive) restent gérés par
+Sanic et la bibliothèque websockets.
+"""
+
+
+class EncodedMessage:
+    """Contenu d'un message partagé par tous les destinataires.
+
+    Cette classe :
+    - conserve le contenu du message, construit une seule fois,
+    - l'envoie dans une trame texte (`str`) ou binaire (`bytes`),
+    - passe par `ws.send` pour tous les types de connexions.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        """Initialise le message.
+
+        Args:
+            text (str | bytes): Message à diffuser ; un message `bytes`
+                est envoyé dans une trame binaire.
+        """
+        self.text = text
+
+    def __str__(self):
+        """Retourne le message texte."""
+        return self.text
+
+    async def send(self, ws):
+        """Envoie le message à une connexion.
+
+        Args:
+            ws: WebSocket du destinataire.
+
+        Raises:
+            WebsocketClosed: Si la connexion est fermée.
+        """
+        await ws.send(self.text)
@@ -4,10 +4,18 @@ Ce module définit la classe `Game`, responsable de la logique métier
 du jeu Tic-Tac-Toe. Il gère l’état du plateau, les joueurs connectés,
 la validation des coups, la détection des conditions de victoire ou
 d’égalité, ainsi que l’enregistrement des résultats en base de données.
+L’enregistrement est exécuté par `DBExecutor` afin de ne pas bloquer la
+boucle d’événements.
 
 Le module est conçu pour être utilisé conjointement avec des connexions
 WebSocket et une couche d’accès aux données via `GameDAO`.
 """
+import sqlite3
+import sys
+import time
+from classes.BinaryProtocol import BinaryProtocol
+from classes.DBExecutor import DBExecutor
+from classes.EncodedMessage import EncodedMessage
 from classes.GameDAO import GameDAO
 
 
@@ -20,28 +28,116 @@ class Game:
     - la validation des coups,
     - la détection des conditions de victoire ou d’égalité,
     - la persistance des résultats en base de données.
+
+    Les attributs sont déclarés dans `__slots__` afin de réduire la
+    mémoire occupée par chaque partie.
     """
 
-    def __init__(self):
+    __slots__ = (
+        "connected", "seats", "spectators", "reserved", "_board",
+        "_current_player", "_state", "_messages", "seq", "last_move",
+        "leaderboard", "writer", "last_active",
+    )
+
+    # Attributs dont le contenu n'appartient pas à la partie : seuls les
+    # conteneurs sont comptés par `memory_size` (les WebSockets, le
+    # leaderboard et le tampon d'écriture sont partagés ou externes).
+    _SHALLOW = ("connected", "seats", "spectators", "reserved")
+    _EXTERNAL = ("leaderboard", "writer")
+
+    # Combinaisons gagnantes, calculées une seule fois.
+    WIN_LINES = (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),   # rangs
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),   # colonnes
+        (0, 4, 8), (2, 4, 6)               # diagonales
+    )
+
+    def __init__(self, leaderboard=None, writer=None):
         """Initialise une nouvelle partie.
 
         Args:
             connected (dict): Dictionnaire associant un WebSocket à
                 un symbole de joueur ("X", "O" ou "S" pour spectateur).
+            seats (dict): Places des joueurs : WebSocket du joueur "X"
+                et du joueur "O", ou None si la place est libre.
+            spectators (set): WebSockets des spectateurs.
+            reserved (dict): Places libres réservées au retour d'un
+                joueur déconnecté (clé: symbole, valeur: identifiant de
+                l'utilisateur).
             board (list[str]): Liste représentant les 9 cases du
                 plateau de jeu.
             current_player (str): Symbole du joueur dont c’est le tour.
+            leaderboard (LeaderboardHelper | None): Leaderboard mis à
+                jour à la fin de chaque partie enregistrée.
+            writer (GameWriter | None): Tampon d’écriture groupée des
+                parties terminées.
+            last_active (float): Date (`time.monotonic`) de la dernière
+                arrivée d'un client ou du dernier coup joué.
         """
-        self.connected = {}  # clé: ws, valeur: player ("X" ou "O")
-        self.board = [""] * 9
-        self.current_player = "X"
+        self.last_active = time.monotonic()
+        self.connected = {}  # clé: ws, valeur: player ("X", "O" ou "S")
+        self.seats = {"X": None, "O": None}  # clé: symbole, valeur: ws
+        self.spectators = set()
+        self.reserved = {}  # clé: symbole, valeur: user_id
+        self._state = None  # Cache de board_state()
+        self._messages = {}  # Cache des messages encodés, par type
+        self.seq = 0  # Numéro de séquence du dernier coup
+        self.reset_game()
+        self.leaderboard = leaderboard
+        self.writer = writer
+
+    @property
+    def board(self):
+        """list[str]: Les 9 cases du plateau de jeu.
+
+        Les coups doivent être joués avec `play_move` afin que l’état
+        sérialisé en cache soit invalidé.
+        """
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self._board = board
+        self.last_move = None
+        self._invalidate()
+
+    @property
+    def current_player(self):
+        """str: Symbole du joueur dont c’est le tour."""
+        return self._current_player
+
+    @current_player.setter
+    def current_player(self, player):
+        self._current_player = player
+        self._invalidate()
+
+    def _invalidate(self):
+        """Invalide l’état sérialisé du plateau mis en cache."""
+        self._state = None
+        self._messages.clear()
+
+    def _record_move(self, cell):
+        """Enregistre la dernière case jouée et son numéro de séquence.
+
+        Args:
+            cell (int): Index de la cellule jouée.
+        """
+        self.last_move = cell
+        self.seq += 1
+        self.last_active = time.monotonic()
+        self._invalidate()
 
     def assign_symbol(self, ws):
         """Attribue un symbole à un nouveau joueur connecté.
 
-        Le premier joueur reçoit "O", le second "X".
-        Les connexions supplémentaires sont considérées comme des
-        spectateurs ("S").
+        Un utilisateur qui revient dans la partie retrouve la place qui
+        lui est réservée. Sinon, le premier joueur reçoit "O", le second
+        "X" ; une place réservée à un autre utilisateur n'est pas
+        attribuée. Les connexions supplémentaires, dont un second onglet
+        d'un utilisateur déjà assis, sont considérées comme des
+        spectateurs ("S") : la place d'un joueur n'est rendue qu'une fois
+        sa connexion fermée. Les places sont lues directement, sans
+        parcourir les connexions.
 
         Args:
             ws: WebSocket du client connecté.
@@ -49,17 +145,130 @@ class Game:
         Returns:
             str: Symbole attribué au client ("X", "O" ou "S").
         """
-        if "O" not in self.connected.values():
+        user_id = getattr(ws, "user_id", None)
+        player = self.reserved_seat(user_id)
+
+        if player is not None:
+            del self.reserved[player]
+        elif self.seat_of(user_id) is not None:
+            player = "S"  # déjà assis dans un autre onglet
+        elif self.seats["O"] is None and "O" not in self.reserved:
             player = "O"
-        elif "X" not in self.connected.values():
+        elif self.seats["X"] is None and "X" not in self.reserved:
             player = "X"
         else:
             player = "S"  # spectateur
 
+        self.add_connection(ws, player)
+
+        return player
+
+    def reserve(self, player, user_id):
+        """Réserve une place libre au retour d'un joueur déconnecté.
+
+        Args:
+            player (str): Symbole de la place ("X" ou "O").
+            user_id (int): Identifiant de l'utilisateur déconnecté.
+        """
+        self.reserved[player] = user_id
+
+    def release(self, player):
+        """Annule la réservation d'une place.
+
+        Args:
+            player (str): Symbole de la place ("X" ou "O").
+        """
+        self.reserved.pop(player, None)
+
+    def reserved_seat(self, user_id):
+        """Retourne la place réservée à un utilisateur.
+
+        Args:
+            user_id (int | None): Identifiant de l'utilisateur.
+
+        Returns:
+            str | None: Symbole de la place réservée, ou None.
+        """
+        if user_id is None:
+            return None
+
+        for player, reserved_id in self.reserved.items():
+            if reserved_id == user_id:
+                return player
+
+        return None
+
+    def seat_of(self, user_id):
+        """Retourne la place occupée par un utilisateur.
+
+        Args:
+            user_id (int | None): Identifiant de l'utilisateur.
+
+        Returns:
+            str | None: Symbole de la place ("X" ou "O"), ou None si
+            l'utilisateur n'est pas assis (ou est anonyme).
+        """
+        if user_id is None:
+            return None
+
+        for player, ws in self.seats.items():
+            if ws is not None and getattr(ws, "user_id", None) == user_id:
+                return player
+
+        return None
+
+    def add_connection(self, ws, player):
+        """Ajoute une connexion avec un symbole donné.
+
+        Args:
+            ws: WebSocket du client.
+            player (str): Symbole du client ("X", "O" ou "S"). La place
+                d'un joueur doit être libre.
+        """
         self.connected[ws] = player
+        self.last_active = time.monotonic()
+        if player in self.seats:
+            self.seats[player] = ws
+        else:
+            self.spectators.add(ws)
+
+    def remove_connection(self, ws):
+        """Retire une connexion et libère sa place.
+
+        Args:
+            ws: WebSocket du client.
+
+        Returns:
+            str | None: Symbole du client retiré, ou None s'il n'était pas
+            connecté.
+        """
+        player = self.connected.pop(ws, None)
+        if player is None:
+            return None
+
+        if self.seats.get(player) is ws:
+            self.seats[player] = None
+        else:
+            self.spectators.discard(ws)
 
         return player
 
+    def opponent(self, player):
+        """Retourne la connexion de l'adversaire d'un joueur.
+
+        Args:
+            player (str): Symbole du joueur ("X" ou "O").
+
+        Returns:
+            WebSocket | None: Connexion de l'adversaire, ou None si sa
+            place est libre (ou si `player` est un spectateur).
+        """
+        if player == "X":
+            return self.seats["O"]
+        if player == "O":
+            return self.seats["X"]
+        return None
+
     def validate_move(self, player, move):
         """Valide un coup proposé par un joueur.
 
@@ -97,6 +306,16 @@ class Game:
 
         return cell
 
+    def play_move(self, cell, player):
+        """Inscrit un coup validé sur le plateau.
+
+        Args:
+            cell (int): Index de la cellule, validé par `validate_move`.
+            player (str): Symbole du joueur ("X" ou "O").
+        """
+        self._board[cell] = player
+        self._record_move(cell)
+
     def check_winner(self, board_state):
         """Détermine s’il existe un gagnant.
 
@@ -110,12 +329,7 @@ class Game:
             str | None: Symbole du gagnant ("X" ou "O") s’il existe,
             sinon None.
         """
-        wins = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),   # rangs
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),   # colonnes
-            (0, 4, 8), (2, 4, 6)               # diagonales
-        ]
-        for a, b, c in wins:
+        for a, b, c in self.WIN_LINES:
             if (
                 board_state[a] != ""
                 and board_state[a] == board_state[b]
@@ -136,6 +350,23 @@ class Game:
         """
         return all(cell != "" for cell in board)
 
+    def winner(self):
+        """Détermine le gagnant de la partie en cours.
+
+        Returns:
+            str | None: Symbole du gagnant ("X" ou "O") s’il existe,
+            sinon None.
+        """
+        return self.check_winner(self._board)
+
+    def is_full(self):
+        """Indique si le plateau de la partie en cours est rempli.
+
+        Returns:
+            bool: True si toutes les cases sont occupées, sinon False.
+        """
+        return self.board_full(self._board)
+
     def reset_game(self):
         """Réinitialise la partie.
 
@@ -145,25 +376,32 @@ class Game:
         self.board = [""] * 9
         self.current_player = "X"
 
-    def insert_game(self, winner):
+    async def insert_game(self, winner):
         """Enregistre le résultat de la partie en base de données.
 
         Associe les identifiants des joueurs "X" et "O" à partir
-        des connexions actives et détermine l’identifiant du gagnant.
+        de leurs places et détermine l’identifiant du gagnant.
+        Les joueurs sont lus avant toute attente ; la partie n’est pas
+        enregistrée si l’un d’eux n’est plus connecté. La partie est confiée
+        au tampon d’écriture (`GameWriter`) s’il existe, sinon elle est
+        écrite hors de la boucle d’événements. Le leaderboard associé,
+        s’il existe, lit les parties en base de données : il compte la
+        partie une fois qu’elle est écrite (`LeaderboardHelper.refresh`).
 
         Args:
             winner (str | None): Symbole du gagnant ("X", "O") ou None
                 en cas de partie nulle.
         """
-        dao = GameDAO("tictactoe.db")
-        player_x = None
-        player_o = None
+        ws_x = self.seats["X"]
+        ws_o = self.seats["O"]
 
-        for client_ws, symbol in self.connected.items():
-            if symbol == "X":
-                player_x = client_ws.user_id
-            elif symbol == "O":
-                player_o = client_ws.user_id
+        # Une partie sans ses deux joueurs ne peut pas être enregistrée.
+        if ws_x is None or ws_o is None:
+            return
+
+        player_x, player_o = ws_x.user_id, ws_o.user_id
+        if player_x is None or player_o is None:
+            return
 
         if winner == "X":
             winner_id = player_x
@@ -172,7 +410,55 @@ class Game:
         else:
             winner_id = 0  # Partie nulle. Gagnant -> 0.
 
-        dao.insert_game(player_x, player_o, winner_id)
+        if self.writer is not None:
+            # Le leaderboard lit la partie après l'écriture du lot
+            # (`GameWriter.on_write`) ; une partie refusée n'est pas comptée.
+            self.writer.add(player_x, player_o, winner_id)
+            return
+
+        dao = GameDAO("tictactoe.db")
+        await DBExecutor.default().run(
+            dao.insert_game, player_x, player_o, winner_id
+        )
+
+        if self.leaderboard is None:
+            return
+
+        try:
+            if await self.leaderboard.refresh():
+                self.leaderboard.schedule_persist()
+        except sqlite3.Error as e:
+            # La partie sera lue lors de la prochaine lecture périodique.
+            print(f"Erreur de lecture des nouvelles parties : {e}")
+
+    def memory_size(self, seen=None):
+        """Estime la mémoire occupée par la partie, en octets.
+
+        Les WebSockets des clients ne sont pas comptés, seulement les
+        conteneurs qui les référencent. Un objet partagé entre plusieurs
+        parties (ex.: table des lignes gagnantes) n'est compté qu'une fois
+        pour un même ensemble `seen`.
+
+        Args:
+            seen (set | None): Identifiants des objets déjà comptés.
+
+        Returns:
+            int: Taille estimée, en octets.
+        """
+        seen = set() if seen is None else seen
+        size = sys.getsizeof(self)
+
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                value = getattr(self, name, None)
+                if name in self._EXTERNAL:
+                    continue
+                if name in self._SHALLOW:
+                    size += sys.getsizeof(value)
+                else:
+                    size += _deep_size(value, seen)
+
+        return size
 
     def board_state(self):
         """Retourne l’état du jeu sous forme sérialisée.
@@ -181,7 +467,128 @@ class Game:
         - les 9 cases séparées par des virgules,
         - suivies du joueur courant séparé par un "|".
 
+        L’état est calculé une seule fois, puis conservé jusqu’au
+        prochain changement du plateau ou du joueur courant.
+
         Returns:
             str: Représentation textuelle du plateau et du joueur actif.
         """
-        return ",".join(self.board) + "|" + self.current_player
+        if self._state is None:
+            self._state = (
+                ",".join(self._board) + "|" + self._current_player
+            )
+
+        return self._state
+
+    def _cached(self, kind, build):
+        """Retourne un message encodé, construit une fois par état.
+
+        Args:
+            kind (str): Type du message, utilisé comme clé du cache.
+            build (callable): Fonction sans argument retournant le
+                contenu du message (str ou bytes).
+
+        Returns:
+            EncodedMessage: Message prêt à être diffusé.
+        """
+        message = self._messages.get(kind)
+        if message is None:
+            message = self._messages[kind] = EncodedMessage(build())
+
+        return message
+
+    def board_message(self):
+        """Retourne l’état du jeu encodé pour la diffusion WebSocket.
+
+        Le message est construit une seule fois
+        par changement d’état, puis réutilisé pour tous les clients.
+
+        Returns:
+            EncodedMessage: État du plateau prêt à être diffusé.
+        """
+        return self._cached("board", self.board_state)
+
+    def snapshot_message(self, binary=False):
+        """Retourne l’état complet du jeu, numéroté, pour le mode delta.
+
+        Le format texte est `SNAP|<seq>|<board_state>` ; il est envoyé à
+        l’arrivée d’un client ou lorsqu’un client demande une
+        resynchronisation.
+
+        Args:
+            binary (bool): Encoder le message au format binaire
+                (`BinaryProtocol.encode_snapshot`).
+
+        Returns:
+            EncodedMessage: Instantané du plateau prêt à être diffusé.
+        """
+        if binary:
+            return self._cached(
+                "binary_snapshot",
+                lambda: BinaryProtocol.encode_snapshot(
+                    self.seq, self.board, self._current_player
+                ),
+            )
+
+        return self._cached(
+            "snapshot", lambda: f"SNAP|{self.seq}|{self.board_state()}"
+        )
+
+    def delta_message(self, binary=False):
+        """Retourne le dernier coup joué, numéroté, pour le mode delta.
+
+        Le format texte est `D|<seq>|<case>|<symbole>|<joueur courant>`.
+        Un client qui reçoit un numéro de séquence inattendu a manqué un
+        coup et doit demander un instantané. Cette méthode doit être
+        appelée après `play_move`.
+
+        Args:
+            binary (bool): Encoder le message au format binaire
+                (`BinaryProtocol.encode_delta`).
+
+        Returns:
+            EncodedMessage: Dernier coup prêt à être diffusé.
+        """
+        cell = self.last_move
+
+        if binary:
+            return self._cached(
+                "binary_delta",
+                lambda: BinaryProtocol.encode_delta(
+                    self.seq, cell, self.board[cell], self._current_player
+                ),
+            )
+
+        return self._cached(
+            "delta",
+            lambda: f"D|{self.seq}|{cell}|{self.board[cell]}"
+                    f"|{self._current_player}",
+        )
+
+
+def _deep_size(value, seen):
+    """Retourne la taille d'un objet et de son contenu, en octets.
+
+    Args:
+        value: Objet à mesurer (conteneurs, chaînes, nombres ou
+            `EncodedMessage`).
+        seen (set): Identifiants des objets déjà comptés.
+
+    Returns:
+        int: Taille de l'objet, ou 0 s'il a déjà été compté.
+    """
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += _deep_size(key, seen) + _deep_size(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += _deep_size(item, seen)
+    elif isinstance(value, EncodedMessage):
+        size += _deep_size(value.text, seen)
+
+    return size
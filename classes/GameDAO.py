@@ -6,7 +6,7 @@ des interactions avec la base de données SQLite, incluant la
 création du schéma, l'insertion des parties et la récupération
 des résultats des joueurs.
 """
-import sqlite3
+from classes.ConnectionPool import ConnectionPool
 
 
 class GameDAO:
@@ -17,29 +17,61 @@ class GameDAO:
     et récupération des résultats pour le calcul du classement.
     """
 
+    # Points cumulés par joueur, calculés dans SQLite : une seule ligne
+    # par joueur est retournée à Python, quel que soit le nombre de
+    # parties enregistrées. Seules les parties d'identifiant compris
+    # entre :after (exclu) et :until (inclus, ou sans limite) comptent.
+    SCORES_QUERY = """
+        SELECT users.username, SUM(scores.points) AS points
+        FROM (
+            SELECT
+                playerX AS player,
+                CASE
+                    WHEN winner = playerX THEN :win
+                    WHEN winner = 0 THEN :draw
+                    ELSE :loss
+                END AS points
+            FROM games
+            WHERE id > :after AND (:until IS NULL OR id <= :until)
+
+            UNION ALL
+
+            SELECT
+                playerO AS player,
+                CASE
+                    WHEN winner = playerO THEN :win
+                    WHEN winner = 0 THEN :draw
+                    ELSE :loss
+                END AS points
+            FROM games
+            WHERE id > :after AND (:until IS NULL OR id <= :until)
+        ) AS scores
+        JOIN users ON users.id = scores.player
+        GROUP BY users.id
+    """
+
     def __init__(self, db_path):
         """Initialise l'accès à la base de données.
 
         Vérifie que le schéma requis (tables `games` et `users`)
-        existe et le crée si nécessaire.
+        existe et le crée si nécessaire. Cette vérification n'est
+        exécutée qu'une seule fois par base de données.
 
         Args:
             db_path (str): Chemin vers le fichier de base de données SQLite.
         """
         self.db_path = db_path
-        self._ensure_schema()
+        self.pool = ConnectionPool.get(db_path)
+        self.pool.ensure_schema("GameDAO", self._ensure_schema)
 
     def _connect(self):
         """Gére la connexion à la base de données.
 
-        Cette méthode effectue la gestion des erreurs.
+        La connexion provient de la réserve partagée de cette base et
+        y est remise à la sortie du bloc `with`. La gestion des erreurs
+        est effectuée par la réserve.
         """
-        try:
-            return sqlite3.connect(self.db_path, timeout=5)
-        except sqlite3.Error as e:
-            print(f"Erreur de connexion sqlite3 : {e}")
-            print(f"Emplacement de la base de données : {self.db_path}")
-            raise
+        return self.pool.connection()
 
     def _ensure_schema(self):
         """Crée les tables requises si elles n'existent pas.
@@ -48,8 +80,11 @@ class GameDAO:
         - games : stocke les parties jouées
         - users : stocke les utilisateurs enregistrés
 
-        Cette méthode est appelée automatiquement lors de
-        l'initialisation de l'objet GameDAO.
+        Des index sur `games.playerX`, `games.playerO` et `games.winner`
+        accélèrent le calcul des scores par joueur.
+
+        Cette méthode est appelée automatiquement lors de la première
+        initialisation d'un objet GameDAO pour cette base de données.
         """
         with self._connect() as conn:
             cursor = conn.cursor()
@@ -71,6 +106,19 @@ class GameDAO:
                 )
             """)
 
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_games_playerX
+                ON games (playerX, winner)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_games_playerO
+                ON games (playerO, winner)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_games_winner
+                ON games (winner)
+            """)
+
     def insert_game(self, player_x, player_o, winner):
         """Insère une nouvelle partie dans la base de données.
 
@@ -92,6 +140,26 @@ class GameDAO:
             """, {"x": player_x, "o": player_o, "w": winner})
             return cursor.lastrowid
 
+    def insert_games(self, games):
+        """Insère plusieurs parties dans une seule transaction.
+
+        Une valeur de `winner` égale à 0 indique une partie nulle.
+
+        Args:
+            games (list[tuple[int, int, int]]): Tuples
+                (player_x, player_o, winner) des parties à insérer.
+
+        Returns:
+            int: Nombre de parties insérées.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO games (playerX, playerO, winner)
+                VALUES (?, ?, ?)
+            """, games)
+            return len(games)
+
     def get_game_results(self):
         """Retourne les résultats des parties par joueur.
 
@@ -136,3 +204,78 @@ class GameDAO:
                 ORDER BY username
             """)
             return cursor.fetchall()
+
+    def get_last_game_id(self):
+        """Retourne l'identifiant de la dernière partie enregistrée.
+
+        Returns:
+            int: Identifiant de la dernière partie, ou 0 si aucune partie
+            n'a été enregistrée.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM games")
+            return cursor.fetchone()[0]
+
+    def get_scores(self, win=100, draw=50, loss=0, after=0, until=None):
+        """Retourne les points cumulés de chaque joueur.
+
+        Les points de chaque partie sont attribués, cumulés (SUM) et
+        regroupés par joueur (GROUP BY) dans SQLite. Les bornes `after`
+        et `until` permettent de ne lire que les parties enregistrées
+        depuis une lecture précédente.
+
+        Args:
+            win (int): Points attribués pour une victoire.
+            draw (int): Points attribués pour une partie nulle.
+            loss (int): Points attribués pour une défaite.
+            after (int): Seules les parties d'identifiant supérieur sont
+                comptées.
+            until (int | None): Identifiant de la dernière partie
+                comptée, ou None pour toutes les parties.
+
+        Returns:
+            list[tuple[str, int]]: Liste de tuples (username, points),
+            un par joueur ayant joué au moins une des parties comptées.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.SCORES_QUERY, {
+                "win": win,
+                "draw": draw,
+                "loss": loss,
+                "after": after,
+                "until": until,
+            })
+            return cursor.fetchall()
+
+    def get_top_players(self, limit=10, win=100, draw=50, loss=0):
+        """Retourne les meilleurs joueurs calculés directement en SQL.
+
+        Seules les `limit` premières lignes sont retournées à Python.
+        Les joueurs à égalité sont classés par nom d'utilisateur.
+
+        Args:
+            limit (int): Nombre maximal de joueurs retournés.
+            win (int): Points attribués pour une victoire.
+            draw (int): Points attribués pour une partie nulle.
+            loss (int): Points attribués pour une défaite.
+
+        Returns:
+            list[tuple[str, int]]: Liste de tuples (username, points),
+            triée par points décroissants.
+        """
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.SCORES_QUERY + """
+                ORDER BY points DESC, users.username
+                LIMIT :limit
+            """, {
+                "win": win,
+                "draw": draw,
+                "loss": loss,
+                "after": 0,
+                "until": None,
+                "limit": limit,
+            })
+            return cursor.fetchall()
@@ -0,0 +1,278 @@
+"""
+Écriture différée et groupée des parties terminées.
+
+Ce module définit la classe GameWriter, qui accumule les résultats des
+parties terminées en mémoire puis les écrit en base de données par lots,
+dans une seule transaction (`executemany`). Un lot est écrit lorsqu'il
+atteint une taille maximale ou après un délai maximal, ce qui remplace
+une transaction (et une synchronisation disque) par partie par une
+seule transaction par lot. Les parties en attente sont écrites lors de
+l'arrêt du serveur.
+
+Si la base est temporairement indisponible (verrouillée), le lot est
+remis en attente et une nouvelle écriture est planifiée, avec un délai
+doublé à chaque échec. La file d'attente est bornée : au-delà, les
+parties les plus anciennes sont abandonnées. Un lot refusé par la base
+(contrainte non respectée) est écrit partie par partie, afin que seules
+les parties invalides soient écartées.
+
+Après chaque écriture réussie, la fonction `on_write` est appelée avec
+le nombre de parties écrites : le leaderboard ne compte une partie
+qu'une fois qu'elle est en base, jamais une partie refusée ou
+abandonnée.
+"""
+import asyncio
+import sqlite3
+import time
+from classes.DBExecutor import DBExecutor
+from classes.GameDAO import GameDAO
+
+
+class GameWriter:
+    """Tampon d'écriture des résultats de parties.
+
+    Cette classe :
+    - accumule les parties terminées sans bloquer la boucle d'événements,
+    - écrit les parties par lots selon un seuil de taille ou de temps,
+    - réessaie les écritures échouées avec un délai croissant,
+    - écarte les seules parties refusées par la base,
+    - garantit l'écriture des parties en attente à l'arrêt,
+    - signale les parties écrites (`on_write`),
+    - expose des métriques (profondeur de la file, latence d'écriture).
+    """
+
+    MAX_PENDING = 10_000  # Parties conservées au plus en attente
+    MAX_RETRY_DELAY = 30  # Délai maximal entre deux tentatives, en secondes
+
+    def __init__(self, db_path="tictactoe.db", max_batch=50, max_delay=0.5,
+                 max_pending=MAX_PENDING, max_retry_delay=MAX_RETRY_DELAY,
+                 on_write=None):
+        """Initialise le tampon d'écriture.
+
+        Args:
+            db_path (str): Chemin vers le fichier de base de données SQLite.
+            max_batch (int): Nombre de parties déclenchant une écriture
+                immédiate du lot.
+            max_delay (float): Délai maximal, en secondes, avant l'écriture
+                d'une partie en attente. C'est aussi le délai de la
+                première nouvelle tentative après un échec.
+            max_pending (int): Nombre maximal de parties en attente.
+            max_retry_delay (float): Délai maximal, en secondes, entre deux
+                tentatives d'écriture.
+            on_write (callable | None): Fonction appelée depuis la boucle
+                d'événements après chaque écriture, avec le nombre de
+                parties écrites (ex.: lecture des nouvelles parties par
+                le leaderboard).
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_retry_delay = max_retry_delay
+        self.on_write = on_write
+        self.pending = []  # Tuples (player_x, player_o, winner)
+        self._timer = None
+        self._tasks = set()
+        self._retry_delay = None  # Délai de la prochaine tentative
+
+        self.flush_count = 0
+        self.games_written = 0
+        self.games_rejected = 0
+        self.games_dropped = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def add(self, player_x, player_o, winner):
+        """Ajoute une partie terminée au lot en attente.
+
+        Le lot est écrit immédiatement s'il atteint `max_batch` parties,
+        sinon une écriture est planifiée après `max_delay` secondes. Après
+        un échec, seule la nouvelle tentative planifiée écrit le lot.
+        Cette méthode doit être appelée depuis la boucle d'événements.
+
+        Args:
+            player_x (int): Identifiant de l'utilisateur jouant avec X.
+            player_o (int): Identifiant de l'utilisateur jouant avec O.
+            winner (int): Identifiant du gagnant ou 0 en cas de match nul.
+        """
+        self.pending.append((player_x, player_o, winner))
+        self._trim()
+
+        if len(self.pending) >= self.max_batch and self._retry_delay is None:
+            self._start_flush()
+        elif self._timer is None:
+            self._schedule(self.max_delay)
+
+    def _schedule(self, delay):
+        """Planifie l'écriture du lot en attente après `delay` secondes."""
+        if self._timer is not None:
+            self._timer.cancel()
+
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._start_flush)
+
+    def _trim(self):
+        """Abandonne les parties les plus anciennes si la file est pleine."""
+        overflow = len(self.pending) - self.max_pending
+        if overflow > 0:
+            print(f"File d'écriture pleine : {overflow} parties abandonnées")
+            del self.pending[:overflow]
+            self.games_dropped += overflow
+
+    def _requeue(self, games):
+        """Remet des parties en attente et planifie une nouvelle tentative.
+
+        Le délai de la tentative double à chaque échec consécutif, jusqu'à
+        `max_retry_delay` secondes.
+
+        Args:
+            games (list[tuple[int, int, int]]): Parties non écrites.
+        """
+        self.pending[:0] = games
+        self._trim()
+
+        if self._retry_delay is None:
+            self._retry_delay = self.max_delay
+        else:
+            self._retry_delay = min(
+                self._retry_delay * 2, self.max_retry_delay
+            )
+        self._schedule(self._retry_delay)
+
+    def _start_flush(self):
+        """Lance l'écriture du lot en attente dans une tâche de fond."""
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """Écrit toutes les parties en attente dans une seule transaction.
+
+        En cas d'erreur SQLite temporaire (base verrouillée, disque
+        indisponible), les parties non écrites sont remises en attente et
+        une nouvelle tentative est planifiée. Si la base refuse le lot
+        (contrainte non respectée), les parties sont écrites une à une :
+        seules les parties refusées sont abandonnées.
+
+        Returns:
+            int: Nombre de parties écrites.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, []
+        start = time.perf_counter()
+
+        try:
+            written, failed, rejected = await DBExecutor.default().run(
+                self._write, batch
+            )
+        except sqlite3.Error as e:
+            print(f"Erreur d'écriture des parties : {e}")
+            written, failed, rejected = 0, batch, 0
+
+        self.games_rejected += rejected
+        if failed:
+            self._requeue(failed)
+        else:
+            self._retry_delay = None
+
+        if written:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flush_count += 1
+            self.games_written += written
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self.total_flush_ms += elapsed_ms
+            if self.on_write is not None:
+                self.on_write(written)
+
+        return written
+
+    def _write(self, batch):
+        """Écrit un lot de parties (exécutée par `DBExecutor`).
+
+        Le lot est d'abord écrit dans une seule transaction. S'il est
+        refusé par la base, chaque partie est écrite séparément et les
+        parties refusées sont écartées.
+
+        Args:
+            batch (list[tuple[int, int, int]]): Parties à écrire.
+
+        Returns:
+            tuple[int, list, int]: Nombre de parties écrites, parties à
+            réessayer après une erreur temporaire, et nombre de parties
+            refusées.
+
+        Raises:
+            sqlite3.Error: Si la base ne peut pas être ouverte ou si le
+                lot échoue pour une raison temporaire.
+        """
+        dao = GameDAO(self.db_path)
+        try:
+            dao.insert_games(batch)
+            return len(batch), [], 0
+        except sqlite3.OperationalError:
+            raise
+        except sqlite3.Error as e:
+            print(f"Lot de parties rejeté, écriture partie par partie : {e}")
+
+        written = rejected = 0
+        for i, game in enumerate(batch):
+            try:
+                dao.insert_game(*game)
+            except sqlite3.OperationalError as e:
+                print(f"Erreur d'écriture des parties : {e}")
+                return written, batch[i:], rejected
+            except sqlite3.Error as e:
+                print(f"Partie rejetée {game} : {e}")
+                rejected += 1
+            else:
+                written += 1
+
+        return written, [], rejected
+
+    async def close(self):
+        """Écrit les parties en attente avant l'arrêt du serveur.
+
+        Les écritures déjà lancées sont attendues, puis le reste du lot
+        est écrit. Aucune nouvelle tentative n'est planifiée après l'arrêt.
+        """
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        await self.flush()
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.pending:
+            print(f"{len(self.pending)} parties n'ont pas pu être écrites")
+
+    def stats(self):
+        """Retourne les métriques du tampon d'écriture.
+
+        Returns:
+            dict: Profondeur de la file, nombre d'écritures, nombre de
+            parties écrites, refusées et abandonnées, et latences
+            d'écriture (en millisecondes).
+        """
+        average = (
+            self.total_flush_ms / self.flush_count if self.flush_count else 0.0
+        )
+
+        return {
+            "queue_depth": len(self.pending),
+            "flush_count": self.flush_count,
+            "games_written": self.games_written,
+            "games_rejected": self.games_rejected,
+            "games_dropped": self.games_dropped,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": round(average, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
@@ -0,0 +1,315 @@
+"""
+Partie sur un plateau N×N gagnée par K symboles alignés.
+
+Ce module définit la classe GridGame, une variante de `Game` configurée
+par la taille du plateau et la longueur d'alignement gagnante (par
+exemple 15×15 avec 5 symboles alignés). Pour chaque case, les segments
+de lignes qui la traversent (rang, colonne et diagonales) sont
+précalculés une seule fois par configuration. Après un coup, seules les
+lignes passant par la dernière case jouée sont vérifiées : le coût d'un
+coup dépend de la longueur d'alignement et non de la taille du plateau.
+
+La fonction `create_game` choisit l'implémentation adaptée aux options
+d'une salle.
+"""
+from classes.BitboardGame import BitboardGame
+from classes.Game import Game
+
+# Directions des lignes : rang, colonne, diagonale, anti-diagonale.
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class GridGame(Game):
+    """Partie sur un plateau N×N avec K symboles alignés pour gagner.
+
+    Cette classe :
+    - valide les coups selon la taille du plateau,
+    - précalcule, pour chaque case, les lignes qui la traversent,
+    - vérifie une victoire à partir de la dernière case jouée uniquement,
+    - détecte un plateau plein à l'aide d'un compteur de coups.
+    """
+
+    __slots__ = ("size", "win_length", "lines", "moves")
+
+    MIN_SIZE = 3
+    MAX_SIZE = 19
+
+    # Tables de lignes partagées, clé: (size, win_length)
+    _line_tables = {}
+
+    def __init__(self, size=3, win_length=None, leaderboard=None,
+                 writer=None):
+        """Initialise une nouvelle partie.
+
+        Args:
+            size (int): Nombre de rangs et de colonnes du plateau.
+            win_length (int | None): Nombre de symboles alignés
+                nécessaires pour gagner (`size` par défaut).
+            leaderboard (LeaderboardHelper | None): Leaderboard mis à
+                jour à la fin de chaque partie enregistrée.
+            writer (GameWriter | None): Tampon d’écriture groupée des
+                parties terminées.
+
+        Raises:
+            ValueError: Si la taille ou la longueur d'alignement est
+                invalide.
+        """
+        if win_length is None:
+            win_length = size
+
+        if not self.MIN_SIZE <= size <= self.MAX_SIZE:
+            raise ValueError(
+                f"Taille de plateau invalide : {size} "
+                f"({self.MIN_SIZE} à {self.MAX_SIZE})"
+            )
+        if not self.MIN_SIZE <= win_length <= size:
+            raise ValueError(
+                f"Longueur d'alignement invalide : {win_length} "
+                f"({self.MIN_SIZE} à {size})"
+            )
+
+        self.size = size
+        self.win_length = win_length
+        self.lines = self.line_table(size, win_length)
+        super().__init__(leaderboard=leaderboard, writer=writer)
+
+    @classmethod
+    def line_table(cls, size, win_length):
+        """Retourne les lignes traversant chaque case du plateau.
+
+        La table est calculée une seule fois par configuration. Pour
+        chaque case et chaque direction, elle contient les cases situées
+        avant et après la case (au plus `win_length - 1` de chaque côté),
+        de la plus proche à la plus éloignée.
+
+        Args:
+            size (int): Nombre de rangs et de colonnes du plateau.
+            win_length (int): Nombre de symboles alignés pour gagner.
+
+        Returns:
+            tuple: Pour chaque case, un tuple de paires
+            `(cases_avant, cases_apres)`, une paire par direction.
+        """
+        key = (size, win_length)
+        table = cls._line_tables.get(key)
+        if table is not None:
+            return table
+
+        def walk(row, col, d_row, d_col):
+            cells = []
+            for step in range(1, win_length):
+                r = row + d_row * step
+                c = col + d_col * step
+                if not (0 <= r < size and 0 <= c < size):
+                    break
+                cells.append(r * size + c)
+            return tuple(cells)
+
+        table = tuple(
+            tuple(
+                (
+                    walk(cell // size, cell % size, -d_row, -d_col),
+                    walk(cell // size, cell % size, d_row, d_col),
+                )
+                for d_row, d_col in DIRECTIONS
+            )
+            for cell in range(size * size)
+        )
+        cls._line_tables[key] = table
+
+        return table
+
+    @property
+    def board(self):
+        """list[str]: Les N×N cases du plateau de jeu.
+
+        Les coups doivent être joués avec `play_move` afin que l’état
+        sérialisé en cache et le dernier coup soient mis à jour.
+        """
+        return self._board
+
+    @board.setter
+    def board(self, board):
+        self._board = board
+        self.last_move = None
+        self.moves = sum(1 for cell in board if cell != "")
+        self._invalidate()
+
+    def validate_move(self, player, move):
+        """Valide un coup proposé par un joueur.
+
+        Les vérifications sont les mêmes que pour `Game.validate_move`,
+        avec des cases numérotées de 0 à N×N - 1.
+
+        Args:
+            player (str): Symbole du joueur ("X" ou "O").
+            move (str): Coup envoyé par le client.
+
+        Returns:
+            int | None: Index de la cellule valide, ou None si le coup
+            est invalide.
+        """
+        try:
+            cell = int(move)
+        except (ValueError, TypeError):
+            return None
+
+        if cell < 0 or cell >= len(self._board):
+            return None
+
+        if player not in ("X", "O"):
+            return None
+
+        if player != self._current_player:
+            return None
+
+        if self._board[cell] != "":
+            return None
+
+        return cell
+
+    def play_move(self, cell, player):
+        """Inscrit un coup validé sur le plateau.
+
+        Args:
+            cell (int): Index de la cellule, validé par `validate_move`.
+            player (str): Symbole du joueur ("X" ou "O").
+        """
+        self._board[cell] = player
+        self.moves += 1
+        self._record_move(cell)
+
+    def wins_at(self, board_state, cell):
+        """Indique si le symbole d'une case complète un alignement.
+
+        Seules les lignes passant par la case sont vérifiées.
+
+        Args:
+            board_state (list[str]): Plateau à analyser.
+            cell (int): Index de la case.
+
+        Returns:
+            bool: True si la case fait partie d'un alignement gagnant.
+        """
+        symbol = board_state[cell]
+        if symbol == "":
+            return False
+
+        for before, after in self.lines[cell]:
+            count = 1
+            for i in before:
+                if board_state[i] != symbol:
+                    break
+                count += 1
+            for i in after:
+                if board_state[i] != symbol:
+                    break
+                count += 1
+            if count >= self.win_length:
+                return True
+
+        return False
+
+    def check_winner(self, board_state):
+        """Détermine s’il existe un gagnant sur un plateau donné.
+
+        Toutes les cases sont examinées ; pendant une partie, `winner`
+        ne vérifie que la dernière case jouée.
+
+        Args:
+            board_state (list[str]): Plateau à analyser.
+
+        Returns:
+            str | None: Symbole du gagnant ("X" ou "O") s’il existe,
+            sinon None.
+        """
+        for cell in range(len(board_state)):
+            if self.wins_at(board_state, cell):
+                return board_state[cell]
+
+        return None
+
+    def winner(self):
+        """Détermine le gagnant à partir du dernier coup joué.
+
+        Returns:
+            str | None: Symbole du gagnant ("X" ou "O") s’il existe,
+            sinon None.
+        """
+        if self.last_move is None:
+            return self.check_winner(self._board)
+
+        if self.wins_at(self._board, self.last_move):
+            return self._board[self.last_move]
+
+        return None
+
+    def is_full(self):
+        """Indique si le plateau de la partie en cours est rempli.
+
+        Returns:
+            bool: True si toutes les cases sont occupées, sinon False.
+        """
+        return self.moves >= len(self._board)
+
+    def reset_game(self):
+        """Réinitialise la partie.
+
+        Vide le plateau de jeu et redonne le premier tour
+        au joueur "X".
+        """
+        self.board = [""] * (self.size * self.size)
+        self.current_player = "X"
+
+
+def create_game(size=3, win_length=None, **kwargs):
+    """Crée la partie d'une nouvelle salle selon ses options.
+
+    Le plateau classique 3×3 utilise `BitboardGame` ; les autres
+    configurations utilisent `GridGame`.
+
+    Args:
+        size (int): Nombre de rangs et de colonnes du plateau.
+        win_length (int | None): Nombre de symboles alignés pour gagner
+            (`size` par défaut).
+        **kwargs: Arguments transmis au constructeur de la partie
+            (`leaderboard`, `writer`).
+
+    Returns:
+        Game: Partie créée.
+
+    Raises:
+        ValueError: Si les options sont invalides.
+    """
+    if size == 3 and win_length in (None, 3):
+        return BitboardGame(**kwargs)
+
+    return GridGame(size, win_length, **kwargs)
+
+
+def parse_options(args):
+    """Extrait les options de salle d'une chaîne de requête.
+
+    Les paramètres reconnus sont `size` (taille du plateau) et `win`
+    (longueur d'alignement).
+
+    Args:
+        args (Mapping): Paramètres de la requête (`request.args`).
+
+    Returns:
+        dict: Arguments nommés pour `create_game`.
+
+    Raises:
+        ValueError: Si un paramètre n'est pas un entier.
+    """
+    options = {}
+
+    size = args.get("size")
+    if size is not None:
+        options["size"] = int(size)
+
+    win_length = args.get("win")
+    if win_length is not None:
+        options["win_length"] = int(win_length)
+
+    return options
@@ -0,0 +1,85 @@
+"""
+Cache borné, à éviction du plus ancien accès (LRU).
+
+Ce module définit la classe LRUCache, un dictionnaire de taille limitée
+qui conserve les entrées les plus récemment utilisées. Lorsque la taille
+maximale est atteinte, l'entrée consultée le moins récemment est
+supprimée. Les opérations sont protégées par un verrou : le cache peut
+être partagé entre la boucle d'événements et les threads de DBExecutor.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Dictionnaire borné à éviction LRU.
+
+    Cette classe :
+    - retourne les entrées en les marquant comme récemment utilisées,
+    - supprime l'entrée la plus ancienne au-delà de la taille maximale,
+    - permet de retirer ou de vider les entrées.
+    """
+
+    def __init__(self, maxsize=1024):
+        """Initialise un cache vide.
+
+        Args:
+            maxsize (int): Nombre maximal d'entrées conservées.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retourne la valeur associée à une clé.
+
+        Args:
+            key (Hashable): Clé recherchée.
+            default (Any): Valeur retournée si la clé est absente.
+
+        Returns:
+            Any: Valeur en cache, ou `default`.
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+
+            return self._entries[key]
+
+    def put(self, key, value):
+        """Ajoute ou remplace une entrée.
+
+        Args:
+            key (Hashable): Clé de l'entrée.
+            value (Any): Valeur à conserver.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """Retire une entrée, si elle existe.
+
+        Args:
+            key (Hashable): Clé de l'entrée.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """Retourne le nombre d'entrées en cache."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Indique si une clé est en cache, sans modifier son rang."""
+        return key in self._entries
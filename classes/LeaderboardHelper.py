@@ -5,11 +5,41 @@ Ce module fournit la classe LeaderboardHelper, responsable du calcul
 des scores des joueurs à partir des résultats stockés en base de
 données, du tri des meilleurs joueurs et de la persistance du
 classement dans un fichier JSON.
+
+Les scores cumulés sont conservés en mémoire : ils sont chargés une
+seule fois depuis la base de données, puis complétés par les seules
+parties enregistrées depuis la lecture précédente (`refresh`, curseur
+sur `games.id`). La base de données est la seule source des scores :
+les parties terminées sur n'importe quel worker sont vues par tous les
+workers après au plus `refresh_interval` secondes (`start`), et une
+partie qui n'a pas été écrite n'est jamais comptée. Les accès à la base
+de données et au fichier JSON faits depuis une coroutine sont exécutés
+par `DBExecutor`, hors de la boucle d'événements.
+
+Les joueurs sont aussi classés dans un index (RankIndex), mis à jour à
+chaque partie : le rang d'un joueur et n'importe quelle page du
+classement sont obtenus en temps logarithmique.
+
+Le top 10 est conservé sous forme d'instantané (LeaderboardSnapshot),
+sérialisé en JSON une seule fois par version des scores. Le fichier JSON
+est écrit en arrière-plan, dans un fichier temporaire renommé ensuite :
+un lecteur ne voit jamais un fichier à moitié écrit.
 """
+import asyncio
+import hashlib
 import json
-from functools import reduce
+import os
+import sqlite3
+import tempfile
 from collections import namedtuple
+from classes.DBExecutor import DBExecutor
 from classes.GameDAO import GameDAO
+from classes.RankIndex import RankIndex
+
+# Top 10 à une version des scores : meneurs, JSON sérialisé et ETag.
+LeaderboardSnapshot = namedtuple(
+    "LeaderboardSnapshot", ["version", "leaders", "body", "etag"]
+)
 
 
 class LeaderboardHelper:
@@ -19,17 +49,54 @@ class LeaderboardHelper:
     - transforme les résultats des parties en scores,
     - cumule les points par joueur,
     - génère le top 10 des joueurs,
-    - sauvegarde et charge le leaderboard depuis un fichier JSON.
+    - ajoute aux scores en mémoire les parties enregistrées en base,
+    - sauvegarde le top 10 dans un fichier JSON.
     """
 
-    def __init__(self, file_path="leaderboard.json"):
+    message = "Le tableau des meneurs n'est pas disponible en ce moment."
+
+    # Points attribués selon le résultat d'une partie.
+    POINTS = {"win": 100, "draw": 50, "loss": 0}
+
+    # Délai entre deux lectures des nouvelles parties, en secondes.
+    REFRESH_INTERVAL = 1
+
+    def __init__(self, file_path="leaderboard.json", db_path="tictactoe.db",
+                 refresh_interval=REFRESH_INTERVAL):
         """Initialise le helper du leaderboard.
 
         Args:
             file_path (str): Chemin du fichier JSON dans lequel le
                 leaderboard est sauvegardé.
+            db_path (str): Chemin de la base de données SQLite dont les
+                scores sont chargés si aucun DAO n'est fourni.
+            refresh_interval (float): Délai entre deux lectures des
+                parties enregistrées, en secondes.
         """
         self.file_path = file_path
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.scores = None  # clé: username, valeur: points cumulés
+        self.version = 0  # incrémentée à chaque modification des scores
+        self.last_game_id = 0  # Dernière partie comptée dans les scores
+        self._refresher = None
+        self._refresh_task = None
+        self._refresh_pending = False
+        self._load_lock = asyncio.Lock()
+        self._snapshot = None
+        self._persisted_version = 0
+        self._persist_task = None
+
+    @property
+    def scores(self):
+        """dict[str, int] | None: Points cumulés par joueur."""
+        return self._scores
+
+    @scores.setter
+    def scores(self, scores):
+        """Remplace les scores et reconstruit l'index des rangs."""
+        self._scores = scores
+        self.ranks = RankIndex(scores)
 
     def score_game(self, game):
         """Convertit un résultat de partie en points.
@@ -43,107 +110,341 @@ class LeaderboardHelper:
             nombre de points attribués pour cette partie.
         """
         player, result = game
+        return player, self.POINTS.get(result, 0)
+
+    def aggregate_scores(self, games, leaderboard=None):
+        """Cumule en une seule passe les points de chaque joueur.
+
+        Le dictionnaire est modifié sur place : le coût est linéaire en
+        nombre de parties, sans copie du leaderboard pour chaque partie.
 
-        match result:
-            case "win":
-                score = 100
-            case "draw":
-                score = 50
-            case "loss":
-                score = 0
-            case _:
-                score = 0
+        Args:
+            games (iterable[tuple[str, str]]): Tuples (username, result).
+            leaderboard (dict[str, int] | None): Scores existants à
+                compléter. Un nouveau dictionnaire est créé si None.
+
+        Returns:
+            dict[str, int]: Leaderboard contenant les scores cumulés.
+        """
+        if leaderboard is None:
+            leaderboard = {}
+
+        for player, points in map(self.score_game, games):
+            if player is not None:
+                leaderboard[player] = leaderboard.get(player, 0) + points
+
+        return leaderboard
+
+    def load_scores(self, dao=None):
+        """Charge en mémoire les scores cumulés de tous les joueurs.
+
+        Les points sont cumulés par SQLite (`GameDAO.get_scores`) : une
+        seule ligne par joueur est lue, et non une ligne par partie.
+        Cette opération n'est nécessaire qu'une seule fois : les parties
+        suivantes sont ajoutées avec `refresh`.
+
+        Args:
+            dao (GameDAO | None): Objet d'accès aux données permettant de
+                récupérer les résultats des parties.
+        """
+        if dao is None:
+            dao = GameDAO(self.db_path)
+
+        last_game_id = dao.get_last_game_id()
+        self.scores = dict(dao.get_scores(until=last_game_id, **self.POINTS))
+        self.last_game_id = last_game_id
+        self.version += 1
+
+    def add_scores(self, points):
+        """Ajoute des points aux scores en mémoire.
+
+        Args:
+            points (iterable[tuple[str, int]]): Tuples (username, points).
+        """
+        for player, gained in points:
+            self.scores[player] = self.scores.get(player, 0) + gained
+            self.ranks.update(player, self.scores[player])
 
-        return player, score
+        self.version += 1
 
-    def add_points(self, leaderboard, scored_game):
-        """Ajoute des points au score total d'un joueur.
+    def record_game(self, results):
+        """Ajoute le résultat d'une partie au leaderboard en mémoire.
 
-        Cette méthode retourne un nouveau dictionnaire afin d'éviter
-        toute modification directe du leaderboard existant.
+        La partie n'est pas lue en base de données : elle ne doit pas
+        y être enregistrée, sinon elle serait aussi comptée par
+        `refresh`. Si les scores n'ont pas encore été chargés, rien
+        n'est fait.
 
         Args:
-            leaderboard (dict[str, int]): Dictionnaire des scores
-                actuels par joueur.
-            scored_game (tuple[str, int]): Tuple contenant le nom du
-                joueur et les points à ajouter.
+            results (iterable[tuple[str, str]]): Tuples (username, result)
+                pour chaque joueur de la partie, au même format que
+                `GameDAO.get_game_results`.
 
         Returns:
-            dict[str, int]: Nouveau leaderboard mis à jour.
+            bool: True si les scores en mémoire ont été mis à jour.
         """
-        player, points = scored_game
-        current_score = leaderboard.get(player, 0)
-        new_leaderboard = leaderboard.copy()
-        new_leaderboard[player] = current_score + points
-        return new_leaderboard
+        if self.scores is None:
+            return False
+
+        self.add_scores(self.aggregate_scores(results).items())
+        return True
 
-    def set_leaderboard_file(self, dao=GameDAO("tictactoe.db")):
-        """Calcule et sauvegarde le leaderboard dans un fichier JSON.
+    def _read_new_scores(self, dao, after):
+        """Lit les points des parties enregistrées après `after`.
 
-        Cette méthode :
-        - récupère les résultats des parties depuis la base de données,
-        - calcule les scores cumulés par joueur,
-        - sélectionne les 10 meilleurs joueurs,
-        - écrit le résultat dans un fichier JSON.
+        Cette méthode est exécutée par `DBExecutor` : elle ne modifie
+        pas les scores en mémoire.
 
         Args:
-            dao (GameDAO): Objet d'accès aux données permettant de
-                récupérer les résultats des parties.
+            dao (GameDAO | None): Objet d'accès aux données.
+            after (int): Identifiant de la dernière partie déjà comptée.
+
+        Returns:
+            tuple[int, list[tuple[str, int]]]: Identifiant de la dernière
+            partie enregistrée, et points par joueur des parties lues.
         """
-        data = []
-        games = dao.get_game_results()
-        Leader = namedtuple("Leader", ["username", "points"])
+        if dao is None:
+            dao = GameDAO(self.db_path)
 
-        leaderboard = reduce(
-            self.add_points,
-            map(self.score_game, games),
-            {}
-        )
+        last_game_id = dao.get_last_game_id()
+        if last_game_id <= after:
+            return after, []
 
-        sorted_leaderboard = sorted(
-            leaderboard.items(),
-            key=lambda item: item[1],
-            reverse=True
+        return last_game_id, dao.get_scores(
+            after=after, until=last_game_id, **self.POINTS
         )
 
-        named_leaderboard = list(
-            map(
-                lambda item: Leader(item[0], item[1]),
-                sorted_leaderboard[:10]
+    async def refresh(self, dao=None):
+        """Ajoute aux scores les parties enregistrées depuis la lecture
+        précédente, par ce worker ou par un autre.
+
+        Seules les parties d'identifiant supérieur à `last_game_id` sont
+        lues, cumulées par joueur dans SQLite. Rien n'est fait si les
+        scores n'ont pas encore été chargés.
+
+        Args:
+            dao (GameDAO | None): Objet d'accès aux données.
+
+        Returns:
+            bool: True si les scores en mémoire ont été mis à jour.
+
+        Raises:
+            sqlite3.Error: Si la base de données ne peut pas être lue.
+        """
+        async with self._load_lock:
+            if self.scores is None:
+                return False
+
+            last_game_id, points = await DBExecutor.default().run(
+                self._read_new_scores, dao, self.last_game_id
             )
-        )
+            self.last_game_id = last_game_id
+            if not points:
+                return False
+
+            self.add_scores(points)
+            return True
+
+    def schedule_refresh(self):
+        """Planifie une lecture des nouvelles parties, sans l'attendre.
+
+        Appelée après l'écriture d'un lot de parties (`GameWriter`), afin
+        que les parties de ce worker soient comptées sans attendre la
+        lecture périodique. Les demandes reçues pendant une lecture sont
+        regroupées dans la suivante.
+
+        Returns:
+            asyncio.Task: Tâche de lecture en cours.
+        """
+        self._refresh_pending = True
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_all())
 
-        for leader in named_leaderboard:
-            leader_asdict = leader._asdict()
-            data.append(leader_asdict)
+        return self._refresh_task
 
+    async def _refresh_all(self):
+        """Lit les nouvelles parties tant que des lectures sont demandées."""
+        while self._refresh_pending:
+            self._refresh_pending = False
+            await self._refresh_and_persist()
+
+    async def _refresh_and_persist(self):
+        """Lit les nouvelles parties et réécrit le fichier JSON au besoin."""
         try:
-            with open(self.file_path, "w") as f:
-                json.dump(data, f, indent=4)
+            if await self.refresh():
+                self.schedule_persist()
+        except sqlite3.Error as e:
+            print(f"Erreur de lecture des nouvelles parties : {e}")
 
-        except (FileNotFoundError, PermissionError, OSError) as e:
-            print(f"Erreur d'écriture du fichier des meneurs : {e}")
-            print(f"Emplacement du fichier : {self.file_path}")
+    def start(self):
+        """Démarre la lecture périodique des parties enregistrées."""
+        if self._refresher is None:
+            self._refresher = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Arrête la lecture périodique des parties enregistrées.
+
+        Une lecture planifiée après une écriture (`schedule_refresh`) est
+        terminée : les dernières parties écrites sont comptées.
+        """
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+        if self._refresh_task is not None:
+            await self._refresh_task
+
+    async def _run(self):
+        """Relit les nouvelles parties à intervalle régulier.
+
+        Le fichier JSON est réécrit après chaque modification des scores.
+        """
+        while True:
+            await self._refresh_and_persist()
+            await asyncio.sleep(self.refresh_interval)
+
+    def get_leaders(self, count=10):
+        """Retourne les meilleurs joueurs à partir de l'index des rangs.
+
+        Les joueurs à égalité sont classés par nom d'utilisateur.
+
+        Args:
+            count (int): Nombre maximal de joueurs retournés.
+
+        Returns:
+            list[dict]: Liste de dictionnaires `username` et `points`,
+            triée par points décroissants.
+        """
+        return [
+            {"username": username, "points": points}
+            for _, username, points in self.ranks.top(count)
+        ]
+
+    def get_ranks(self, start=1, count=10):
+        """Retourne une page du classement complet.
+
+        Args:
+            start (int): Rang du premier joueur (à partir de 1).
+            count (int): Nombre maximal de joueurs retournés.
+
+        Returns:
+            list[dict]: Dictionnaires `rank`, `username` et `points`.
+        """
+        return [
+            {"rank": rank, "username": username, "points": points}
+            for rank, username, points in self.ranks.page(start, count)
+        ]
+
+    def get_rank(self, username):
+        """Retourne le rang d'un joueur.
+
+        Args:
+            username (str): Nom du joueur.
+
+        Returns:
+            int | None: Rang du joueur, ou None s'il n'a aucune partie.
+        """
+        return self.ranks.rank(username)
+
+    def snapshot(self):
+        """Retourne l'instantané du top 10 pour la version courante.
+
+        Le top 10 n'est recalculé et sérialisé que si les scores ont
+        changé depuis l'instantané précédent.
+
+        Returns:
+            LeaderboardSnapshot: Version, meneurs, JSON et ETag.
+        """
+        if self._snapshot is None or self._snapshot.version != self.version:
+            leaders = self.get_leaders()
+            body = json.dumps(
+                leaders, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+            self._snapshot = LeaderboardSnapshot(
+                self.version, leaders, body, f'"{digest}"'
+            )
+
+        return self._snapshot
+
+    async def get_leaderboard(self, dao=None):
+        """Retourne le top 10 des joueurs depuis la mémoire.
+
+        Les scores sont chargés depuis la base de données lors du
+        premier appel seulement, hors de la boucle d'événements.
+
+        Args:
+            dao (GameDAO | None): Objet d'accès aux données utilisé pour
+                le chargement initial des scores.
+
+        Returns:
+            list[dict] | str: Liste des joueurs du leaderboard, ou un
+            message d'erreur si les scores ne peuvent pas être chargés.
+        """
+        async with self._load_lock:
+            if self.scores is None:
+                try:
+                    await DBExecutor.default().run(self.load_scores, dao)
+                except sqlite3.Error:
+                    return self.message
 
-    def get_leaderboard_file(self):
-        """Charge le leaderboard depuis le fichier JSON.
+        return self.snapshot().leaders
+
+    def schedule_persist(self):
+        """Planifie la sauvegarde du top 10, sans l'attendre.
+
+        Une seule écriture est en cours à la fois : les versions
+        produites pendant une écriture sont regroupées dans la suivante.
 
         Returns:
-            list[dict] | str: Liste des joueurs du leaderboard si le
-            fichier est disponible, sinon un message d'erreur indiquant
-            que le classement est indisponible.
+            asyncio.Task: Tâche d'écriture en cours.
         """
-        message = "Le tableau des meneurs n'est pas disponible en ce moment."
+        if self._persist_task is None or self._persist_task.done():
+            self._persist_task = asyncio.ensure_future(self._persist())
+
+        return self._persist_task
+
+    async def _persist(self):
+        """Écrit les instantanés jusqu'à ce que le fichier soit à jour."""
+        while self._persisted_version != self.version:
+            snapshot = self.snapshot()
+            await DBExecutor.default().run(self._write_file, snapshot.body)
+            self._persisted_version = snapshot.version
+
+    async def persist_leaderboard(self):
+        """Sauvegarde le top 10 en mémoire sans bloquer la boucle.
+
+        L'instantané courant est écrit par `DBExecutor`. Cette méthode
+        attend la fin de l'écriture (ex.: à l'arrêt du serveur).
+        """
+        await self.schedule_persist()
+
+    def _write_file(self, body):
+        """Remplace atomiquement le contenu du fichier JSON.
+
+        Le contenu est écrit dans un fichier temporaire du même dossier,
+        qui remplace ensuite le fichier (`os.replace`).
+
+        Args:
+            body (bytes): Contenu JSON sérialisé.
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        tmp_path = None
 
         try:
-            with open(self.file_path, 'r') as f:
-                data = json.load(f)
-                return data
-
-        except (
-            FileNotFoundError,
-            PermissionError,
-            OSError,
-            json.JSONDecodeError,
-        ):
-            return message
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=directory, prefix=".leaderboard-", delete=False
+            ) as f:
+                tmp_path = f.name
+                f.write(body)
+            os.replace(tmp_path, self.file_path)
+
+        except (FileNotFoundError, PermissionError, OSError) as e:
+            print(f"Erreur d'écriture du fichier des meneurs : {e}")
+            print(f"Emplacement du fichier : {self.file_path}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,88 @@
+"""
+Bus de messages entre workers d'un même processus.
+
+Ce module définit la classe LocalBackplane, une implémentation de
+`Backplane` dont les messages sont échangés en mémoire. Elle convient à
+un serveur à un seul worker (chaque salle appartient alors au worker
+courant) et aux tests, où plusieurs workers partagent un même
+`LocalHub` dans un seul processus.
+"""
+from classes.Backplane import Backplane
+
+
+class LocalHub:
+    """Registre partagé des workers et des propriétaires de salles."""
+
+    def __init__(self):
+        """Initialise un registre vide."""
+        self.workers = {}  # clé: worker_id, valeur: LocalBackplane
+        self.owners = {}  # clé: room_id, valeur: worker_id
+
+
+class LocalBackplane(Backplane):
+    """Bus de messages en mémoire.
+
+    Cette classe :
+    - dépose les messages directement dans la boîte de réception du
+      worker destinataire,
+    - attribue les salles à l'aide d'un dictionnaire partagé.
+    """
+
+    def __init__(self, hub=None, worker_id=None):
+        """Initialise le bus de messages en mémoire.
+
+        Args:
+            hub (LocalHub | None): Registre partagé avec les autres
+                workers du processus. Un registre propre au worker est
+                créé s'il n'est pas fourni.
+            worker_id (str | None): Identifiant du worker courant.
+        """
+        super().__init__(worker_id)
+        self.hub = hub if hub is not None else LocalHub()
+        self.hub.workers[self.worker_id] = self
+
+    async def publish(self, worker_id, message):
+        """Envoie un message à la boîte de réception d'un worker.
+
+        Args:
+            worker_id (str): Identifiant du worker destinataire.
+            message (dict): Message à transmettre.
+
+        Returns:
+            bool: True si le worker existe, sinon False.
+        """
+        target = self.hub.workers.get(worker_id)
+        if target is None:
+            return False
+
+        target.deliver(message)
+        return True
+
+    async def claim(self, room_id):
+        """Attribue une salle au worker courant si elle est libre.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+
+        Returns:
+            str: Identifiant du worker propriétaire de la salle.
+        """
+        return self.hub.owners.setdefault(room_id, self.worker_id)
+
+    async def release(self, room_id):
+        """Libère une salle appartenant au worker courant.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+        """
+        if self.hub.owners.get(room_id) == self.worker_id:
+            del self.hub.owners[room_id]
+
+    async def close(self):
+        """Retire le worker du registre et libère ses salles."""
+        await super().close()
+
+        self.hub.workers.pop(self.worker_id, None)
+        for room_id, owner in list(self.hub.owners.items()):
+            if owner == self.worker_id:
+                del self.hub.owners[room_id]
@@ -0,0 +1,146 @@
+"""
+Filtrage des messages WebSocket reçus des clients.
+
+Ce module définit la classe MessageGuard, appliquée à chaque message
+reçu, avant tout décodage ou toute validation du coup :
+- un message plus grand que `max_frame_size` est refusé (un coup ou une
+  demande de resynchronisation ne fait que quelques octets),
+- le débit est limité par un seau à jetons (TokenBucket) propre à chaque
+  WebSocket, et par un second seau propre à chaque utilisateur connecté,
+  partagé par tous ses onglets.
+
+Un client qui inonde le serveur ne peut ainsi pas monopoliser la boucle
+d'événements au détriment des autres salles. Les messages refusés sont
+comptés par motif.
+
+La taille est d'abord bornée par le protocole (`WEBSOCKET_MAX_SIZE`,
+voir app.py), qui ferme la connexion (1009) avant de lire une trame
+trop grande en entier ; la vérification de `check` reste une seconde
+protection.
+"""
+from classes.LRUCache import LRUCache
+from classes.TokenBucket import TokenBucket
+
+
+class MessageGuard:
+    """Limitation de taille et de débit des messages des clients.
+
+    Cette classe :
+    - refuse les messages trop volumineux,
+    - limite le débit de chaque WebSocket et de chaque utilisateur,
+    - signale les clients dont trop de messages ont été refusés,
+    - compte les messages acceptés et refusés.
+    """
+
+    # Motifs de refus retournés par `check`.
+    TOO_LARGE = "too_large"  # Message trop volumineux : client fermé
+    RATE_LIMITED = "rate_limited"  # Débit dépassé : message ignoré
+    ABUSIVE = "abusive"  # Trop de messages refusés : client fermé
+
+    def __init__(self, rate=10, burst=20, user_rate=20, user_burst=40,
+                 max_frame_size=64, max_rejected=100, max_users=10_000):
+        """Initialise le filtrage des messages.
+
+        Args:
+            rate (float): Messages par seconde permis par WebSocket.
+            burst (int): Rafale permise par WebSocket.
+            user_rate (float): Messages par seconde permis par
+                utilisateur, tous WebSockets confondus.
+            user_burst (int): Rafale permise par utilisateur.
+            max_frame_size (int): Taille maximale d'un message, en
+                caractères (texte) ou en octets (binaire).
+            max_rejected (int): Nombre de messages refusés au-delà
+                duquel le client est fermé.
+            max_users (int): Nombre maximal de seaux d'utilisateurs
+                conservés (les moins récents sont oubliés).
+        """
+        self.rate = rate
+        self.burst = burst
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.max_frame_size = max_frame_size
+        self.max_rejected = max_rejected
+        self.users = LRUCache(max_users)  # clé: user_id, valeur: seau
+
+        self.accepted = 0
+        self.rejected = {
+            self.TOO_LARGE: 0,
+            "ws_rate": 0,
+            "user_rate": 0,
+        }
+        self.closed = 0
+
+    def _bucket(self, ws, now):
+        """Retourne le seau d'un WebSocket, en le créant au besoin."""
+        bucket = getattr(ws, "bucket", None)
+        if bucket is None:
+            bucket = ws.bucket = TokenBucket(self.rate, self.burst, now)
+
+        return bucket
+
+    def _user_bucket(self, user_id, now):
+        """Retourne le seau d'un utilisateur, en le créant au besoin."""
+        bucket = self.users.get(user_id)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst, now)
+            self.users.put(user_id, bucket)
+
+        return bucket
+
+    def check(self, ws, data, now=None):
+        """Vérifie un message reçu d'un client.
+
+        Args:
+            ws: WebSocket du client.
+            data (str | bytes | None): Message reçu.
+            now (float | None): Date courante (`time.monotonic`).
+
+        Returns:
+            str | None: None si le message est accepté, sinon le motif du
+            refus (`TOO_LARGE`, `RATE_LIMITED` ou `ABUSIVE`).
+        """
+        if data is not None and len(data) > self.max_frame_size:
+            self.rejected[self.TOO_LARGE] += 1
+            self.closed += 1
+            return self.TOO_LARGE
+
+        if not self._bucket(ws, now).consume(now):
+            self.rejected["ws_rate"] += 1
+            return self._rate_limited(ws)
+
+        user_id = getattr(ws, "user_id", None)
+        if user_id is not None and not self._user_bucket(
+            user_id, now
+        ).consume(now):
+            self.rejected["user_rate"] += 1
+            return self._rate_limited(ws)
+
+        self.accepted += 1
+        return None
+
+    def _rate_limited(self, ws):
+        """Compte un message refusé pour débit excessif.
+
+        Returns:
+            str: `ABUSIVE` si le client a dépassé `max_rejected` refus,
+            sinon `RATE_LIMITED`.
+        """
+        ws.rejected = getattr(ws, "rejected", 0) + 1
+        if ws.rejected > self.max_rejected:
+            self.closed += 1
+            return self.ABUSIVE
+
+        return self.RATE_LIMITED
+
+    def stats(self):
+        """Retourne les compteurs des messages filtrés.
+
+        Returns:
+            dict: Messages acceptés, refusés par motif, et clients fermés.
+        """
+        return {
+            "accepted": self.accepted,
+            "rejected": dict(self.rejected),
+            "closed": self.closed,
+            "users": len(self.users),
+        }
@@ -0,0 +1,120 @@
+"""
+File d'envoi sortante d'une connexion WebSocket.
+
+Ce module définit la classe Outbox, qui conserve les messages en attente
+d'envoi vers un client. La file est bornée : un client trop lent, dont
+la file déborde ou dont un envoi dépasse le délai maximal, est signalé
+afin d'être retiré de la partie au lieu de ralentir les autres joueurs.
+Un nouvel état du plateau remplace l'état précédent encore en attente,
+puisque seul le plus récent est utile au client.
+"""
+import asyncio
+from collections import deque
+from classes.EncodedMessage import EncodedMessage
+
+
+class Outbox:
+    """File d'envoi bornée associée à un WebSocket.
+
+    Cette classe :
+    - accumule les messages à envoyer à un client,
+    - remplace un état du plateau périmé par le plus récent,
+    - envoie les messages dans l'ordre avec un délai maximal par envoi,
+    - détecte les clients trop lents.
+    """
+
+    MAX_PENDING = 32  # Nombre maximal de messages en attente
+    SEND_TIMEOUT = 2.0  # Délai maximal d'un envoi, en secondes
+    CLOSE_TIMEOUT = 1.0  # Délai maximal de fermeture, en secondes
+
+    def __init__(self, ws):
+        """Initialise la file d'envoi.
+
+        Args:
+            ws: WebSocket du client.
+        """
+        self.ws = ws
+        self.queue = deque()  # Tuples (message, replaceable)
+        self.sending = False
+        self.close_task = None
+
+    @classmethod
+    def of(cls, ws):
+        """Retourne la file d'envoi d'un WebSocket, en la créant au besoin.
+
+        Args:
+            ws: WebSocket du client.
+
+        Returns:
+            Outbox: File d'envoi associée au WebSocket.
+        """
+        outbox = getattr(ws, "outbox", None)
+        if outbox is None:
+            outbox = cls(ws)
+            ws.outbox = outbox
+
+        return outbox
+
+    def push(self, message, replaceable=False):
+        """Ajoute un message à la file d'envoi.
+
+        Si le dernier message en attente et le nouveau message sont tous
+        deux remplaçables (états du plateau), le message en attente est
+        remplacé par le nouveau.
+
+        Args:
+            message (str | EncodedMessage): Message à envoyer.
+            replaceable (bool): Indique si le message peut être remplacé
+                par un message plus récent du même type.
+
+        Returns:
+            bool: False si la file déborde (client trop lent), sinon True.
+        """
+        if replaceable and self.queue and self.queue[-1][1]:
+            self.queue[-1] = (message, True)
+        else:
+            self.queue.append((message, replaceable))
+
+        return len(self.queue) <= self.MAX_PENDING
+
+    async def drain(self):
+        """Envoie les messages en attente, dans l'ordre.
+
+        Si un envoi est déjà en cours pour ce client, les messages ajoutés
+        seront envoyés par celui-ci et la méthode retourne immédiatement.
+
+        Returns:
+            bool: False si un envoi a échoué ou dépassé le délai maximal
+            (client à retirer), sinon True.
+        """
+        if self.sending:
+            return True
+
+        self.sending = True
+        try:
+            while self.queue:
+                message, _ = self.queue.popleft()
+                if isinstance(message, EncodedMessage):
+                    sending = message.send(self.ws)
+                else:
+                    sending = self.ws.send(message)
+                await asyncio.wait_for(sending, self.SEND_TIMEOUT)
+        except Exception:
+            self.queue.clear()
+            return False
+        finally:
+            self.sending = False
+
+        return True
+
+    def close(self):
+        """Ferme la connexion en arrière-plan, sans attendre le client."""
+        if self.close_task is None:
+            self.close_task = asyncio.ensure_future(self._close())
+
+    async def _close(self):
+        """Ferme la connexion avec un délai maximal."""
+        try:
+            await asyncio.wait_for(self.ws.close(), self.CLOSE_TIMEOUT)
+        except Exception:
+            pass
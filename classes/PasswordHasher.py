@@ -0,0 +1,146 @@
+"""
+Hachage des mots de passe des utilisateurs.
+
+Ce module définit la classe PasswordHasher, qui calcule et vérifie les
+empreintes des mots de passe avec PBKDF2-HMAC-SHA256 (module `hashlib`).
+Chaque empreinte est stockée sous la forme :
+
+    pbkdf2_sha256$<itérations>$<sel base64>$<empreinte base64>
+
+Le nombre d'itérations (le coût du hachage) est ajustable ; les
+empreintes calculées avec un coût différent restent vérifiables et
+peuvent être recalculées à la connexion suivante (`needs_rehash`). Les
+mots de passe enregistrés en clair par les versions précédentes sont
+encore acceptés, puis remplacés par une empreinte.
+
+Le hachage est volontairement coûteux : il doit être exécuté hors de la
+boucle d'événements (voir DBExecutor).
+"""
+import base64
+import hashlib
+import hmac
+import os
+
+ALGORITHM = "pbkdf2_sha256"
+
+
+class PasswordHasher:
+    """Calcul et vérification des empreintes de mots de passe.
+
+    Cette classe :
+    - calcule une empreinte salée avec un coût ajustable,
+    - vérifie un mot de passe en temps constant,
+    - indique si une empreinte doit être recalculée.
+    """
+
+    # Coût par défaut ; ajustable avec SANIC_PASSWORD_ITERATIONS.
+    ITERATIONS = 200_000
+    SALT_SIZE = 16
+
+    def __init__(self, iterations=ITERATIONS):
+        """Initialise le calcul des empreintes.
+
+        Args:
+            iterations (int): Nombre d'itérations PBKDF2 des nouvelles
+                empreintes.
+
+        Raises:
+            ValueError: Si le nombre d'itérations est inférieur à 1.
+        """
+        if iterations < 1:
+            raise ValueError("Nombre d'itérations invalide")
+
+        self.iterations = iterations
+        self._dummy = None
+
+    @staticmethod
+    def _derive(password, salt, iterations):
+        """Calcule l'empreinte brute d'un mot de passe."""
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode("utf-8"), salt, iterations
+        )
+
+    @staticmethod
+    def _parse(encoded):
+        """Découpe une empreinte stockée.
+
+        Returns:
+            tuple | None: (itérations, sel, empreinte), ou None si la
+            valeur n'est pas une empreinte (mot de passe en clair).
+        """
+        parts = encoded.split("$")
+        if len(parts) != 4 or parts[0] != ALGORITHM:
+            return None
+
+        try:
+            return (
+                int(parts[1]),
+                base64.b64decode(parts[2]),
+                base64.b64decode(parts[3]),
+            )
+        except ValueError:
+            return None
+
+    def hash(self, password):
+        """Calcule l'empreinte d'un mot de passe.
+
+        Args:
+            password (str): Mot de passe en clair.
+
+        Returns:
+            str: Empreinte à stocker.
+        """
+        salt = os.urandom(self.SALT_SIZE)
+        digest = self._derive(password, salt, self.iterations)
+
+        return "$".join((
+            ALGORITHM,
+            str(self.iterations),
+            base64.b64encode(salt).decode("ascii"),
+            base64.b64encode(digest).decode("ascii"),
+        ))
+
+    def verify(self, password, encoded):
+        """Vérifie un mot de passe à partir de son empreinte.
+
+        Si aucune empreinte n'est fournie (utilisateur inconnu), un
+        hachage équivalent est tout de même effectué, afin que la durée
+        de la réponse ne révèle pas l'existence du compte.
+
+        Args:
+            password (str): Mot de passe en clair.
+            encoded (str | None): Empreinte stockée, ou mot de passe en
+                clair d'un ancien compte.
+
+        Returns:
+            bool: True si le mot de passe correspond.
+        """
+        if encoded is None:
+            if self._dummy is None:
+                self._dummy = self.hash("")
+            self.verify(password, self._dummy)
+            return False
+
+        parsed = self._parse(encoded)
+        if parsed is None:
+            return hmac.compare_digest(
+                password.encode("utf-8"), encoded.encode("utf-8")
+            )
+
+        iterations, salt, digest = parsed
+        return hmac.compare_digest(
+            self._derive(password, salt, iterations), digest
+        )
+
+    def needs_rehash(self, encoded):
+        """Indique si une empreinte doit être recalculée.
+
+        Args:
+            encoded (str): Empreinte stockée.
+
+        Returns:
+            bool: True pour un mot de passe en clair ou une empreinte
+            calculée avec un autre coût.
+        """
+        parsed = self._parse(encoded)
+        return parsed is None or parsed[0] != self.iterations
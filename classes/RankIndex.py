@@ -0,0 +1,212 @@
+"""
+Index des rangs du leaderboard.
+
+Ce module définit la classe RankIndex, une structure de statistiques
+d'ordre (liste à enjambements indexable, « indexable skip list ») qui
+conserve les joueurs triés par points décroissants, puis par nom
+d'utilisateur. Chaque opération s'exécute en temps logarithmique
+(espérance) :
+- mise à jour des points d'un joueur,
+- rang d'un joueur,
+- joueur situé à un rang donné, suivi des k joueurs suivants.
+
+Les rangs commencent à 1.
+"""
+import math
+import random
+
+# Nombre de niveaux de la liste : suffisant pour plusieurs millions de
+# joueurs.
+_LEVELS = 24
+
+# Clé de la sentinelle de fin, supérieure à toute clé (-points, nom).
+_END = (math.inf,)
+
+
+class _Node:
+    """Élément de la liste à enjambements."""
+
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels):
+        """Initialise un élément.
+
+        Args:
+            key (tuple): Clé de tri (-points, nom d'utilisateur).
+            levels (int): Nombre de niveaux de l'élément.
+        """
+        self.key = key
+        self.next = [None] * levels
+        # Nombre d'éléments franchis par chaque lien.
+        self.width = [1] * levels
+
+
+class RankIndex:
+    """Classement des joueurs, trié par points décroissants.
+
+    Cette classe :
+    - insère, déplace ou retire un joueur,
+    - retourne le rang d'un joueur,
+    - retourne une page du classement à partir d'un rang.
+    """
+
+    def __init__(self, scores=None):
+        """Initialise le classement.
+
+        Args:
+            scores (dict[str, int] | None): Points initiaux par joueur.
+        """
+        self._end = _Node(_END, 0)
+        self._head = _Node(None, _LEVELS)
+        self._head.next = [self._end] * _LEVELS
+        self.points = {}  # clé: username, valeur: points indexés
+
+        for username, points in (scores or {}).items():
+            self.update(username, points)
+
+    def __len__(self):
+        """Retourne le nombre de joueurs classés."""
+        return len(self.points)
+
+    def __contains__(self, username):
+        """Indique si un joueur est classé."""
+        return username in self.points
+
+    def _find(self, key):
+        """Retourne les prédécesseurs d'une clé à chaque niveau.
+
+        Returns:
+            tuple[list[_Node], list[int]]: Prédécesseur à chaque niveau
+            et position (0 = tête) de chacun.
+        """
+        chain = [None] * _LEVELS
+        positions = [0] * _LEVELS
+        node = self._head
+        position = 0
+
+        for level in reversed(range(_LEVELS)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            positions[level] = position
+
+        return chain, positions
+
+    def _insert(self, key):
+        """Insère une clé absente."""
+        chain, positions = self._find(key)
+
+        levels = 1
+        while levels < _LEVELS and random.random() < 0.5:
+            levels += 1
+
+        node = _Node(key, levels)
+        for level in range(levels):
+            prev = chain[level]
+            steps = positions[0] - positions[level]
+            node.next[level] = prev.next[level]
+            prev.next[level] = node
+            node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+
+        for level in range(levels, _LEVELS):
+            chain[level].width[level] += 1
+
+    def _remove(self, key):
+        """Retire une clé présente."""
+        chain, _ = self._find(key)
+        node = chain[0].next[0]
+
+        for level in range(len(node.next)):
+            prev = chain[level]
+            prev.width[level] += node.width[level] - 1
+            prev.next[level] = node.next[level]
+
+        for level in range(len(node.next), _LEVELS):
+            chain[level].width[level] -= 1
+
+    def update(self, username, points):
+        """Place un joueur au rang correspondant à ses points.
+
+        Args:
+            username (str): Nom du joueur.
+            points (int): Total de points du joueur.
+        """
+        old = self.points.get(username)
+        if old == points:
+            return
+
+        if old is not None:
+            self._remove((-old, username))
+        self._insert((-points, username))
+        self.points[username] = points
+
+    def remove(self, username):
+        """Retire un joueur du classement, s'il y figure.
+
+        Args:
+            username (str): Nom du joueur.
+        """
+        old = self.points.pop(username, None)
+        if old is not None:
+            self._remove((-old, username))
+
+    def rank(self, username):
+        """Retourne le rang d'un joueur.
+
+        Args:
+            username (str): Nom du joueur.
+
+        Returns:
+            int | None: Rang du joueur (1 pour le premier), ou None s'il
+            n'est pas classé.
+        """
+        points = self.points.get(username)
+        if points is None:
+            return None
+
+        _, positions = self._find((-points, username))
+        return positions[0] + 1
+
+    def page(self, start=1, count=10):
+        """Retourne les joueurs classés à partir d'un rang.
+
+        Args:
+            start (int): Rang du premier joueur retourné (à partir de 1).
+            count (int): Nombre maximal de joueurs retournés.
+
+        Returns:
+            list[tuple[int, str, int]]: Tuples (rang, username, points).
+        """
+        if start < 1 or count < 1 or start > len(self):
+            return []
+
+        # Recherche du joueur précédant le rang demandé.
+        node = self._head
+        remaining = start - 1
+        for level in reversed(range(_LEVELS)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        result = []
+        node = node.next[0]
+        rank = start
+        while node is not self._end and len(result) < count:
+            result.append((rank, node.key[1], -node.key[0]))
+            node = node.next[0]
+            rank += 1
+
+        return result
+
+    def top(self, count=10):
+        """Retourne les meilleurs joueurs.
+
+        Args:
+            count (int): Nombre maximal de joueurs retournés.
+
+        Returns:
+            list[tuple[int, str, int]]: Tuples (rang, username, points).
+        """
+        return self.page(1, count)
@@ -0,0 +1,69 @@
+"""
+Connexion WebSocket tenue par un autre worker.
+
+Ce module définit la classe RemoteConnection, qui représente, dans la
+partie du worker propriétaire d'une salle, un client connecté à un autre
+worker. Elle expose la même interface qu'un WebSocket (`send`, `close`)
+et transmet chaque message au worker du client par le bus de messages
+(`Backplane`). Elle peut donc être ajoutée à `Game.connected` et recevoir
+les diffusions de `WebsocketHelper` comme une connexion locale.
+"""
+from classes.Backplane import Backplane
+
+
+class RemoteConnection:
+    """Connexion d'un client rattaché à un autre worker.
+
+    Cette classe :
+    - conserve les informations du client (utilisateur, protocole),
+    - relaie les messages et la fermeture vers le worker du client.
+    """
+
+    def __init__(self, backplane, worker_id, conn_id, user_id=None,
+                 username=None, delta=False, binary=False):
+        """Initialise la connexion distante.
+
+        Args:
+            backplane (Backplane): Bus de messages entre workers.
+            worker_id (str): Identifiant du worker qui tient le WebSocket.
+            conn_id (str): Identifiant de la connexion sur ce worker.
+            user_id (int | None): Identifiant de l'utilisateur connecté.
+            username (str | None): Nom de l'utilisateur connecté.
+            delta (bool): Le client utilise le mode delta.
+            binary (bool): Le client utilise le protocole binaire.
+        """
+        self.backplane = backplane
+        self.worker_id = worker_id
+        self.conn_id = conn_id
+        self.user_id = user_id
+        self.username = username
+        self.delta = delta
+        self.binary = binary
+
+    async def send(self, data):
+        """Transmet un message au client par le worker qui le tient.
+
+        Args:
+            data (str | bytes): Message texte ou binaire.
+
+        Raises:
+            ConnectionError: Si le worker du client est injoignable.
+        """
+        message = {"type": "send", "conn": self.conn_id}
+        message.update(Backplane.pack(data))
+
+        if not await self.backplane.publish(self.worker_id, message):
+            raise ConnectionError("Worker injoignable")
+
+    async def close(self, code=1000, reason=""):
+        """Demande la fermeture du WebSocket au worker qui le tient.
+
+        Args:
+            code (int): Code de fermeture WebSocket.
+            reason (str): Raison de la fermeture.
+        """
+        await self.backplane.publish(
+            self.worker_id,
+            {"type": "close", "conn": self.conn_id, "code": code,
+             "reason": reason}
+        )
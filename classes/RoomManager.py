@@ -0,0 +1,191 @@
+"""
+Gestion des salles de jeu pour le serveur Tic-Tac-Toe.
+
+Ce module définit la classe RoomManager, responsable de la création,
+de la recherche et du nettoyage des parties (`Game`) indexées par un
+identifiant de salle. Chaque salle possède son propre plateau et ses
+propres connexions, ce qui permet de jouer plusieurs parties en même
+temps sur un seul serveur.
+
+Le nombre de salles et le nombre de spectateurs par salle peuvent être
+bornés, afin que la mémoire d'un serveur démarré depuis longtemps reste
+limitée.
+
+Le registre conserve aussi les délais de reconnexion des joueurs
+déconnectés de chaque salle : ils sont annulés avec la suppression de
+la salle, afin qu'un délai ne puisse pas expirer dans une nouvelle salle
+de même identifiant.
+"""
+from classes.Game import Game
+
+
+class RoomLimitError(Exception):
+    """Nombre maximal de salles atteint."""
+
+
+class RoomManager:
+    """Registre des parties en cours, indexées par identifiant de salle.
+
+    Cette classe :
+    - crée une nouvelle partie lors de la première connexion à une salle,
+    - retrouve la partie associée à une salle existante,
+    - supprime les salles qui ne possèdent plus aucune connexion,
+    - annule les délais de reconnexion des salles supprimées,
+    - borne le nombre de salles et de spectateurs par salle,
+    - estime la mémoire occupée par les salles.
+    """
+
+    DEFAULT_ROOM = "default"
+
+    def __init__(self, game_factory=Game, max_rooms=None,
+                 max_spectators=None):
+        """Initialise le registre des salles.
+
+        Args:
+            game_factory (callable): Fonction ou classe appelée avec les
+                options de la salle pour créer la partie d'une nouvelle
+                salle.
+            max_rooms (int | None): Nombre maximal de salles, ou None
+                sans limite.
+            max_spectators (int | None): Nombre maximal de spectateurs
+                par salle, ou None sans limite.
+        """
+        self.game_factory = game_factory
+        self.max_rooms = max_rooms
+        self.max_spectators = max_spectators
+        self.rooms = {}  # clé: room_id, valeur: Game
+        self.timers = {}  # Délais de reconnexion, clé: (room_id, symbole)
+        self.memory_bytes = None  # Mémoire estimée au dernier parcours
+
+    def __len__(self):
+        """Retourne le nombre de salles actives."""
+        return len(self.rooms)
+
+    def __contains__(self, room_id):
+        """Indique si une salle existe pour cet identifiant."""
+        return room_id in self.rooms
+
+    def get(self, room_id):
+        """Retourne la partie d'une salle existante.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+
+        Returns:
+            Game | None: Partie associée à la salle, ou None si la salle
+            n'existe pas.
+        """
+        return self.rooms.get(room_id)
+
+    def get_or_create(self, room_id, **options):
+        """Retourne la partie d'une salle, en la créant au besoin.
+
+        Les options ne sont utilisées que lors de la création de la
+        salle ; une salle existante conserve sa configuration.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+            **options: Arguments nommés transmis à `game_factory`
+                (par exemple `size` et `win_length`).
+
+        Returns:
+            Game: Partie associée à la salle.
+
+        Raises:
+            ValueError: Si les options de la nouvelle salle sont
+                invalides.
+            RoomLimitError: Si le nombre maximal de salles est atteint.
+        """
+        game = self.rooms.get(room_id)
+        if game is None:
+            if self.max_rooms is not None and len(self) >= self.max_rooms:
+                raise RoomLimitError(room_id)
+            game = self.game_factory(**options)
+            self.rooms[room_id] = game
+
+        return game
+
+    def remove(self, room_id):
+        """Supprime une salle du registre et annule ses délais.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+
+        Returns:
+            Game | None: Partie supprimée, ou None si la salle n'existait
+            pas.
+        """
+        game = self.rooms.pop(room_id, None)
+        if game is not None:
+            self.cancel_timers(room_id, game)
+
+        return game
+
+    def cleanup(self, room_id):
+        """Supprime une salle si plus aucune connexion n'y est active.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+
+        Returns:
+            bool: True si la salle a été supprimée, sinon False.
+        """
+        game = self.rooms.get(room_id)
+        if game is not None and not game.connected:
+            self.remove(room_id)
+            return True
+
+        return False
+
+    def cancel_timers(self, room_id, game):
+        """Annule les délais de reconnexion d'une salle.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+            game (Game): Partie de la salle.
+        """
+        for symbol in game.seats:
+            timer = self.timers.pop((room_id, symbol), None)
+            if timer is not None:
+                timer.cancel()
+
+    def spectators_full(self, game):
+        """Indique si une partie dépasse le nombre maximal de spectateurs.
+
+        Args:
+            game (Game): Partie d'une salle.
+
+        Returns:
+            bool: True si la partie compte plus de spectateurs que permis.
+        """
+        return (
+            self.max_spectators is not None
+            and len(game.spectators) > self.max_spectators
+        )
+
+    def stats(self):
+        """Retourne l'occupation et la mémoire estimée des salles.
+
+        La mémoire n'est pas mesurée ici : le parcours de toutes les
+        parties bloquerait la boucle d'événements à chaque appel. C'est
+        l'estimation du dernier parcours du nettoyage (`RoomReaper`).
+
+        Returns:
+            dict: Nombre de salles, de connexions et de spectateurs, et
+            mémoire estimée des parties (`Game.memory_size`), en octets,
+            ou None si elle n'a pas encore été mesurée.
+        """
+        connections = spectators = 0
+
+        for game in self.rooms.values():
+            connections += len(game.connected)
+            spectators += len(game.spectators)
+
+        return {
+            "rooms": len(self.rooms),
+            "max_rooms": self.max_rooms,
+            "connections": connections,
+            "spectators": spectators,
+            "max_spectators": self.max_spectators,
+            "memory_bytes": self.memory_bytes,
+        }
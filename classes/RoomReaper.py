@@ -0,0 +1,189 @@
+"""
+Nettoyage périodique des salles de jeu.
+
+Ce module définit la classe RoomReaper, une tâche de fond qui parcourt
+régulièrement le registre des salles (RoomManager) afin que la mémoire
+d'un serveur démarré depuis longtemps reste bornée :
+- une salle inactive (aucune arrivée ni aucun coup) depuis trop
+  longtemps est supprimée et ses connexions sont fermées ; le délai est
+  plus court pour une salle à laquelle il manque un joueur,
+- chaque WebSocket local reçoit un ping ; un client qui ne répond pas à
+  temps (pong) est retiré de sa salle, comme un client trop lent.
+
+Le même parcours estime la mémoire occupée par les salles conservées
+(`RoomManager.memory_bytes`), retournée telle quelle par `/stats`.
+
+Les connexions d'une salle supprimée sont fermées avec le code
+`CLOSE_CODE` (4000), sur lequel le client ne se reconnecte pas : un
+onglet inactif ne recrée pas la salle aussitôt supprimée. Les délais de
+reconnexion de la salle sont annulés avec elle (`RoomManager.remove`).
+
+Les clients relayés par un autre worker (`RemoteConnection`) ne sont pas
+sondés : leur WebSocket est surveillé par le worker qui le tient.
+"""
+import asyncio
+import sys
+import time
+from classes.WebsocketHelper import WebsocketHelper
+
+
+class RoomReaper:
+    """Tâche de fond d'expiration des salles et des clients inactifs.
+
+    Cette classe :
+    - supprime les salles inactives ou incomplètes depuis trop longtemps,
+    - vérifie que chaque client local répond aux pings,
+    - estime la mémoire occupée par les salles,
+    - compte les salles et les connexions retirées.
+    """
+
+    IDLE_TIMEOUT = 900  # Salle complète sans activité, en secondes
+    WAITING_TIMEOUT = 300  # Salle incomplète sans activité, en secondes
+    PING_TIMEOUT = 10  # Délai maximal d'une réponse à un ping
+    INTERVAL = 30  # Délai entre deux parcours, en secondes
+    CLOSE_CODE = 4000  # Code de fermeture : salle supprimée, sans reconnexion
+
+    def __init__(self, rooms, idle_timeout=IDLE_TIMEOUT,
+                 waiting_timeout=WAITING_TIMEOUT, ping_timeout=PING_TIMEOUT,
+                 interval=INTERVAL):
+        """Initialise le nettoyage des salles.
+
+        Args:
+            rooms (RoomManager): Registre des salles.
+            idle_timeout (float): Inactivité maximale d'une salle dont les
+                deux places sont occupées, en secondes.
+            waiting_timeout (float): Inactivité maximale d'une salle à
+                laquelle il manque un joueur, en secondes.
+            ping_timeout (float | None): Délai maximal de réponse à un
+                ping, en secondes, ou None pour ne pas sonder les clients.
+            interval (float): Délai entre deux parcours, en secondes.
+        """
+        self.rooms = rooms
+        self.idle_timeout = idle_timeout
+        self.waiting_timeout = waiting_timeout
+        self.ping_timeout = ping_timeout
+        self.interval = interval
+        self._task = None
+
+        self.sweeps = 0
+        self.rooms_reaped = 0
+        self.connections_reaped = 0
+
+    def start(self):
+        """Démarre le parcours périodique des salles."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Arrête le parcours périodique des salles."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """Parcourt les salles à intervalle régulier."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Erreur de nettoyage des salles : {e}")
+
+    def is_idle(self, game, now):
+        """Indique si une salle est inactive depuis trop longtemps.
+
+        Args:
+            game (Game): Partie de la salle.
+            now (float): Date courante (`time.monotonic`).
+
+        Returns:
+            bool: True si la salle doit être supprimée.
+        """
+        full = all(ws is not None for ws in game.seats.values())
+        timeout = self.idle_timeout if full else self.waiting_timeout
+        return now - game.last_active > timeout
+
+    async def sweep(self, now=None):
+        """Supprime les salles inactives et retire les clients muets.
+
+        Args:
+            now (float | None): Date courante (`time.monotonic`).
+
+        Returns:
+            int: Nombre de salles supprimées.
+        """
+        now = now if now is not None else time.monotonic()
+        self.sweeps += 1
+
+        idle = []
+        probes = []
+        seen = set()
+        memory = sys.getsizeof(self.rooms.rooms)
+        for room_id, game in list(self.rooms.rooms.items()):
+            if self.is_idle(game, now):
+                idle.append((room_id, game))
+                continue
+
+            memory += game.memory_size(seen)
+            if self.ping_timeout is not None:
+                probes.extend(
+                    (game, ws) for ws in list(game.connected)
+                    if hasattr(ws, "ping")
+                )
+        self.rooms.memory_bytes = memory
+
+        # La salle est retirée du registre avant la fermeture des
+        # connexions : leur départ ne démarre pas de délai de reconnexion.
+        for room_id, game in idle:
+            self.rooms.remove(room_id)
+            self.connections_reaped += len(game.connected)
+            await WebsocketHelper(game).close_all_connections(
+                self.CLOSE_CODE, "Salle fermée pour inactivité"
+            )
+        self.rooms_reaped += len(idle)
+
+        alive = await asyncio.gather(
+            *(self._is_alive(ws) for _, ws in probes)
+        )
+        for (game, ws), ok in zip(probes, alive):
+            if not ok and ws in game.connected:
+                WebsocketHelper(game).drop(ws)
+                self.connections_reaped += 1
+
+        return len(idle)
+
+    async def _is_alive(self, ws):
+        """Envoie un ping à un client et attend sa réponse.
+
+        Args:
+            ws: WebSocket local du client.
+
+        Returns:
+            bool: True si le client a répondu dans le délai.
+        """
+        async def ping():
+            pong = await ws.ping()
+            await pong
+
+        try:
+            await asyncio.wait_for(ping(), self.ping_timeout)
+        except Exception:
+            return False
+
+        return True
+
+    def stats(self):
+        """Retourne les compteurs du nettoyage.
+
+        Returns:
+            dict: Nombre de parcours, de salles et de connexions retirées.
+        """
+        return {
+            "sweeps": self.sweeps,
+            "rooms_reaped": self.rooms_reaped,
+            "connections_reaped": self.connections_reaped,
+        }
@@ -0,0 +1,314 @@
+"""
+Bus de messages entre workers partageant une base SQLite.
+
+Ce module définit la classe SQLiteBackplane, une implémentation de
+`Backplane` qui permet à plusieurs processus (workers Sanic) d'une même
+machine d'échanger des messages par l'intermédiaire d'une base SQLite :
+- la table `backplane_messages` sert de boîte de réception, interrogée
+  périodiquement par chaque worker,
+- la table `backplane_rooms` associe chaque salle à son worker
+  propriétaire,
+- la table `backplane_workers` contient le bail (`lease`) de chaque
+  worker, renouvelé périodiquement tant que le worker est en vie.
+
+Un worker arrêté brutalement (plantage, redémarrage) ne libère pas ses
+salles : son bail expire, ses salles sont alors reprises par le premier
+worker qui les demande, et les messages qui lui sont destinés sont
+refusés. Les lignes des workers expirés sont supprimées au démarrage de
+chaque worker, puis à chaque renouvellement de bail.
+
+Les accès à la base sont exécutés par `DBExecutor` afin de ne pas
+bloquer la boucle d'événements.
+"""
+import asyncio
+import json
+import sqlite3
+import time
+from classes.Backplane import Backplane
+from classes.ConnectionPool import ConnectionPool
+from classes.DBExecutor import DBExecutor
+
+
+class SQLiteBackplane(Backplane):
+    """Bus de messages stocké dans une base SQLite.
+
+    Cette classe :
+    - écrit les messages publiés dans la boîte de réception du
+      destinataire, dans l'ordre de publication,
+    - lit et supprime périodiquement les messages reçus,
+    - attribue les salles de façon atomique (`INSERT OR IGNORE`),
+    - renouvelle le bail du worker et reprend les salles des workers
+      dont le bail a expiré,
+    - refuse les messages destinés à un worker arrêté,
+    - libère les salles du worker à l'arrêt.
+    """
+
+    LEASE = 10  # Durée du bail d'un worker, en secondes
+
+    def __init__(self, db_path="backplane.db", poll_interval=0.01,
+                 worker_id=None, lease=LEASE):
+        """Initialise le bus de messages SQLite.
+
+        Le bail du worker est enregistré dès sa création.
+
+        Args:
+            db_path (str): Chemin vers le fichier de base de données
+                partagé par les workers.
+            poll_interval (float): Délai, en secondes, entre deux
+                lectures de la boîte de réception.
+            worker_id (str | None): Identifiant du worker courant.
+            lease (float): Durée du bail, en secondes. Le bail est
+                renouvelé trois fois par durée.
+        """
+        super().__init__(worker_id)
+        self.db_path = db_path
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.pool = ConnectionPool.get(db_path)
+        self.pool.ensure_schema("SQLiteBackplane", self._ensure_schema)
+        self._publish_lock = asyncio.Lock()
+        self._poller = None
+        self._renew_at = 0.0
+        self._heartbeat()
+
+    def _ensure_schema(self):
+        """Crée les tables du bus si elles n'existent pas."""
+        with self.pool.connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backplane_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    worker TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_backplane_messages_worker
+                ON backplane_messages (worker, id)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backplane_rooms (
+                    room_id TEXT PRIMARY KEY,
+                    worker TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backplane_workers (
+                    worker TEXT PRIMARY KEY,
+                    expires REAL NOT NULL
+                )
+            """)
+
+    def _renew(self, conn, now):
+        """Prolonge le bail du worker courant.
+
+        Args:
+            conn (sqlite3.Connection): Connexion de la transaction.
+            now (float): Date courante (`time.time`).
+        """
+        conn.execute(
+            "INSERT OR REPLACE INTO backplane_workers (worker, expires) "
+            "VALUES (?, ?)",
+            (self.worker_id, now + self.lease)
+        )
+        self._renew_at = now + self.lease / 3
+
+    def _heartbeat(self):
+        """Renouvelle le bail du worker et supprime les workers expirés.
+
+        Les salles et les messages en attente des workers dont le bail a
+        expiré sont supprimés avec eux.
+        """
+        now = time.time()
+        with self.pool.connection() as conn:
+            self._renew(conn, now)
+            conn.execute(
+                "DELETE FROM backplane_workers WHERE expires <= ?", (now,)
+            )
+            conn.execute(
+                "DELETE FROM backplane_rooms WHERE worker NOT IN "
+                "(SELECT worker FROM backplane_workers)"
+            )
+            conn.execute(
+                "DELETE FROM backplane_messages WHERE worker NOT IN "
+                "(SELECT worker FROM backplane_workers)"
+            )
+
+    def _insert(self, worker_id, payload):
+        """Écrit un message dans la boîte de réception d'un worker.
+
+        Returns:
+            bool: True si le message a été écrit, False si le bail du
+            worker destinataire a expiré (ou s'il n'existe pas).
+        """
+        with self.pool.connection() as conn:
+            alive = conn.execute(
+                "SELECT 1 FROM backplane_workers "
+                "WHERE worker = ? AND expires > ?",
+                (worker_id, time.time())
+            ).fetchone()
+            if alive is None:
+                return False
+
+            conn.execute(
+                "INSERT INTO backplane_messages (worker, payload) "
+                "VALUES (?, ?)",
+                (worker_id, payload)
+            )
+
+        return True
+
+    def _fetch(self):
+        """Lit et supprime les messages reçus par le worker courant.
+
+        Returns:
+            list[str]: Messages sérialisés, dans l'ordre de publication.
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, payload FROM backplane_messages "
+                "WHERE worker = ? ORDER BY id",
+                (self.worker_id,)
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM backplane_messages WHERE id = ?",
+                [(row[0],) for row in rows]
+            )
+
+        return [row[1] for row in rows]
+
+    def _claim(self, room_id):
+        """Attribue une salle au worker courant si elle est libre.
+
+        Le bail du worker courant est renouvelé, et la salle d'un worker
+        dont le bail a expiré est reprise, dans la même transaction.
+        """
+        now = time.time()
+        with self.pool.connection() as conn:
+            self._renew(conn, now)
+            conn.execute(
+                "DELETE FROM backplane_rooms WHERE room_id = ? AND worker "
+                "NOT IN (SELECT worker FROM backplane_workers "
+                "WHERE expires > ?)",
+                (room_id, now)
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO backplane_rooms (room_id, worker) "
+                "VALUES (?, ?)",
+                (room_id, self.worker_id)
+            )
+            row = conn.execute(
+                "SELECT worker FROM backplane_rooms WHERE room_id = ?",
+                (room_id,)
+            ).fetchone()
+
+        return row[0]
+
+    def _release(self, room_id=None):
+        """Libère une salle, ou toutes les salles, du worker courant.
+
+        Sans salle précisée (arrêt du worker), le bail et les messages en
+        attente du worker sont aussi supprimés.
+        """
+        with self.pool.connection() as conn:
+            if room_id is None:
+                for table in ("backplane_rooms", "backplane_workers",
+                              "backplane_messages"):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE worker = ?",
+                        (self.worker_id,)
+                    )
+            else:
+                conn.execute(
+                    "DELETE FROM backplane_rooms "
+                    "WHERE room_id = ? AND worker = ?",
+                    (room_id, self.worker_id)
+                )
+
+    async def publish(self, worker_id, message):
+        """Envoie un message à la boîte de réception d'un worker.
+
+        Les publications du worker courant sont écrites une à la fois,
+        ce qui conserve leur ordre.
+
+        Args:
+            worker_id (str): Identifiant du worker destinataire.
+            message (dict): Message sérialisable en JSON.
+
+        Returns:
+            bool: True si le message a été écrit, False si le bail du
+            destinataire a expiré ou en cas d'erreur.
+        """
+        payload = json.dumps(message)
+
+        try:
+            async with self._publish_lock:
+                return await DBExecutor.default().run(
+                    self._insert, worker_id, payload
+                )
+        except sqlite3.Error as e:
+            print(f"Erreur de publication sur le bus : {e}")
+            return False
+
+    async def claim(self, room_id):
+        """Attribue une salle au worker courant si elle est libre.
+
+        Une salle dont le propriétaire a un bail expiré est reprise.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+
+        Returns:
+            str: Identifiant du worker propriétaire de la salle.
+        """
+        return await DBExecutor.default().run(self._claim, room_id)
+
+    async def release(self, room_id):
+        """Libère une salle appartenant au worker courant.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+        """
+        await DBExecutor.default().run(self._release, room_id)
+
+    async def start(self):
+        """Démarre la lecture périodique de la boîte de réception.
+
+        Les lignes des workers dont le bail a expiré sont d'abord
+        supprimées.
+        """
+        await DBExecutor.default().run(self._heartbeat)
+        await super().start()
+        if self._poller is None:
+            self._poller = asyncio.ensure_future(self._poll())
+
+    async def close(self):
+        """Arrête la lecture des messages et libère les salles du worker."""
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+        await DBExecutor.default().run(self._release)
+        await super().close()
+
+    async def _poll(self):
+        """Lit périodiquement la boîte de réception du worker.
+
+        Le bail du worker est renouvelé au tiers de sa durée.
+        """
+        while True:
+            try:
+                if time.time() >= self._renew_at:
+                    await DBExecutor.default().run(self._heartbeat)
+                payloads = await DBExecutor.default().run(self._fetch)
+            except sqlite3.Error as e:
+                print(f"Erreur de lecture du bus : {e}")
+                payloads = []
+
+            for payload in payloads:
+                self.deliver(json.loads(payload))
+
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,308 @@
+"""
+Jetons de session signés pour l'application Tic-Tac-Toe.
+
+Ce module définit la classe SessionManager, qui émet et vérifie les
+jetons de session remis à la connexion (cookie `session`). Un jeton
+contient l'identifiant et le nom de l'utilisateur, sa date d'expiration
+et un identifiant unique, signés par HMAC-SHA256 :
+
+    <contenu base64url>.<signature base64url>
+
+La vérification ne consulte pas la base de données : elle recalcule la
+signature et la compare en temps constant. Les jetons révoqués par
+`/logout` sont conservés en mémoire jusqu'à leur expiration.
+
+Tous les workers doivent partager la même clé secrète (voir
+`load_secret`). Avec une base de données partagée (`db_path`), les
+révocations sont aussi écrites dans la table `revoked_sessions`, que
+chaque worker relit périodiquement (`start`) : un jeton révoqué par un
+worker est refusé par tous les autres après au plus `refresh_interval`
+secondes. Sans base de données, la liste des jetons révoqués est propre
+au processus (un seul worker).
+"""
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from classes.ConnectionPool import ConnectionPool
+from classes.DBExecutor import DBExecutor
+
+
+def _encode(data):
+    """Encode des octets en base64url, sans remplissage."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _decode(text):
+    """Décode une chaîne base64url sans remplissage."""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class SessionManager:
+    """Émission, vérification et révocation des jetons de session.
+
+    Cette classe :
+    - signe les informations de l'utilisateur connecté,
+    - vérifie la signature et l'expiration d'un jeton sans accès disque,
+    - conserve en mémoire les jetons révoqués jusqu'à leur expiration,
+    - partage les révocations entre workers par la base de données.
+    """
+
+    # Durée de validité par défaut d'une session (7 jours).
+    MAX_AGE = 7 * 24 * 3600
+
+    # Délai entre deux lectures des révocations partagées, en secondes.
+    REFRESH_INTERVAL = 1
+
+    def __init__(self, secret=None, max_age=MAX_AGE, db_path=None,
+                 refresh_interval=REFRESH_INTERVAL):
+        """Initialise le gestionnaire de sessions.
+
+        Args:
+            secret (bytes | str | None): Clé de signature. Une clé
+                aléatoire, propre au processus, est générée si elle n'est
+                pas fournie.
+            max_age (int): Durée de validité des jetons, en secondes.
+            db_path (str | None): Base de données SQLite partagée par les
+                workers, où les révocations sont enregistrées. Si None,
+                les révocations restent propres au processus.
+            refresh_interval (float): Délai entre deux lectures des
+                révocations partagées, en secondes.
+        """
+        if secret is None:
+            secret = os.urandom(32)
+        elif not isinstance(secret, bytes):
+            secret = str(secret).encode("utf-8")
+
+        self._secret = secret
+        self.max_age = max_age
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self._revoked = {}  # clé: identifiant du jeton, valeur: expiration
+        self._last_id = 0  # Dernière révocation partagée lue
+        # `revoke` et `refresh` sont exécutées par les threads de
+        # `DBExecutor` : le verrou protège `_revoked` et `_last_id`.
+        self._lock = threading.Lock()
+        self._refresher = None
+
+    @staticmethod
+    def load_secret(path):
+        """Lit la clé secrète partagée, en la créant au besoin.
+
+        La création est atomique : si plusieurs workers démarrent en même
+        temps, ils utilisent tous la clé écrite par le premier.
+
+        Args:
+            path (str): Chemin du fichier de la clé.
+
+        Returns:
+            bytes: Clé secrète.
+        """
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_encode(os.urandom(32)).encode("ascii"))
+
+        # Le fichier peut être en cours d'écriture par un autre worker.
+        for _ in range(50):
+            with open(path, "rb") as f:
+                secret = f.read().strip()
+            if secret:
+                return secret
+            time.sleep(0.01)
+
+        raise RuntimeError(f"Clé de session vide : {path}")
+
+    def _sign(self, payload):
+        """Calcule la signature d'un contenu."""
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+    def issue(self, user_id, username, now=None):
+        """Émet un jeton de session pour un utilisateur.
+
+        Args:
+            user_id (int): Identifiant de l'utilisateur.
+            username (str): Nom de l'utilisateur.
+            now (float | None): Date d'émission (secondes depuis l'epoch).
+
+        Returns:
+            str: Jeton signé.
+        """
+        expires = int(now if now is not None else time.time()) + self.max_age
+        payload = (
+            f"{int(user_id)}|{expires}|{uuid.uuid4().hex}|{username}"
+        ).encode("utf-8")
+
+        return f"{_encode(payload)}.{_encode(self._sign(payload))}"
+
+    def _parse(self, token, now=None):
+        """Vérifie un jeton et retourne son contenu.
+
+        Returns:
+            tuple | None: (id, expiration, identifiant du jeton, nom), ou
+            None si le jeton est invalide ou expiré.
+        """
+        if not token:
+            return None
+
+        body, _, signature = token.partition(".")
+        try:
+            payload = _decode(body)
+            signature = _decode(signature)
+        except (binascii.Error, ValueError):
+            return None
+
+        if not hmac.compare_digest(self._sign(payload), signature):
+            return None
+
+        user_id, expires, token_id, username = (
+            payload.decode("utf-8").split("|", 3)
+        )
+        if int(expires) <= (now if now is not None else time.time()):
+            return None
+
+        return int(user_id), int(expires), token_id, username
+
+    def verify(self, token, now=None):
+        """Vérifie un jeton de session.
+
+        Args:
+            token (str | None): Jeton reçu du client (cookie `session`).
+            now (float | None): Date de la vérification.
+
+        Returns:
+            dict | None: Dictionnaire contenant `id` et `username` si le
+            jeton est valide, non expiré et non révoqué, sinon None.
+        """
+        # Lecture seule, atomique : pas de verrou sur la boucle.
+        parsed = self._parse(token, now)
+        if parsed is None or parsed[2] in self._revoked:
+            return None
+
+        return {"id": parsed[0], "username": parsed[3]}
+
+    def revoke(self, token, now=None):
+        """Révoque un jeton jusqu'à son expiration.
+
+        Les jetons révoqués déjà expirés sont retirés de la liste. Avec
+        une base de données partagée, la révocation y est aussi écrite :
+        cette méthode doit alors être exécutée hors de la boucle
+        d'événements (`DBExecutor`).
+
+        Args:
+            token (str | None): Jeton à révoquer.
+            now (float | None): Date de la révocation.
+        """
+        now = now if now is not None else time.time()
+        parsed = self._parse(token, now)
+
+        with self._lock:
+            self._purge(now)
+            if parsed is None:
+                return
+            self._revoked[parsed[2]] = parsed[1]
+
+        if self.db_path is None:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "DELETE FROM revoked_sessions WHERE expires <= ?", (now,)
+                )
+                conn.execute(
+                    "INSERT OR IGNORE INTO revoked_sessions "
+                    "(token_id, expires) VALUES (?, ?)",
+                    (parsed[2], parsed[1])
+                )
+        except sqlite3.Error as e:
+            print(f"Erreur d'enregistrement de la révocation : {e}")
+
+    def _purge(self, now):
+        """Retire de la mémoire les jetons révoqués déjà expirés.
+
+        Cette méthode est appelée avec le verrou `_lock` acquis.
+        """
+        for token_id, expires in list(self._revoked.items()):
+            if expires <= now:
+                self._revoked.pop(token_id, None)
+
+    def _connect(self):
+        """Fournit une connexion à la base partagée, schéma vérifié."""
+        pool = ConnectionPool.get(self.db_path)
+        pool.ensure_schema("SessionManager", self._ensure_schema)
+        return pool.connection()
+
+    def _ensure_schema(self):
+        """Crée la table des révocations si elle n'existe pas."""
+        with ConnectionPool.get(self.db_path).connection() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS revoked_sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    token_id TEXT UNIQUE NOT NULL,
+                    expires INTEGER NOT NULL
+                )
+            """)
+
+    def refresh(self, now=None):
+        """Lit les révocations enregistrées par les autres workers.
+
+        Seules les révocations écrites depuis la lecture précédente sont
+        lues. Cette méthode accède à la base de données : elle est
+        exécutée par `DBExecutor`. Deux lectures ne sont jamais faites en
+        même temps : le curseur `_last_id` n'est modifié que sous verrou.
+
+        Args:
+            now (float | None): Date de la lecture.
+        """
+        if self.db_path is None:
+            return
+
+        now = now if now is not None else time.time()
+        with self._lock:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT id, token_id, expires FROM revoked_sessions "
+                    "WHERE id > ? ORDER BY id",
+                    (self._last_id,)
+                ).fetchall()
+
+            for row_id, token_id, expires in rows:
+                if expires > now:
+                    self._revoked[token_id] = expires
+                self._last_id = row_id
+
+            self._purge(now)
+
+    def start(self):
+        """Démarre la lecture périodique des révocations partagées."""
+        if self.db_path is not None and self._refresher is None:
+            self._refresher = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Arrête la lecture périodique des révocations partagées."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    async def _run(self):
+        """Relit les révocations partagées à intervalle régulier."""
+        while True:
+            try:
+                await DBExecutor.default().run(self.refresh)
+            except sqlite3.Error as e:
+                print(f"Erreur de lecture des sessions révoquées : {e}")
+            await asyncio.sleep(self.refresh_interval)
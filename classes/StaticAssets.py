@@ -0,0 +1,287 @@
+"""
+Fichiers statiques de l'application Tic-Tac-Toe.
+
+Ce module définit la classe StaticAssets, qui prépare au démarrage les
+fichiers des dossiers `css/`, `js/`, `img/` et `fonts/`, seuls dossiers
+servis au navigateur. Pour chaque fichier :
+- une empreinte du contenu est calculée ; le manifeste associe le chemin
+  du fichier (ex.: `css/game.css`) à une URL versionnée
+  (ex.: `/css/game.3f2a9c1b7d40.css`), qui peut être mise en cache
+  indéfiniment par le navigateur ou un CDN,
+- les petits fichiers sont conservés en mémoire, avec leurs versions
+  compressées (gzip, et brotli si le module est installé).
+
+Les URL `url(...)` des feuilles de style sont remplacées par les URL
+versionnées des fichiers référencés (ex.: la police EraserRegular.ttf).
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from sanic.response import empty, file, raw
+from classes.TemplateCache import TemplateCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Références url(...) des feuilles de style.
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+class Asset:
+    """Fichier statique préparé au démarrage."""
+
+    __slots__ = (
+        "path", "url", "file_path", "content_type", "etag", "body",
+        "encodings",
+    )
+
+    def __init__(self, path, url, file_path, content_type, etag, body):
+        """Initialise un fichier statique.
+
+        Args:
+            path (str): Chemin du fichier (ex.: "css/game.css").
+            url (str): URL versionnée du fichier.
+            file_path (str): Chemin du fichier sur le disque.
+            content_type (str): Type MIME du contenu.
+            etag (str): ETag du contenu.
+            body (bytes | None): Contenu conservé en mémoire, ou None
+                pour un fichier lu depuis le disque à chaque requête.
+        """
+        self.path = path
+        self.url = url
+        self.file_path = file_path
+        self.content_type = content_type
+        self.etag = etag
+        self.body = body
+        self.encodings = {}  # clé: "br" ou "gzip", valeur: contenu
+
+
+class StaticAssets:
+    """Manifeste et contenu des fichiers statiques.
+
+    Cette classe :
+    - calcule l'URL versionnée de chaque fichier servi,
+    - conserve les petits fichiers, et leurs versions compressées, en
+      mémoire,
+    - produit les réponses HTTP avec des en-têtes de cache adaptés.
+    """
+
+    DIRECTORIES = ("css", "js", "img", "fonts")
+
+    # Durées de cache : URL versionnée (immuable) ou chemin du fichier.
+    IMMUTABLE = "public, max-age=31536000, immutable"
+    REVALIDATE = "public, max-age=3600"
+
+    def __init__(self, root=".", directories=DIRECTORIES,
+                 max_memory_size=512 * 1024, min_compress_size=256):
+        """Prépare les fichiers statiques.
+
+        Args:
+            root (str): Dossier racine du projet.
+            directories (tuple[str]): Dossiers servis, relatifs à `root`.
+            max_memory_size (int): Taille maximale, en octets, d'un
+                fichier conservé en mémoire.
+            min_compress_size (int): Taille minimale, en octets, d'un
+                fichier compressé.
+        """
+        self.root = root
+        self.directories = tuple(directories)
+        self.max_memory_size = max_memory_size
+        self.min_compress_size = min_compress_size
+        self.manifest = {}  # clé: chemin du fichier, valeur: URL versionnée
+        self.assets = {}  # clé: chemin ou URL versionnée, valeur: Asset
+
+        # Les feuilles de style sont traitées en dernier, afin que les
+        # fichiers qu'elles référencent soient déjà versionnés.
+        for path in sorted(
+            self._walk(), key=lambda p: (p.endswith(".css"), p)
+        ):
+            self._add(path)
+
+    def _walk(self):
+        """Liste les fichiers des dossiers servis.
+
+        Yields:
+            str: Chemin de chaque fichier, relatif à la racine.
+        """
+        for directory in self.directories:
+            base = os.path.join(self.root, directory)
+            for dirpath, _, filenames in os.walk(base):
+                for filename in filenames:
+                    full = os.path.join(dirpath, filename)
+                    yield os.path.relpath(full, self.root).replace(
+                        os.sep, "/"
+                    )
+
+    def _rewrite_css(self, path, body):
+        """Remplace les URL d'une feuille de style par les URL versionnées.
+
+        Args:
+            path (str): Chemin de la feuille de style.
+            body (bytes): Contenu de la feuille de style.
+
+        Returns:
+            bytes: Contenu modifié.
+        """
+        def replace(match):
+            target = match.group(2)
+            if target.startswith("/"):
+                resolved = target.lstrip("/")
+            else:
+                resolved = posixpath.normpath(
+                    posixpath.join(posixpath.dirname(path), target)
+                )
+
+            url = self.manifest.get(resolved)
+            if url is None:
+                return match.group(0)
+
+            return f"url('{url}')"
+
+        return _CSS_URL.sub(replace, body.decode("utf-8")).encode("utf-8")
+
+    def _add(self, path):
+        """Prépare un fichier et l'ajoute au manifeste.
+
+        Args:
+            path (str): Chemin du fichier, relatif à la racine.
+        """
+        file_path = os.path.join(self.root, path)
+        with open(file_path, "rb") as f:
+            body = f.read()
+
+        if path.endswith(".css"):
+            body = self._rewrite_css(path, body)
+
+        digest = hashlib.blake2b(body, digest_size=6).hexdigest()
+        stem, ext = posixpath.splitext(path)
+        url = f"/{stem}.{digest}{ext}"
+
+        content_type = mimetypes.guess_type(path)[0]
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith(
+            ("javascript", "svg+xml")
+        ):
+            content_type += "; charset=utf-8"
+
+        in_memory = len(body) <= self.max_memory_size or path.endswith(".css")
+        asset = Asset(
+            path, url, file_path, content_type, f'"{digest}"',
+            body if in_memory else None
+        )
+        if in_memory and len(body) >= self.min_compress_size:
+            self._compress(asset)
+
+        self.manifest[path] = url
+        self.assets[path] = asset
+        self.assets[url.lstrip("/")] = asset
+
+    @staticmethod
+    def _compress(asset):
+        """Ajoute les versions compressées utiles d'un fichier.
+
+        Une version n'est conservée que si elle réduit la taille d'au
+        moins 10 %.
+        """
+        limit = len(asset.body) * 0.9
+
+        compressed = gzip.compress(asset.body, compresslevel=9, mtime=0)
+        if len(compressed) < limit:
+            asset.encodings["gzip"] = compressed
+
+        if brotli is not None:  # pragma: no cover
+            compressed = brotli.compress(asset.body)
+            if len(compressed) < limit:
+                asset.encodings["br"] = compressed
+
+    def url(self, path):
+        """Retourne l'URL versionnée d'un fichier.
+
+        Cette méthode est utilisée par les templates (`asset(...)`).
+
+        Args:
+            path (str): Chemin du fichier (ex.: "css/game.css").
+
+        Returns:
+            str: URL versionnée, ou URL du fichier s'il est inconnu.
+        """
+        return self.manifest.get(path, "/" + path)
+
+    def get(self, path):
+        """Retourne un fichier à partir de son chemin ou de son URL.
+
+        Args:
+            path (str): Chemin du fichier ou URL versionnée, sans `/`
+                initial.
+
+        Returns:
+            Asset | None: Fichier préparé, ou None s'il n'est pas servi.
+        """
+        return self.assets.get(path)
+
+    @staticmethod
+    def accepted_encodings(request):
+        """Retourne les encodages acceptés par le client.
+
+        Args:
+            request (sanic.request.Request): Requête HTTP.
+
+        Returns:
+            set[str]: Encodages acceptés (ex.: {"gzip", "br"}).
+        """
+        accepted = set()
+        for item in request.headers.get("accept-encoding", "").split(","):
+            name, _, params = item.strip().partition(";")
+            if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00"):
+                accepted.add(name.strip().lower())
+
+        return accepted
+
+    async def response(self, request, asset, path):
+        """Produit la réponse HTTP d'un fichier statique.
+
+        Args:
+            request (sanic.request.Request): Requête HTTP.
+            asset (Asset): Fichier demandé.
+            path (str): Chemin demandé, versionné ou non.
+
+        Returns:
+            sanic.response.HTTPResponse: Contenu du fichier, version
+            compressée, ou réponse 304 si le client le possède déjà.
+        """
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": (
+                self.IMMUTABLE if "/" + path == asset.url
+                else self.REVALIDATE
+            ),
+        }
+        if asset.encodings:
+            headers["Vary"] = "Accept-Encoding"
+
+        if TemplateCache.is_fresh(request, asset.etag):
+            return empty(status=304, headers=headers)
+
+        if asset.body is None:
+            return await file(
+                asset.file_path, headers=headers,
+                mime_type=asset.content_type
+            )
+
+        accepted = self.accepted_encodings(request)
+        for encoding in ("br", "gzip"):
+            if encoding in asset.encodings and encoding in accepted:
+                headers["Content-Encoding"] = encoding
+                return raw(
+                    asset.encodings[encoding], headers=headers,
+                    content_type=asset.content_type
+                )
+
+        return raw(
+            asset.body, headers=headers, content_type=asset.content_type
+        )
@@ -0,0 +1,175 @@
+"""
+Templates Jinja compilés et pages rendues en mémoire.
+
+Ce module définit la classe TemplateCache, qui compile tous les
+templates de l'application au démarrage, puis conserve les pages
+rendues dans un cache LRU, indexé par le contexte du rendu (ex.: la
+valeur de `page`). Une page déjà rendue est servie directement depuis
+la mémoire, avec une empreinte (ETag) qui permet au navigateur de la
+revalider (réponse 304 sans contenu).
+
+Seules les pages dont les clés forment un petit ensemble borné entrent
+dans le cache LRU : des clés toujours nouvelles (nom d'utilisateur,
+version du leaderboard) en chasseraient les pages anonymes. Une page
+versionnée ne conserve que sa dernière version (`LATEST`), et une page
+propre à un utilisateur est rendue sans être conservée (`cache=None`).
+
+Les templates obtiennent l'URL versionnée d'un fichier statique avec la
+fonction `asset` (ex.: `{{ asset('css/game.css') }}`, voir StaticAssets).
+"""
+import hashlib
+from collections import namedtuple
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from sanic.response import empty, raw
+from classes.LRUCache import LRUCache
+
+# Page rendue : contenu encodé et empreinte HTTP.
+RenderedPage = namedtuple("RenderedPage", ["body", "etag"])
+
+
+class TemplateCache:
+    """Compilation des templates et cache des pages rendues.
+
+    Cette classe :
+    - compile tous les templates une seule fois, à sa création,
+    - rend une page et la conserve, avec son ETag, dans un cache borné,
+      ou seulement dans sa dernière version,
+    - produit les réponses HTTP, ou une réponse 304 si le client possède
+      déjà la page.
+    """
+
+    CONTENT_TYPE = "text/html; charset=utf-8"
+
+    # Conservation d'une page rendue (argument `cache`).
+    LRU = "lru"  # Clés en petit nombre (ex.: `page`) : cache LRU
+    LATEST = "latest"  # Page versionnée : dernière version seulement
+
+    def __init__(self, directory="templates", max_entries=256, assets=None):
+        """Initialise le cache et compile les templates.
+
+        Args:
+            directory (str): Dossier des templates Jinja.
+            max_entries (int): Nombre maximal de pages rendues conservées.
+            assets (StaticAssets | None): Manifeste des fichiers statiques.
+                Sans manifeste, `asset` retourne l'URL non versionnée.
+        """
+        self.environment = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(),
+        )
+        self.environment.globals["asset"] = (
+            assets.url if assets is not None else lambda path: "/" + path
+        )
+        self.templates = {
+            name: self.environment.get_template(name)
+            for name in self.environment.list_templates()
+        }
+        self.pages = LRUCache(max_entries)
+        self.latest = {}  # clé: nom du template, valeur: (clé, page)
+
+    def render(self, name, context=None):
+        """Rend un template sans passer par le cache.
+
+        Args:
+            name (str): Nom du template (ex.: "login.html").
+            context (dict | None): Variables du template.
+
+        Returns:
+            str: Page HTML rendue.
+        """
+        return self.templates[name].render(context or {})
+
+    def page(self, name, context=None, key=None, cache=LRU):
+        """Retourne une page rendue, depuis le cache si possible.
+
+        Args:
+            name (str): Nom du template.
+            context (dict | None): Variables du template.
+            key (Hashable | None): Clé identifiant le contenu de la page.
+                Par défaut, la clé est construite à partir du contexte,
+                dont les valeurs doivent alors être hachables.
+            cache (str | None): `LRU` pour une page dont les clés sont
+                peu nombreuses, `LATEST` pour ne conserver que la
+                dernière version de la page, ou None pour ne pas la
+                conserver.
+
+        Returns:
+            RenderedPage: Contenu encodé et ETag de la page.
+        """
+        context = context or {}
+        if cache is None:
+            return self._render_page(name, context)
+
+        if key is None:
+            key = tuple(sorted(context.items()))
+
+        if cache == self.LATEST:
+            entry = self.latest.get(name)
+            if entry is None or entry[0] != key:
+                entry = (key, self._render_page(name, context))
+                self.latest[name] = entry
+            return entry[1]
+
+        page = self.pages.get((name, key))
+        if page is None:
+            page = self._render_page(name, context)
+            self.pages.put((name, key), page)
+
+        return page
+
+    def _render_page(self, name, context):
+        """Rend une page et calcule son ETag."""
+        body = self.render(name, context).encode("utf-8")
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return RenderedPage(body, f'"{digest}"')
+
+    @staticmethod
+    def is_fresh(request, etag):
+        """Indique si le client possède déjà la version courante.
+
+        Args:
+            request (sanic.request.Request): Requête HTTP.
+            etag (str): ETag de la version courante.
+
+        Returns:
+            bool: True si l'en-tête `If-None-Match` correspond.
+        """
+        header = request.headers.get("if-none-match")
+        if not header:
+            return False
+
+        for tag in header.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == etag:
+                return True
+
+        return False
+
+    def response(self, name, context=None, key=None, request=None,
+                 cache_control="no-cache", cache=LRU):
+        """Produit la réponse HTTP d'une page mise en cache.
+
+        Si une requête est fournie, l'ETag de la page est ajouté à la
+        réponse, et une réponse 304 est retournée lorsque le client
+        possède déjà cette version.
+
+        Args:
+            name (str): Nom du template.
+            context (dict | None): Variables du template.
+            key (Hashable | None): Clé identifiant le contenu de la page.
+            request (sanic.request.Request | None): Requête conditionnelle.
+            cache_control (str): Valeur de l'en-tête `Cache-Control`.
+            cache (str | None): Conservation de la page (voir `page`).
+
+        Returns:
+            sanic.response.HTTPResponse: Page HTML, ou réponse 304.
+        """
+        page = self.page(name, context, key, cache)
+        if request is None:
+            return raw(page.body, content_type=self.CONTENT_TYPE)
+
+        headers = {"ETag": page.etag, "Cache-Control": cache_control}
+        if self.is_fresh(request, page.etag):
+            return empty(status=304, headers=headers)
+
+        return raw(page.body, content_type=self.CONTENT_TYPE, headers=headers)
@@ -0,0 +1,60 @@
+"""
+Seau à jetons pour la limitation de débit.
+
+Ce module définit la classe TokenBucket : le seau contient au plus
+`capacity` jetons et se remplit de `rate` jetons par seconde. Chaque
+message consomme un jeton ; un message reçu alors que le seau est vide
+est refusé. Le seau autorise ainsi de courtes rafales (`capacity`) tout
+en bornant le débit moyen (`rate`).
+"""
+import time
+
+
+class TokenBucket:
+    """Seau à jetons d'un client ou d'un utilisateur.
+
+    Cette classe :
+    - remplit le seau selon le temps écoulé depuis la dernière demande,
+    - consomme un jeton par message accepté,
+    - refuse les messages lorsque le seau est vide.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now=None):
+        """Initialise un seau plein.
+
+        Args:
+            rate (float): Jetons ajoutés par seconde.
+            capacity (float): Nombre maximal de jetons (rafale permise).
+            now (float | None): Date courante (`time.monotonic`).
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now if now is not None else time.monotonic()
+
+    def consume(self, now=None, cost=1):
+        """Consomme des jetons, s'il y en a suffisamment.
+
+        Args:
+            now (float | None): Date courante (`time.monotonic`).
+            cost (float): Nombre de jetons demandés.
+
+        Returns:
+            bool: True si les jetons ont été consommés, False si le seau
+            ne contient pas assez de jetons.
+        """
+        now = now if now is not None else time.monotonic()
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(
+                self.capacity, self.tokens + elapsed * self.rate
+            )
+            self.updated = now
+
+        if self.tokens < cost:
+            return False
+
+        self.tokens -= cost
+        return True
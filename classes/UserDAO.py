@@ -4,8 +4,16 @@ Accès aux données pour la gestion des utilisateurs.
 Ce module définit la classe UserDAO, responsable des opérations
 liées aux utilisateurs dans la base de données SQLite, incluant
 la création du schéma, l'insertion et l'authentification.
+
+Les mots de passe sont stockés sous forme d'empreintes (PasswordHasher).
+Les identifiants lus (nom d'utilisateur → id et empreinte) sont conservés
+dans un cache LRU borné : une rafale de connexions d'un même utilisateur
+ne lit la base qu'une seule fois.
 """
 import sqlite3
+from classes.ConnectionPool import ConnectionPool
+from classes.LRUCache import LRUCache
+from classes.PasswordHasher import PasswordHasher
 
 
 class UserDAO:
@@ -15,34 +23,41 @@ class UserDAO:
     récupération des utilisateurs dans la base de données.
     """
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, hasher=None, cache_size=1024):
         """Initialise l'accès à la base de données utilisateur.
 
         Vérifie que la table `users` existe et la crée si nécessaire.
+        Cette vérification n'est exécutée qu'une seule fois par base de
+        données.
 
         Args:
             db_path (str): Chemin vers le fichier de base de données SQLite.
+            hasher (PasswordHasher | None): Calcul des empreintes des mots
+                de passe. Un PasswordHasher par défaut est créé s'il n'est
+                pas fourni.
+            cache_size (int): Nombre maximal d'utilisateurs conservés dans
+                le cache des identifiants.
         """
         self.db_path = db_path
-        self._ensure_schema()
+        self.hasher = hasher if hasher is not None else PasswordHasher()
+        self.credentials = LRUCache(cache_size)
+        self.pool = ConnectionPool.get(db_path)
+        self.pool.ensure_schema("UserDAO", self._ensure_schema)
 
     def _connect(self):
         """Gére la connexion à la base de données.
 
-        Cette méthode effectue la gestion des erreurs.
+        La connexion provient de la réserve partagée de cette base et
+        y est remise à la sortie du bloc `with`. La gestion des erreurs
+        est effectuée par la réserve.
         """
-        try:
-            return sqlite3.connect(self.db_path, timeout=5)
-        except sqlite3.Error as e:
-            print(f"Erreur de connexion sqlite3 : {e}")
-            print(f"Emplacement de la base de données : {self.db_path}")
-            raise
+        return self.pool.connection()
 
     def _ensure_schema(self):
         """Crée la table `users` si elle n'existe pas.
 
-        Cette méthode est appelée automatiquement lors de
-        l'initialisation de l'objet UserDAO.
+        Cette méthode est appelée automatiquement lors de la première
+        initialisation d'un objet UserDAO pour cette base de données.
         """
         with self._connect() as conn:
             cursor = conn.cursor()
@@ -57,8 +72,8 @@ class UserDAO:
     def insert_user(self, username, password):
         """Insère un nouvel utilisateur dans la base de données.
 
-        Si le nom d'utilisateur existe déjà, l'insertion échoue
-        silencieusement.
+        Le mot de passe est enregistré sous forme d'empreinte. Si le nom
+        d'utilisateur existe déjà, l'insertion échoue silencieusement.
 
         Args:
             username (str): Nom d'utilisateur unique.
@@ -68,41 +83,99 @@ class UserDAO:
             int: Identifiant (ID) de l'utilisateur nouvellement créé
             en cas de succès, ou 0 si le nom d'utilisateur existe déjà.
         """
+        password_hash = self.hasher.hash(password)
+
         with self._connect() as conn:
             cursor = conn.cursor()
             try:
                 cursor.execute("""
                     INSERT INTO users (username, password)
                     VALUES (:username, :password)
-                """, {"username": username, "password": password})
-                return cursor.lastrowid
+                """, {"username": username, "password": password_hash})
 
             # Si le nom d'utilisateur existe déjà.
             except sqlite3.IntegrityError:
                 return 0
 
-    def get_user(self, username, password):
-        """Récupère un utilisateur à partir de ses identifiants.
+        self.credentials.put(username, (cursor.lastrowid, password_hash))
+        return cursor.lastrowid
 
-        Cette méthode est généralement utilisée pour l'authentification.
+    def get_credentials(self, username):
+        """Retourne l'identifiant et l'empreinte d'un utilisateur.
+
+        Le résultat est lu dans le cache si possible, sinon dans la base
+        de données, puis conservé dans le cache.
 
         Args:
             username (str): Nom d'utilisateur.
-            password (str): Mot de passe associé.
 
         Returns:
-            sqlite3.Row | None: Ligne contenant `id` et `username`
-            si l'utilisateur est trouvé, sinon None.
+            tuple[int, str] | None: (id, empreinte), ou None si
+            l'utilisateur n'existe pas.
         """
+        credentials = self.credentials.get(username)
+        if credentials is not None:
+            return credentials
+
         with self._connect() as conn:
-            # Permet l'accès aux colonnes comme un dictionnaire.
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, username
+            row = conn.execute("""
+                SELECT id, password
                 FROM users
                 WHERE username = :username
-                AND password = :password
                 LIMIT 1
-            """, {"username": username, "password": password})
-            return cursor.fetchone()
+            """, {"username": username}).fetchone()
+
+        if row is None:
+            return None
+
+        credentials = (row[0], row[1])
+        self.credentials.put(username, credentials)
+        return credentials
+
+    def update_password_hash(self, user_id, username, password_hash):
+        """Remplace l'empreinte enregistrée d'un utilisateur.
+
+        Args:
+            user_id (int): Identifiant de l'utilisateur.
+            username (str): Nom d'utilisateur (clé du cache).
+            password_hash (str): Nouvelle empreinte.
+        """
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE users SET password = :password WHERE id = :id
+            """, {"password": password_hash, "id": user_id})
+
+        self.credentials.put(username, (user_id, password_hash))
+
+    def get_user(self, username, password):
+        """Récupère un utilisateur à partir de ses identifiants.
+
+        Cette méthode est généralement utilisée pour l'authentification.
+        Le hachage est coûteux : elle doit être exécutée hors de la boucle
+        d'événements. Les mots de passe en clair (anciens comptes) ou
+        hachés avec un autre coût sont remplacés par une nouvelle
+        empreinte après une connexion réussie.
+
+        Args:
+            username (str): Nom d'utilisateur.
+            password (str): Mot de passe associé.
+
+        Returns:
+            dict | None: Dictionnaire contenant `id` et `username`
+            si les identifiants sont valides, sinon None.
+        """
+        credentials = self.get_credentials(username)
+        if credentials is None:
+            self.hasher.verify(password, None)
+            return None
+
+        user_id, password_hash = credentials
+        if not self.hasher.verify(password, password_hash):
+            return None
+
+        if self.hasher.needs_rehash(password_hash):
+            self.update_password_hash(
+                user_id, username, self.hasher.hash(password)
+            )
+
+        return {"id": user_id, "username": username}
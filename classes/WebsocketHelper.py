@@ -3,21 +3,28 @@ Gestion des connexions WebSocket pour le jeu Tic-Tac-Toe.
 
 Ce module fournit des utilitaires pour gérer les connexions WebSocket
 associées à une partie en cours. Il permet notamment :
-- de détecter la déconnexion d'un joueur,
-- de réinitialiser la partie en cas de déconnexion,
+- de signaler la déconnexion d'un joueur, puis son retour,
+- de réinitialiser la partie d'un joueur qui n'est pas revenu,
 - de diffuser des messages à l'ensemble des joueurs connectés,
+  en parallèle, sans qu'un client lent ne retarde les autres,
+- de diffuser l'état du plateau selon le protocole de chaque client
+  (état complet, dernier coup numéroté en mode delta, ou format binaire),
 - de fermer proprement toutes les connexions actives.
 
 Ce module est conçu pour être utilisé avec une instance de jeu
 maintenant l'état de la partie et le registre des connexions WebSocket.
 """
+import asyncio
+from classes.BinaryProtocol import BinaryProtocol
+from classes.EncodedMessage import EncodedMessage
+from classes.Outbox import Outbox
 
 
 class WebsocketHelper:
     """Classe utilitaire pour la gestion des connexions WebSocket.
 
     Cette classe centralise les opérations liées aux WebSockets
-    d'une partie : détection des déconnexions, diffusion des messages
+    d'une partie : signalement des déconnexions, diffusion des messages
     et fermeture propre des connexions actives.
     """
 
@@ -30,69 +37,240 @@ class WebsocketHelper:
         """
         self.game = game
 
-    async def check_disconnect(self, ws, player):
-        """Vérifie si l'autre joueur est déconnecté.
+    async def notify_left(self, player):
+        """Signale aux clients qu'un joueur s'est déconnecté.
 
-        Si l'autre joueur n'est plus connecté :
-        - un message d'information est envoyé au joueur courant,
+        Les clients reçoivent `WAIT|<symbole>` : la place du joueur reste
+        réservée pendant le délai de reconnexion.
+
+        Args:
+            player (str): Symbole du joueur parti ("X" ou "O").
+        """
+        await self.broadcast("WAIT|" + player)
+
+    async def notify_back(self, player):
+        """Signale aux clients qu'un joueur a repris sa place.
+
+        Args:
+            player (str): Symbole du joueur revenu ("X" ou "O").
+        """
+        await self.broadcast("BACK|" + player)
+
+    async def end_abandoned(self, player):
+        """Termine la partie d'un joueur qui n'est pas revenu.
+
+        Si la place du joueur est toujours libre à la fin du délai de
+        reconnexion :
+        - un message d'information est envoyé à l'autre joueur,
         - la partie est réinitialisée,
-        - l'état initial du plateau est diffusé à tous les joueurs.
+        - l'état initial du plateau est diffusé à tous les clients.
 
         Args:
-            ws: WebSocket du joueur courant.
-            player (str): Symbole du joueur courant ("X" ou "O").
+            player (str): Symbole du joueur parti ("X" ou "O").
 
         Returns:
-            bool: True si une déconnexion de l'autre joueur a été détectée
-            et que la partie a été réinitialisée, sinon False.
+            bool: True si la partie a été réinitialisée, False si la place
+            a été reprise entre-temps.
         """
-        if player not in ("X", "O"):
+        if self.game.seats.get(player) is not None:
             return False
 
-        other_player = "O" if player == "X" else "X"
+        opponent = self.game.opponent(player)
+        if opponent is not None:
+            await self.send(
+                opponent,
+                "DISC|La connexion avec l'autre joueur a été perdue. "
+                + "La partie sera réinitialisée."
+            )
+
+        self.game.reset_game()
+        await self.broadcast_snapshot()
+        return True
+
+    async def broadcast(self, message, replaceable=False):
+        """Diffuse un message à toutes les connexions WebSocket actives.
+
+        Le message est construit une seule fois (`EncodedMessage`), puis
+        ajouté à la file d'envoi (`Outbox`) de chaque connexion ; les
+        files sont ensuite vidées en parallèle. Un client
+        dont la file déborde ou dont l'envoi échoue ou dépasse le délai
+        maximal est retiré des connexions actives et sa connexion est
+        fermée en arrière-plan. Les clients binaires reçoivent
+        l'équivalent binaire du message, encodé lui aussi une seule fois.
+
+        Args:
+            message (str | EncodedMessage): Message à envoyer à tous les
+                joueurs connectés.
+            replaceable (bool): Indique si le message est un état du
+                plateau pouvant remplacer un état encore en attente.
+        """
+        if not isinstance(message, EncodedMessage):
+            message = EncodedMessage(message)
+
+        binary = None
+        messages = []
+        for ws in list(self.game.connected.keys()):
+            if getattr(ws, "binary", False):
+                if binary is None:
+                    binary = self._to_binary(message)
+                messages.append((ws, binary, replaceable))
+            else:
+                messages.append((ws, message, replaceable))
+
+        await self._deliver(messages)
+
+    async def broadcast_update(self):
+        """Diffuse le coup qui vient d'être joué.
+
+        Les clients en mode delta (`ws.delta`) reçoivent uniquement la
+        case jouée et le joueur suivant (`Game.delta_message`), en texte
+        ou en binaire (`ws.binary`) ; les autres reçoivent l'état complet
+        du plateau. Chaque message est encodé une seule fois.
+        """
+        game = self.game
+
+        messages = []
+        for ws in list(game.connected.keys()):
+            if getattr(ws, "binary", False):
+                messages.append((ws, game.delta_message(binary=True), False))
+            elif getattr(ws, "delta", False):
+                messages.append((ws, game.delta_message(), False))
+            else:
+                messages.append((ws, game.board_message(), True))
+
+        await self._deliver(messages)
+
+    async def broadcast_snapshot(self, joined=None):
+        """Diffuse l'état complet du plateau.
+
+        Les clients en mode delta reçoivent un instantané numéroté
+        (`Game.snapshot_message`), les autres l'état complet habituel.
+        Lors de l'arrivée d'un client (`joined`), les clients en mode
+        delta déjà connectés, qui sont à jour, ne reçoivent rien.
+
+        Args:
+            joined: WebSocket du client qui vient de se connecter, ou
+                None pour envoyer l'état à tous (réinitialisation).
+        """
+        game = self.game
 
-        if other_player not in self.game.connected.values():
-            try:
-                await ws.send(
-                    "DISC|La connexion avec l'autre joueur a été perdue. "
-                    + "La partie sera réinitialisée."
+        messages = []
+        for ws in list(game.connected.keys()):
+            if not getattr(ws, "delta", False):
+                messages.append((ws, game.board_message(), True))
+            elif joined is None or ws is joined:
+                binary = getattr(ws, "binary", False)
+                messages.append(
+                    (ws, game.snapshot_message(binary=binary), True)
                 )
-            except Exception:
-                self.game.connected.pop(ws, None)
 
-            self.game.reset_game()
-            await self.broadcast(self.game.board_state())
-            return True
+        await self._deliver(messages)
 
-        return False
+    async def send(self, ws, message, replaceable=False):
+        """Envoie un message à un seul client, via sa file d'envoi.
 
-    async def broadcast(self, message):
-        """Diffuse un message à toutes les connexions WebSocket actives.
+        Un message texte envoyé à un client binaire est traduit en son
+        équivalent binaire, s'il existe.
+
+        Args:
+            ws: WebSocket du destinataire.
+            message (str | EncodedMessage): Message à envoyer.
+            replaceable (bool): Indique si le message est un état du
+                plateau pouvant remplacer un état encore en attente.
+        """
+        if getattr(ws, "binary", False):
+            message = self._to_binary(message)
 
-        Les connexions invalides ou fermées sont automatiquement
-        supprimées de la liste des connexions actives.
+        await self._deliver([(ws, message, replaceable)])
+
+    def _to_binary(self, message):
+        """Traduit un message texte en son équivalent binaire.
 
         Args:
-            message (str): Message à envoyer à tous les joueurs connectés.
+            message (str | EncodedMessage): Message à traduire.
+
+        Returns:
+            str | EncodedMessage: Message binaire encodé, ou le message
+            d'origine s'il est déjà binaire ou sans équivalent binaire.
         """
-        for ws in list(self.game.connected.keys()):
-            try:
-                await ws.send(message)
-            except Exception:
-                self.game.connected.pop(ws, None)
+        text = message
+        if isinstance(message, EncodedMessage):
+            text = message.text
+        if not isinstance(text, str):
+            return message
+
+        data = BinaryProtocol.encode_text(text)
+        if data is None:
+            return message
+
+        return EncodedMessage(data)
+
+    async def _deliver(self, messages):
+        """Ajoute des messages aux files d'envoi, puis les vide en parallèle.
+
+        Un client dont la file déborde ou dont l'envoi échoue ou dépasse
+        le délai maximal est retiré des connexions actives.
+
+        Args:
+            messages (Iterable[tuple]): Tuples `(ws, message,
+                replaceable)`.
+        """
+        outboxes = []
+        for ws, message, replaceable in messages:
+            outbox = Outbox.of(ws)
+            if outbox.push(message, replaceable):
+                outboxes.append(outbox)
+            else:
+                self.drop(ws)
 
-    async def close_all_connections(self):
+        results = await asyncio.gather(
+            *(outbox.drain() for outbox in outboxes)
+        )
+
+        for outbox, delivered in zip(outboxes, results):
+            if not delivered:
+                self.drop(outbox.ws)
+
+    def drop(self, ws):
+        """Retire un client lent ou invalide et ferme sa connexion.
+
+        Args:
+            ws: WebSocket du client à retirer.
+        """
+        self.game.remove_connection(ws)
+        Outbox.of(ws).close()
+
+    async def close_all_connections(self, code=1000, reason=""):
         """Ferme toutes les connexions WebSocket actives.
 
-        Cette méthode ferme chaque connexion proprement, puis
-        supprime toutes les entrées du dictionnaire des connexions.
-        Elle est généralement utilisée lors de l'arrêt ou de la
-        réinitialisation complète du serveur.
+        Cette méthode ferme les connexions en parallèle, avec un délai
+        maximal par connexion, puis supprime toutes les entrées du
+        dictionnaire des connexions. Elle est généralement utilisée lors
+        de l'arrêt ou de la réinitialisation complète du serveur.
+
+        Args:
+            code (int): Code de fermeture WebSocket.
+            reason (str): Raison de la fermeture.
         """
-        for ws in list(self.game.connected.keys()):
-            try:
-                await ws.close()
-            except Exception:
-                pass
-            finally:
-                self.game.connected.pop(ws, None)
+        connections = list(self.game.connected.keys())
+
+        await asyncio.gather(
+            *(self._close(ws, code, reason) for ws in connections)
+        )
+
+    async def _close(self, ws, code=1000, reason=""):
+        """Ferme une connexion avec un délai maximal.
+
+        Args:
+            ws: WebSocket à fermer.
+            code (int): Code de fermeture WebSocket.
+            reason (str): Raison de la fermeture.
+        """
+        try:
+            await asyncio.wait_for(
+                ws.close(code, reason), Outbox.CLOSE_TIMEOUT
+            )
+        except Exception:
+            pass
+        finally:
+            self.game.remove_connection(ws)
@@ -1,13 +1,35 @@
-let socket = new WebSocket("ws://" + window.location.host + "/ws");
+// Salle de jeu choisie avec le paramètre ?room= (salle par défaut sinon).
+// Les paramètres ?size= et ?win= configurent le plateau d'une nouvelle salle.
+// Le mode binaire (proto=binary, par défaut) ne reçoit que le dernier coup,
+// numéroté, dans un format compact (voir classes/BinaryProtocol.py). Le
+// paramètre ?proto=delta choisit le même mode delta au format texte.
+let params = new URLSearchParams(window.location.search);
+let room = params.get("room");
+let proto = params.get("proto") === "delta" ? "delta" : "binary";
+let wsPath = room ? "/ws/" + encodeURIComponent(room) : "/ws";
+let wsOptions = new URLSearchParams({ proto: proto });
+["size", "win"].forEach((name) => {
+    if (params.get(name)) wsOptions.set(name, params.get(name));
+});
+wsPath += "?" + wsOptions.toString();
+let socket = null;
+let finished = false; // Partie terminée : pas de reconnexion
+let retryDelay = 1000; // Délai avant la prochaine reconnexion, en ms
+let unavailable = 0; // Fermetures 1013 (salle pleine ou indisponible) consécutives
+const MAX_UNAVAILABLE = 5; // Au-delà, les tentatives de reconnexion cessent
 let mySymbol = null;
 let currentTurn = null;
+let lastSeq = null; // Numéro du dernier coup appliqué (null: resynchronisation en cours)
+
+// Codes des symboles du protocole binaire.
+const SYMBOLS = ["", "X", "O", "S"];
 
 /**
  * Mise à jour des informations sur le déroulement de la partie.
  *
- * @param {string} boardStr - Une chaîne de caractères représentant l'état du plateau de jeu.
+ * @param {boolean} emptyBoard - Indique si aucun coup n'a encore été joué.
  */
-function updateStatus(boardStr) {
+function updateStatus(emptyBoard) {
     if (!mySymbol) return;
 
     if (mySymbol === "S") {
@@ -17,7 +39,7 @@ function updateStatus(boardStr) {
       if (currentTurn === mySymbol) {
           document.getElementById("turn").innerHTML = "C'est votre tour";
       } else {
-          if(boardStr === ",,,,,,,,") document.getElementById("turn").innerHTML = "En attente du joueur ( " + currentTurn + " )...";
+          if(emptyBoard) document.getElementById("turn").innerHTML = "En attente du joueur ( " + currentTurn + " )...";
           else document.getElementById("turn").innerHTML = "C'est le tour de votre adversaire";
       }
     }
@@ -25,6 +47,33 @@ function updateStatus(boardStr) {
     document.getElementById("user-msg").innerHTML = "Vous jouez: " + mySymbol;
 }
 
+/**
+ * Construction d'un plateau de taille N×N, si sa taille a changé.
+ *
+ * @param {number} size - Le nombre de rangs et de colonnes du plateau.
+ */
+function buildBoard(size) {
+  let table = document.getElementById("board");
+  if (table.querySelectorAll(".cell").length === size * size) return;
+
+  let tbody = table.querySelector("tbody");
+  tbody.innerHTML = "";
+  table.classList.toggle("grid", size > 3);
+
+  for (let row = 0; row < size; row++) {
+    let tr = document.createElement("tr");
+    for (let col = 0; col < size; col++) {
+      let td = document.createElement("td");
+      td.classList.add("cell");
+      if (row < size - 1) td.classList.add("b-border");
+      if (col < size - 1) td.classList.add("r-border");
+      td.dataset.index = row * size + col;
+      tr.appendChild(td);
+    }
+    tbody.appendChild(tr);
+  }
+}
+
 /**
  * Mise à jour du tableau de jeu.
  *
@@ -32,10 +81,20 @@ function updateStatus(boardStr) {
  */
 function board_update(msg) {
   let [boardStr, current] = msg.split("|");
+  render_board(boardStr.split(","), current);
+}
+
+/**
+ * Affichage de toutes les cases du plateau.
+ *
+ * @param {string[]} cells - Les symboles des cases du plateau.
+ * @param {string} current - Le symbole du joueur dont c'est le tour.
+ */
+function render_board(cells, current) {
   currentTurn = current;
-  updateStatus(boardStr);
+  updateStatus(cells.every((cell) => cell === ""));
 
-  let cells = boardStr.split(",");
+  buildBoard(Math.round(Math.sqrt(cells.length)));
   let boxDivs = document.querySelectorAll(".cell");
 
   boxDivs.forEach((box, i) => {
@@ -44,13 +103,139 @@ function board_update(msg) {
 }
 
 /**
- * Gestion des messages reçus par le websocket et
+ * Application d'un instantané numéroté (arrivée ou resynchronisation).
+ *
+ * @param {number} seq - Le numéro du dernier coup joué.
+ * @param {string[]} cells - Les symboles des cases du plateau.
+ * @param {string} current - Le symbole du joueur dont c'est le tour.
+ */
+function snapshot_update(seq, cells, current) {
+  lastSeq = seq;
+  render_board(cells, current);
+}
+
+/**
+ * Application d'un coup reçu en mode delta.
+ * Si un coup a été manqué, un instantané est demandé au serveur (SYNC).
+ *
+ * @param {number} seq - Le numéro du coup.
+ * @param {number} cell - L'index de la case jouée.
+ * @param {string} symbol - Le symbole inscrit dans la case.
+ * @param {string} current - Le symbole du joueur suivant.
+ */
+function delta_update(seq, cell, symbol, current) {
+  if (lastSeq === null || seq <= lastSeq) return;
+
+  if (seq !== lastSeq + 1) {
+    lastSeq = null;
+    socket.send(proto === "binary" ? new Uint8Array([0x11]) : "SYNC");
+    return;
+  }
+
+  lastSeq = seq;
+  currentTurn = current;
+  updateStatus(false);
+
+  let box = document.querySelector('.cell[data-index="' + cell + '"]');
+  if (box) box.innerHTML = symbol;
+}
+
+/**
+ * Décodage d'un message binaire (voir classes/BinaryProtocol.py).
+ * Les messages de contrôle sont traités comme leur équivalent texte.
+ *
+ * @param {ArrayBuffer} buffer - Le message binaire recu par le websocket.
+ */
+function binary_message(buffer) {
+  let view = new DataView(buffer);
+
+  switch (view.getUint8(0)) {
+    case 0x01:
+      text_message("YOU|" + SYMBOLS[view.getUint8(1)]);
+      break;
+    case 0x02: {
+      let size = view.getUint8(5);
+      let cells = [];
+      for (let i = 0; i < size * size; i++) {
+        let packed = view.getUint8(7 + (i >> 2));
+        cells.push(SYMBOLS[(packed >> ((i & 3) << 1)) & 3]);
+      }
+      snapshot_update(view.getUint32(1), cells, SYMBOLS[view.getUint8(6)]);
+      break;
+    }
+    case 0x03:
+      delta_update(
+        view.getUint32(1), view.getUint16(5),
+        SYMBOLS[view.getUint8(7)], SYMBOLS[view.getUint8(8)]
+      );
+      break;
+    case 0x04:
+      text_message("WIN|" + SYMBOLS[view.getUint8(1)]);
+      break;
+    case 0x05:
+      text_message("DRAW");
+      break;
+    case 0x06:
+      text_message("DISC|" + new TextDecoder().decode(new Uint8Array(buffer, 1)));
+      break;
+    case 0x07:
+      text_message("WAIT|" + SYMBOLS[view.getUint8(1)]);
+      break;
+    case 0x08:
+      text_message("BACK|" + SYMBOLS[view.getUint8(1)]);
+      break;
+  }
+}
+
+/**
+ * Connexion au websocket de la salle.
+ * Si la connexion est perdue avant la fin de la partie, elle est rétablie :
+ * le serveur rend au joueur sa place réservée et le plateau en cours.
+ */
+function connect() {
+    lastSeq = null;
+    socket = new WebSocket("ws://" + window.location.host + wsPath);
+    socket.binaryType = "arraybuffer";
+
+    socket.addEventListener("open", () => {
+        retryDelay = 1000;
+    });
+
+    // Gestion des messages reçus par le websocket.
+    socket.addEventListener("message", (event) => {
+        unavailable = 0;
+        if (event.data instanceof ArrayBuffer) binary_message(event.data);
+        else text_message(event.data);
+    });
+
+    // Fermeture volontaire (1008 : salle invalide, 4000 : salle fermée pour
+    // inactivité) : pas de reconnexion.
+    socket.addEventListener("close", (event) => {
+        if (finished || event.code === 1008) return;
+        if (event.code === 4000) {
+            document.getElementById("user-msg").innerHTML = "Salle fermée pour inactivité";
+            return;
+        }
+        if (event.code === 1013 && ++unavailable >= MAX_UNAVAILABLE) {
+            document.getElementById("user-msg").innerHTML = "Salle indisponible, réessayez plus tard";
+            return;
+        }
+        document.getElementById("user-msg").innerHTML = "Reconnexion en cours...";
+        // Délai doublé à chaque échec (ex.: salle pleine), jusqu'à 30 s.
+        setTimeout(connect, retryDelay);
+        retryDelay = Math.min(retryDelay * 2, 30000);
+    });
+}
+
+connect();
+
+/**
+ * Gestion des messages texte et
  * soumission du formulaire pour accéder à la route /leaderboard.
  *
- * @param {MessageEvent} event - Le message recu par le websocket.
+ * @param {string} msg - Le message texte.
  */
-socket.addEventListener("message", (event) => {
-    let msg = event.data;
+function text_message(msg) {
 
     // Assignation du symbole par le serveur.
     if (msg.startsWith("YOU|")) {
@@ -59,8 +244,36 @@ socket.addEventListener("message", (event) => {
         return;
     }
 
+    // Instantané numéroté du mode delta texte : "SNAP|seq|plateau|joueur".
+    if (msg.startsWith("SNAP|")) {
+        let [, seq, boardStr, current] = msg.split("|");
+        snapshot_update(parseInt(seq), boardStr.split(","), current);
+        return;
+    }
+
+    // Coup numéroté du mode delta texte : "D|seq|case|symbole|joueur".
+    if (msg.startsWith("D|")) {
+        let [, seq, cell, symbol, current] = msg.split("|");
+        delta_update(parseInt(seq), parseInt(cell), symbol, current);
+        return;
+    }
+
+    // Déconnexion de l'autre joueur : sa place lui est réservée.
+    if (msg.startsWith("WAIT|")) {
+        document.getElementById("turn").innerHTML =
+          "Le joueur ( " + msg.split("|")[1] + " ) s'est déconnecté. En attente de sa reconnexion...";
+        return;
+    }
+
+    // Retour du joueur déconnecté.
+    if (msg.startsWith("BACK|")) {
+        updateStatus(false);
+        return;
+    }
+
     // Réception du message serveur en cas de déconnection.
     if (msg.startsWith("DISC|")) {
+        finished = true;
         let disconnect = msg.split("|")[1];
         alert(disconnect);
         window.location.href = "http://" + window.location.host + "/";
@@ -69,6 +282,7 @@ socket.addEventListener("message", (event) => {
 
     // Réception du message serveur pour le gagnant.
     else if (msg.startsWith("WIN|")) {
+        finished = true;
         let winner = msg.split("|")[1];
 
         if(mySymbol === "X" || mySymbol === "O") {
@@ -87,13 +301,14 @@ socket.addEventListener("message", (event) => {
     }
 
     else if (msg === "DRAW") {
+        finished = true;
         document.getElementById("result_value").value = "😐 Partie nulle!";
         document.getElementById("result_form").submit();
         return;
     }
 
     board_update(msg);
-});
+}
 
 /**
  * Envoi du coup joué au serveur par le websocket.
@@ -104,6 +319,7 @@ document.getElementById("board").addEventListener("click", function (event) {
     if (event.target.classList.contains("cell")) {
         const index = parseInt(event.target.dataset.index);
         if (!mySymbol) return;
-        socket.send(index.toString());
+        if (proto === "binary") socket.send(new Uint8Array([0x10, index >> 8, index & 0xff]));
+        else socket.send(String(index));
     }
 });
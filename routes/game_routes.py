@@ -5,26 +5,78 @@ Ce module enregistre les routes de l'application Sanic liées au jeu,
 notamment la page d'accueil et le tableau des meneurs (leaderboard).
 
 Fonctionnalités :
-- Page d'accueil : vérifie les cookies et affiche le jeu ou la page de login
-- Leaderboard : met à jour et affiche le top 10 des joueurs
+- Page d'accueil : vérifie le jeton de session et affiche le jeu ou la
+  page de login
+- Leaderboard : affiche le top 10 des joueurs, servi depuis la mémoire
+- API du leaderboard : retourne le top 10 en JSON, déjà sérialisé
+- API du classement : pages du classement complet et rang d'un joueur
+
+Les pages sont rendues par TemplateCache : seule la dernière version de
+la page du leaderboard est conservée, et elle n'est rendue de nouveau
+que lorsque cette version change. La page de jeu, propre à chaque
+utilisateur, n'est pas conservée.
 """
-# Pour les templates jinja2 - pip install jinja2 sanic-ext
-from sanic_ext import render
+from sanic.response import empty, html, json, raw
 from classes.LeaderboardHelper import LeaderboardHelper
+from classes.SessionManager import SessionManager
+from classes.TemplateCache import TemplateCache
 
+# Nombre maximal de joueurs retournés par page du classement.
+MAX_PAGE_SIZE = 100
 
-def register_game_routes(app):
+
+def _int_arg(request, name, default, minimum, maximum):
+    """Lit un paramètre entier de la requête.
+
+    Args:
+        request (sanic.request.Request): Requête HTTP.
+        name (str): Nom du paramètre.
+        default (int): Valeur si le paramètre est absent.
+        minimum (int): Valeur minimale acceptée.
+        maximum (int | None): Valeur maximale acceptée, ou None.
+
+    Returns:
+        int: Valeur du paramètre.
+
+    Raises:
+        ValueError: Si la valeur n'est pas un entier dans les bornes.
+    """
+    value = int(request.args.get(name, default))
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f"Paramètre invalide : {name}")
+
+    return value
+
+
+def register_game_routes(app, lbh=None, sessions=None, pages=None,
+                         db_path="tictactoe.db"):
     """Enregistre les routes liées au jeu Tic-Tac-Toe.
 
     Args:
         app (Sanic): Instance de l'application Sanic.
+        lbh (LeaderboardHelper | None): Leaderboard partagé,
+            mis à jour par les parties terminées. Un nouveau leaderboard
+            est créé si aucun n'est fourni.
+        sessions (SessionManager | None): Vérification des jetons de
+            session, partagée avec les routes de login.
+        pages (TemplateCache | None): Templates compilés et pages
+            rendues, partagés avec les autres routes.
+        db_path (str): Chemin de la base de données SQLite des parties,
+            utilisé par le leaderboard créé si aucun n'est fourni.
     """
+    if lbh is None:
+        lbh = LeaderboardHelper(db_path=db_path)
+    if sessions is None:
+        sessions = SessionManager()
+    if pages is None:
+        pages = TemplateCache()
 
     @app.route('/')
     async def index(request):
         """Page d'accueil.
 
-        Vérifie les cookies pour déterminer si l'utilisateur est connecté.
+        Vérifie le jeton de session (sans accès à la base de données)
+        pour déterminer si l'utilisateur est connecté.
         - Si connecté : affiche le plateau de jeu.
         - Sinon : affiche la page de connexion.
 
@@ -35,13 +87,15 @@ def register_game_routes(app):
         Returns:
             sanic.response.HTTPResponse: Page HTML rendue.
         """
-        cookie_user = request.cookies.get("username")
-        cookie_id = request.cookies.get("id")
-        if cookie_user and cookie_id:
-            return await render('game.html', context={"username": cookie_user})
+        user = sessions.verify(request.cookies.get("session"))
+        if user:
+            # Page propre à l'utilisateur : rendue sans être conservée.
+            return pages.response(
+                "game.html", {"username": user["username"]}, cache=None
+            )
         else:
-            return await render(
-                "login.html", context={"page": "login"}
+            return pages.response(
+                "login.html", {"page": "login"}, request=request
             )
 
     @app.route('/leaderboard', methods=["GET", "POST"])
@@ -49,7 +103,7 @@ def register_game_routes(app):
         """Page du leaderboard.
 
         Cette route :
-        - Met à jour le tableau des meneurs à partir des résultats en base
+        - Lit le tableau des meneurs en mémoire, sans recalcul complet
         - Affiche le top 10 des joueurs
         - Gère l'affichage d'un message si le leaderboard n'est pas disponible
         - Permet de récupérer un résultat de partie envoyé via POST
@@ -68,9 +122,7 @@ def register_game_routes(app):
         game_result = None
         message = None
 
-        lbh = LeaderboardHelper()
-        lbh.set_leaderboard_file()  # Mise à jour du tableau des meneurs.
-        leaderboard_data = lbh.get_leaderboard_file()
+        leaderboard_data = await lbh.get_leaderboard()
 
         if type(leaderboard_data) is str:
             message = leaderboard_data
@@ -79,11 +131,120 @@ def register_game_routes(app):
         if request.method == "POST":
             game_result = request.form.get("result_value")
 
-        return await render(
-            "leaderboard.html",
-            context={
-                "leaders": leaderboard_data,
-                "game_result": game_result,
-                "message": message
-            }
+        context = {
+            "leaders": leaderboard_data,
+            "game_result": game_result,
+            "message": message
+        }
+
+        # Le résultat de partie provient du client : page non conservée.
+        if game_result:
+            return html(pages.render("leaderboard.html", context))
+
+        # Seule la page de la version courante est conservée.
+        return pages.response(
+            "leaderboard.html", context, key=(lbh.version, message),
+            cache=pages.LATEST,
+        )
+
+    @app.route('/api/leaderboard')
+    async def leaderboard_api(request):
+        """Retourne le top 10 des joueurs au format JSON.
+
+        Le JSON de l'instantané courant est retourné tel quel, sans
+        nouvelle sérialisation. L'ETag de l'instantané permet au client
+        de le revalider (réponse 304).
+
+        Args:
+            request (sanic.request.Request):
+                Objet représentant la requête HTTP.
+
+        Returns:
+            sanic.response.HTTPResponse: Liste JSON des meneurs, réponse
+            304, ou erreur 503 si le leaderboard n'est pas disponible.
+        """
+        leaderboard_data = await lbh.get_leaderboard()
+        if type(leaderboard_data) is str:
+            return json({"message": leaderboard_data}, status=503)
+
+        snapshot = lbh.snapshot()
+        headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+        if TemplateCache.is_fresh(request, snapshot.etag):
+            return empty(status=304, headers=headers)
+
+        return raw(
+            snapshot.body, content_type="application/json", headers=headers
         )
+
+    @app.route('/api/leaderboard/ranks')
+    async def leaderboard_ranks(request):
+        """Retourne une page du classement complet.
+
+        Paramètres de la requête :
+        - start : rang du premier joueur (1 par défaut),
+        - count : nombre de joueurs (10 par défaut, 100 au maximum).
+
+        Args:
+            request (sanic.request.Request):
+                Objet représentant la requête HTTP.
+
+        Returns:
+            sanic.response.JSONResponse: Joueurs de la page, nombre total
+            de joueurs et rang de la page suivante (ou None).
+        """
+        try:
+            start = _int_arg(request, "start", 1, 1, None)
+            count = _int_arg(request, "count", 10, 1, MAX_PAGE_SIZE)
+        except ValueError as e:
+            return json({"message": str(e)}, status=400)
+
+        leaderboard_data = await lbh.get_leaderboard()
+        if type(leaderboard_data) is str:
+            return json({"message": leaderboard_data}, status=503)
+
+        total = len(lbh.ranks)
+        return json({
+            "total": total,
+            "start": start,
+            "players": lbh.get_ranks(start, count),
+            "next": start + count if start + count <= total else None,
+        })
+
+    @app.route('/api/leaderboard/players/<username>')
+    async def leaderboard_player(request, username):
+        """Retourne le rang d'un joueur et les joueurs qui l'entourent.
+
+        Paramètre de la requête :
+        - around : nombre de joueurs retournés avant et après le joueur
+          (0 par défaut, 50 au maximum).
+
+        Args:
+            request (sanic.request.Request):
+                Objet représentant la requête HTTP.
+            username (str): Nom du joueur.
+
+        Returns:
+            sanic.response.JSONResponse: Rang, points et voisins du
+            joueur, ou erreur 404 si le joueur n'est pas classé.
+        """
+        try:
+            around = _int_arg(request, "around", 0, 0, MAX_PAGE_SIZE // 2)
+        except ValueError as e:
+            return json({"message": str(e)}, status=400)
+
+        leaderboard_data = await lbh.get_leaderboard()
+        if type(leaderboard_data) is str:
+            return json({"message": leaderboard_data}, status=503)
+
+        rank = lbh.get_rank(username)
+        if rank is None:
+            return json({"message": "Joueur non classé."}, status=404)
+
+        start = max(1, rank - around)
+        return json({
+            "total": len(lbh.ranks),
+            "rank": rank,
+            "username": username,
+            "points": lbh.scores[username],
+            "players": lbh.get_ranks(start, rank + around - start + 1),
+        })
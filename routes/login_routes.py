@@ -5,25 +5,63 @@ Ce module enregistre les routes HTTP liées à la gestion des utilisateurs :
 - Affichage de la page de login et d'inscription
 - Connexion et création de comptes
 - Déconnexion des utilisateurs
-- Gestion des cookies pour l'identification
+- Gestion du jeton de session signé (cookie `session`)
+
+Les pages sont servies depuis la mémoire (TemplateCache) : les pages de
+login et d'inscription anonymes sont rendues une seule fois, et
+revalidées par le navigateur avec leur ETag.
 
 Toutes les interactions avec la base de données passent par la classe
-UserDAO.
+UserDAO. La connexion et l'inscription calculent une empreinte du mot de
+passe (PasswordHasher) : elles sont exécutées par un DBExecutor dédié,
+hors de la boucle d'événements et sans occuper les threads des requêtes
+SQL.
 """
 from sanic.response import redirect
-# Pour les templates jinja2 - pip install jinja2 sanic-ext
-from sanic_ext import render
+from classes.DBExecutor import DBExecutor
+from classes.PasswordHasher import PasswordHasher
+from classes.SessionManager import SessionManager
+from classes.TemplateCache import TemplateCache
 from classes.UserDAO import UserDAO
 
 
-def register_login_routes(app):
+def register_login_routes(app, sessions=None, pages=None,
+                          db_path="tictactoe.db"):
     """Enregistre les routes de login, logout et inscription.
 
     Args:
         app (Sanic): Instance de l'application Sanic.
+        sessions (SessionManager | None): Émission et révocation des
+            jetons de session. Un gestionnaire propre au processus est
+            créé s'il n'est pas fourni.
+        pages (TemplateCache | None): Templates compilés et pages
+            rendues, partagés avec les autres routes.
+        db_path (str): Chemin de la base de données SQLite des
+            utilisateurs.
     """
     login_page = "login.html"
 
+    if sessions is None:
+        sessions = SessionManager()
+    if pages is None:
+        pages = TemplateCache()
+
+    # Coût du hachage, ajustable avec SANIC_PASSWORD_ITERATIONS.
+    hasher = PasswordHasher(
+        app.config.get("PASSWORD_ITERATIONS", PasswordHasher.ITERATIONS)
+    )
+
+    # DAO partagé : les connexions proviennent de la réserve commune.
+    dao = UserDAO(db_path, hasher=hasher)
+
+    # Threads dédiés à l'authentification (hachage des mots de passe).
+    hashing = DBExecutor(max_workers=2, thread_name_prefix="hash")
+
+    @app.after_server_stop
+    async def stop_hashing(app):
+        """Arrête les threads de hachage à l'arrêt du serveur."""
+        hashing.shutdown()
+
     @app.route('/login')
     async def login(request):
         """Affiche la page de connexion.
@@ -33,18 +71,19 @@ def register_login_routes(app):
                 Objet représentant la requête HTTP.
 
         Returns:
-            sanic.response.HTTPResponse: Page HTML de login rendue.
+            sanic.response.HTTPResponse: Page HTML de login, servie
+            depuis la mémoire, ou réponse 304 si elle n'a pas changé.
         """
-        return await render(
-            login_page, context={"page": "login"}
+        return pages.response(
+            login_page, {"page": "login"}, request=request
         )
 
     @app.post('/login')
     async def login_handler(request):
         """Gère la soumission du formulaire de connexion.
 
-        Vérifie le nom d'utilisateur et le mot de passe, crée des cookies
-        pour l'identification si la connexion est réussie.
+        Vérifie le nom d'utilisateur et le mot de passe, et remet un jeton
+        de session signé (cookie `session`) si la connexion est réussie.
 
         Args:
             request (sanic.request.Request):
@@ -58,22 +97,16 @@ def register_login_routes(app):
         password = request.form.get("password")
 
         if username and password:
-            dao = UserDAO("tictactoe.db")
-            user = dao.get_user(username, password)
+            user = await hashing.run(dao.get_user, username, password)
 
             if user:
                 response = redirect("/")
                 response.add_cookie(
-                    "username",
-                    str(user["username"]),
+                    "session",
+                    sessions.issue(user["id"], user["username"]),
                     secure=False,
-                    httponly=True
-                )
-                response.add_cookie(
-                    "id",
-                    str(user["id"]),
-                    secure=False,
-                    httponly=True
+                    httponly=True,
+                    max_age=sessions.max_age
                 )
                 return response
 
@@ -89,13 +122,16 @@ def register_login_routes(app):
                 "et votre mot de passe et réessayer."
             )
 
-        return await render(
-            login_page, context={"message": message, "page": "login"}
+        return pages.response(
+            login_page, {"message": message, "page": "login"}
         )
 
     @app.route('/logout')
     async def logout(request):
-        """Déconnecte l'utilisateur en supprimant les cookies.
+        """Déconnecte l'utilisateur.
+
+        Le jeton de session est révoqué (pour tous les workers, si la
+        révocation est partagée), puis le cookie est supprimé.
 
         Args:
             request (sanic.request.Request):
@@ -104,9 +140,12 @@ def register_login_routes(app):
         Returns:
             sanic.response.HTTPResponse: Redirection vers la page de login.
         """
+        await DBExecutor.default().run(
+            sessions.revoke, request.cookies.get("session")
+        )
+
         response = redirect("/login")
-        response.delete_cookie("username")
-        response.delete_cookie("id")
+        response.delete_cookie("session")
         return response
 
     @app.route('/register')
@@ -118,10 +157,11 @@ def register_login_routes(app):
                 Objet représentant la requête HTTP.
 
         Returns:
-            sanic.response.HTTPResponse: Page HTML de registre rendue.
+            sanic.response.HTTPResponse: Page HTML de registre, servie
+            depuis la mémoire, ou réponse 304 si elle n'a pas changé.
         """
-        return await render(
-            login_page, context={"page": "register"}
+        return pages.response(
+            login_page, {"page": "register"}, request=request
         )
 
     @app.post('/register')
@@ -146,8 +186,7 @@ def register_login_routes(app):
         message = None
 
         if len(username) > 2 and len(password) > 2 and password == password2:
-            dao = UserDAO("tictactoe.db")
-            uid = dao.insert_user(username, password)
+            uid = await hashing.run(dao.insert_user, username, password)
             if uid > 0:
                 return redirect("/login")
             else:
@@ -162,6 +201,6 @@ def register_login_routes(app):
                 "ne rencontrent pas les demandes. Svp essayez de nouveau."
             )
 
-        return await render(
-            login_page, context={"message": message, "page": "register"}
+        return pages.response(
+            login_page, {"message": message, "page": "register"}
         )
@@ -0,0 +1,51 @@
+"""
+Routes des fichiers statiques pour le jeu Tic-Tac-Toe.
+
+Ce module enregistre une route par dossier de fichiers statiques
+(`/css/...`, `/js/...`, `/img/...`, `/fonts/...`). Seuls les fichiers
+préparés par StaticAssets au démarrage sont servis : les autres fichiers
+du projet (base de données, sources Python, etc.) ne sont pas
+accessibles.
+"""
+from urllib.parse import unquote
+from sanic.exceptions import NotFound
+
+
+def register_static_routes(app, assets):
+    """Enregistre les routes des fichiers statiques.
+
+    Args:
+        app (Sanic): Instance de l'application Sanic.
+        assets (StaticAssets): Fichiers statiques préparés au démarrage.
+    """
+
+    async def static_file(request, name):
+        """Retourne un fichier statique.
+
+        Le chemin demandé peut être l'URL versionnée du fichier (mise en
+        cache indéfiniment) ou son chemin habituel.
+
+        Args:
+            request (sanic.request.Request):
+                Objet représentant la requête HTTP.
+            name (str): Chemin du fichier dans son dossier.
+
+        Returns:
+            sanic.response.HTTPResponse: Contenu du fichier.
+
+        Raises:
+            NotFound: Si le fichier n'est pas servi.
+        """
+        path = unquote(request.path).lstrip("/")
+        asset = assets.get(path)
+        if asset is None:
+            raise NotFound(f"Fichier introuvable : /{path}")
+
+        return await assets.response(request, asset, path)
+
+    for directory in assets.directories:
+        app.add_route(
+            static_file,
+            f"/{directory}/<name:path>",
+            name=f"static_{directory}",
+        )
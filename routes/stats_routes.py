@@ -0,0 +1,64 @@
+"""
+Routes de métriques pour le serveur Tic-Tac-Toe.
+
+Ce module enregistre une route HTTP retournant, au format JSON, les
+métriques internes du serveur, notamment celles du tampon d'écriture
+des parties (profondeur de la file et latence des écritures), ainsi
+que l'occupation et la mémoire estimée des salles de jeu et le nombre
+de messages WebSocket refusés.
+
+La route est réservée à l'exploitation : elle exige le jeton configuré
+(en-tête `Authorization: Bearer <jeton>`), et elle est fermée si aucun
+jeton n'est configuré. Elle ne fait aucun calcul coûteux : la mémoire
+des salles est celle estimée par le dernier nettoyage (`RoomReaper`).
+"""
+import hmac
+from sanic.response import json
+
+
+def register_stats_routes(app, writer, rooms=None, reaper=None,
+                          guard=None, token=None):
+    """Enregistre la route des métriques du serveur.
+
+    Args:
+        app (Sanic): Instance de l'application Sanic.
+        writer (GameWriter): Tampon d'écriture des parties terminées.
+        rooms (RoomManager | None): Registre des salles de jeu.
+        reaper (RoomReaper | None): Nettoyage périodique des salles.
+        guard (MessageGuard | None): Filtrage des messages WebSocket.
+        token (str | None): Jeton exigé pour lire les métriques. Si None,
+            la route refuse toutes les requêtes.
+    """
+    expected = f"Bearer {token}".encode("utf-8") if token else None
+
+    def authorized(request):
+        """Vérifie le jeton de la requête, en temps constant."""
+        received = request.headers.get("authorization", "")
+        return expected is not None and hmac.compare_digest(
+            received.encode("utf-8"), expected
+        )
+
+    @app.route('/stats')
+    async def stats(request):
+        """Retourne les métriques du serveur.
+
+        Args:
+            request (sanic.request.Request):
+                Objet représentant la requête HTTP.
+
+        Returns:
+            sanic.response.JSONResponse: Métriques au format JSON, ou
+            erreur 403 si le jeton est absent ou invalide.
+        """
+        if not authorized(request):
+            return json({"message": "Accès refusé"}, status=403)
+
+        metrics = {"game_writer": writer.stats()}
+        if rooms is not None:
+            metrics["rooms"] = rooms.stats()
+        if reaper is not None:
+            metrics["reaper"] = reaper.stats()
+        if guard is not None:
+            metrics["messages"] = guard.stats()
+
+        return json(metrics)
@@ -1,116 +1,461 @@
 """
 Routes WebSocket pour le jeu Tic-Tac-Toe.
 
-Ce module définit la route WebSocket principale permettant :
-- La connexion des joueurs et spectateurs
+Ce module définit les routes WebSocket principales permettant :
+- La connexion des joueurs et spectateurs à une salle de jeu
 - L'échange des coups en temps réel
 - La gestion de l'état de la partie
-- La détection des victoires, égalités et déconnexions
-- La diffusion des mises à jour à tous les clients connectés
+- La détection des victoires et égalités
+- Le signalement immédiat de la déconnexion d'un joueur, dont la place
+  reste réservée pendant un délai de reconnexion (`RECONNECT_GRACE`)
+- La diffusion des mises à jour à tous les clients connectés, avec un
+  mode delta (`?proto=delta`) qui n'envoie que le dernier coup numéroté
+  et un format binaire compact (`?proto=binary`, voir BinaryProtocol)
+- Le relais des clients vers le worker propriétaire de leur salle,
+  lorsque plusieurs workers partagent un bus de messages (Backplane)
+- La limitation de la taille et du débit des messages reçus
+  (MessageGuard), appliquée par le worker qui tient le WebSocket
 
 Certaines parties du code sont exclues de la couverture de tests
 (`# pragma: no cover`) car leur logique est testée indirectement via
 les tests unitaires des classes Game et WebsocketHelper.
 """
+import asyncio
+import uuid
+from classes.Backplane import Backplane
+from classes.BinaryProtocol import BinaryProtocol
+from classes.GridGame import parse_options
+from classes.MessageGuard import MessageGuard
+from classes.Outbox import Outbox
+from classes.RemoteConnection import RemoteConnection
+from classes.RoomManager import RoomLimitError
+from classes.SessionManager import SessionManager
 from classes.WebsocketHelper import WebsocketHelper
 
+# Délai, en secondes, pendant lequel la place d'un joueur déconnecté lui
+# reste réservée (ajustable avec SANIC_RECONNECT_GRACE).
+RECONNECT_GRACE = 30
 
-def register_websocket_routes(app, game):
+
+def register_websocket_routes(app, rooms, backplane=None, sessions=None,
+                              guard=None):
     """Enregistre les routes WebSocket liées au jeu Tic-Tac-Toe.
 
-    Cette fonction définit la route `/ws`, utilisée pour gérer les
-    connexions WebSocket des joueurs et spectateurs, ainsi que le
-    déroulement complet d'une partie.
+    Cette fonction définit les routes `/ws` et `/ws/<room_id>`, utilisées
+    pour gérer les connexions WebSocket des joueurs et spectateurs, ainsi
+    que le déroulement complet d'une partie. La route `/ws` est associée
+    à la salle par défaut. Les paramètres `size` et `win` de la requête
+    configurent le plateau d'une nouvelle salle.
+
+    Lorsqu'un joueur se déconnecte, les autres clients en sont informés
+    immédiatement (`WAIT|<symbole>`) et sa place lui est réservée : en se
+    reconnectant avec la même session, il retrouve sa place et le plateau
+    en cours. Si sa place est toujours libre à la fin du délai de
+    reconnexion, la partie est réinitialisée.
+
+    Avec un bus de messages (`backplane`), chaque salle appartient à un
+    seul worker. Un client connecté à un autre worker est relayé vers
+    le propriétaire de la salle, où il est représenté par une
+    `RemoteConnection`.
 
     Args:
         app (Sanic): Instance de l'application Sanic.
-        game (Game): Instance de la classe Game représentant l'état du jeu.
+        rooms (RoomManager): Registre des salles de jeu.
+        backplane (Backplane | None): Bus de messages entre workers, ou
+            None pour un seul worker.
+        sessions (SessionManager | None): Vérification des jetons de
+            session, partagée avec les routes de login.
+        guard (MessageGuard | None): Limitation de la taille et du débit
+            des messages reçus.
     """
+    if sessions is None:
+        sessions = SessionManager()
+    if guard is None:
+        guard = MessageGuard()
 
-    @app.websocket("/ws")
-    async def ws_handler(request, ws):
-        """Gestionnaire principal de la connexion WebSocket.
+    grace_period = float(
+        app.config.get("RECONNECT_GRACE", RECONNECT_GRACE)
+    )
 
-        Ce handler :
-        - Assigne un symbole au client: X, O ou S (spectateur)
-        - Gère la réception et la validation des coups
-        - Met à jour l'état du plateau
-        - Détecte les victoires et égalités
-        - Enregistre les résultats en base de données
-        - Diffuse les mises à jour à tous les clients connectés
+    remotes = {}  # Clients relayés par un autre worker, clé: conn_id
+    proxies = {}  # WebSockets locaux relayés, clé: conn_id
+    timers = rooms.timers  # Délais de reconnexion, clé: (room_id, symbole)
+
+    async def join(room_id, ws, options):
+        """Ajoute un client à la partie d'une salle.
 
         Args:
-            request (sanic.request.Request): Requête WebSocket initiale.
-            ws (sanic.websocket.WebSocketProtocol): Connexion WebSocket active.
+            room_id (str): Identifiant de la salle.
+            ws: WebSocket local ou `RemoteConnection` du client.
+            options (dict): Options de création de la salle.
+
+        Returns:
+            Game | None: Partie rejointe, ou None si les options de la
+            salle sont invalides ou si la limite de salles ou de
+            spectateurs est atteinte.
         """
+        try:
+            game = rooms.get_or_create(room_id, **options)
+        except ValueError:
+            await ws.close(1008, "Options de salle invalides")
+            return None
+        except RoomLimitError:
+            await ws.close(1013, "Nombre maximal de salles atteint")
+            return None
+
         wsh = WebsocketHelper(game)
 
-        # Attribution du symbole au joueur (X, O ou spectateur)
+        # Attribution du symbole au joueur (X, O ou spectateur), ou
+        # retour à la place réservée à l'utilisateur. Un utilisateur déjà
+        # assis (second onglet) rejoint la partie comme spectateur.
         player = game.assign_symbol(ws)  # pragma: no cover
-
-        # Association de l'utilisateur connecté au websocket
-        user_id = request.cookies.get("id")
-        ws.user_id = int(user_id) if user_id else None
+        if rooms.spectators_full(game):
+            game.remove_connection(ws)
+            await ws.close(1013, "Nombre maximal de spectateurs atteint")
+            return None
+        ws.symbol = player
 
         # Envoi du symbole au client
-        await ws.send("YOU|" + player)
+        await wsh.send(ws, "YOU|" + player)
 
         # Diffusion de l'état initial du plateau
-        await wsh.broadcast(game.board_state())  # pragma: no cover
+        await wsh.broadcast_snapshot(joined=ws)  # pragma: no cover
 
-        try:
-            while True:
-                # Réception d'un coup depuis le client
-                move = await ws.recv()
+        # Place libérée par un joueur déconnecté : la partie continue
+        timer = timers.pop((room_id, player), None)
+        if timer is not None:
+            timer.cancel()
+            await wsh.notify_back(player)
+
+        return game
+
+    async def play(game, ws, move):
+        """Traite un message reçu d'un client de la partie.
 
-                # Vérifie si l'autre joueur est toujours connecté
-                if await wsh.check_disconnect(ws, player):  # pragma: no cover
-                    continue
+        Args:
+            game (Game): Partie de la salle du client.
+            ws: WebSocket local ou `RemoteConnection` du client.
+            move (str | bytes): Message reçu (coup ou resynchronisation).
+        """
+        player = game.connected.get(ws)
+        if player is None:
+            return
 
-                # Validation du coup
-                cell_id = game.validate_move(player, move)  # pragma: no cover
-                if cell_id is None:
-                    continue
+        wsh = WebsocketHelper(game)
 
-                # Inscription du coup sur le plateau
-                game.board[cell_id] = player
+        # Décodage d'un message binaire (coup ou resynchronisation)
+        if isinstance(move, bytes):
+            move = BinaryProtocol.decode(move)  # pragma: no cover
 
-                # Vérification d'une condition gagnante
-                winner = game.check_winner(game.board)  # pragma: no cover
-                if winner:
-                    await wsh.broadcast(game.board_state())  # pragma: no cover
-                    await wsh.broadcast("WIN|" + winner)  # pragma: no cover
+        # Demande de resynchronisation (coup manqué en mode delta)
+        if move == "SYNC":
+            await wsh.send(  # pragma: no cover
+                ws, game.snapshot_message(binary=ws.binary), True
+            )
+            return
 
-                    # Enregistrement de la partie
-                    game.insert_game(winner)  # pragma: no cover
+        # Les coups attendent le retour d'un adversaire déconnecté
+        if player in game.seats and game.opponent(player) is None:
+            return
 
-                    # Fermeture de toutes les connexions
-                    await wsh.close_all_connections()  # pragma: no cover
+        # Validation du coup
+        cell_id = game.validate_move(player, move)  # pragma: no cover
+        if cell_id is None:
+            return
 
-                    # Réinitialisation du jeu
-                    game.reset_game()  # pragma: no cover
+        # Inscription du coup sur le plateau
+        game.play_move(cell_id, player)
 
-                    continue
+        # Vérification d'une condition gagnante
+        winner = game.winner()  # pragma: no cover
+        if winner:
+            # Enregistrement de la partie, avant la diffusion qui
+            # peut retirer un joueur trop lent
+            await game.insert_game(winner)  # pragma: no cover
 
-                # Vérification d'une partie nulle
-                if game.board_full(game.board):  # pragma: no cover
-                    await wsh.broadcast(game.board_state())  # pragma: no cover
-                    await wsh.broadcast("DRAW")  # pragma: no cover
+            await wsh.broadcast_update()  # pragma: no cover
+            await wsh.broadcast("WIN|" + winner)  # pragma: no cover
 
-                    game.insert_game(0)  # pragma: no cover
-                    await wsh.close_all_connections()  # pragma: no cover
-                    game.reset_game()  # pragma: no cover
-                    continue
+            # Fermeture de toutes les connexions
+            await wsh.close_all_connections()  # pragma: no cover
+
+            # Réinitialisation du jeu
+            game.reset_game()  # pragma: no cover
+            return
+
+        # Vérification d'une partie nulle
+        if game.is_full():  # pragma: no cover
+            await game.insert_game(0)  # pragma: no cover
+
+            await wsh.broadcast_update()  # pragma: no cover
+            await wsh.broadcast("DRAW")  # pragma: no cover
+
+            await wsh.close_all_connections()  # pragma: no cover
+            game.reset_game()  # pragma: no cover
+            return
+
+        # Changement du joueur actif
+        if game.current_player == "X":
+            game.current_player = "O"
+        else:
+            game.current_player = "X"
+
+        # Diffusion du nouvel état du plateau
+        await wsh.broadcast_update()  # pragma: no cover
+
+    async def expire(room_id, game, player):
+        """Termine la partie d'un joueur absent après le délai de reconnexion.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+            game (Game): Partie quittée par le joueur.
+            player (str): Symbole du joueur parti ("X" ou "O").
+        """
+        await asyncio.sleep(grace_period)
+        timers.pop((room_id, player), None)
+        game.release(player)
+
+        if rooms.get(room_id) is game:
+            await WebsocketHelper(game).end_abandoned(player)
+
+    async def leave(room_id, ws):
+        """Retire un client de sa salle et supprime la salle si elle est vide.
+
+        Le départ d'un joueur est signalé aux autres clients, et son
+        délai de reconnexion commence : sa place est réservée à son
+        identifiant d'utilisateur (jeton de session). Une salle supprimée
+        (ou jamais créée) est libérée sur le bus de messages afin de
+        pouvoir être attribuée à un autre worker.
+
+        Args:
+            room_id (str): Identifiant de la salle.
+            ws: WebSocket local ou `RemoteConnection` du client.
+        """
+        game = rooms.get(room_id)
+        if game is not None:
+            player = game.remove_connection(ws)
+
+            # Client déjà retiré par la diffusion (trop lent) : son
+            # symbole est conservé sur la connexion.
+            if player is None and Outbox.of(ws).close_task is not None:
+                player = getattr(ws, "symbol", None)
+
+            # Une salle vide est supprimée avec ses délais de reconnexion
+            if not rooms.cleanup(room_id) and (
+                player in game.seats
+                and game.seats[player] is None
+                and game.opponent(player) is not None
+                and (room_id, player) not in timers
+            ):
+                # Place réservée à l'utilisateur jusqu'à son retour
+                if ws.user_id is not None:
+                    game.reserve(player, ws.user_id)
+
+                timers[(room_id, player)] = asyncio.ensure_future(
+                    expire(room_id, game, player)
+                )
+                await WebsocketHelper(game).notify_left(player)
+
+        if backplane is not None and room_id not in rooms:
+            await backplane.release(room_id)
+
+    async def receive(ws):
+        """Attend le prochain message accepté d'un client.
+
+        Les messages trop nombreux sont ignorés. Un client qui envoie un
+        message trop volumineux, ou dont trop de messages ont été
+        refusés, est fermé.
+
+        Args:
+            ws: WebSocket local du client.
 
-                # Changement du joueur actif
-                if game.current_player == "X":
-                    game.current_player = "O"
+        Returns:
+            str | bytes | None: Message accepté, ou None si le client a
+            été fermé.
+        """
+        while True:
+            data = await ws.recv()
+            reason = guard.check(ws, data)
+            if reason is None:
+                return data
+
+            if reason == MessageGuard.TOO_LARGE:
+                await ws.close(1009, "Message trop volumineux")
+                return None
+            if reason == MessageGuard.ABUSIVE:
+                await ws.close(1008, "Trop de messages")
+                return None
+
+    async def proxy(ws, room_id, owner, join_message):
+        """Relaie un client local vers le worker propriétaire de la salle.
+
+        Si le worker propriétaire ne répond plus (bail expiré), le client
+        est fermé avec le code 1013 : en se reconnectant, il rejoint la
+        salle reprise par un worker en vie.
+
+        Args:
+            ws: WebSocket local du client.
+            room_id (str): Identifiant de la salle.
+            owner (str): Identifiant du worker propriétaire.
+            join_message (dict): Message d'arrivée du client.
+        """
+        conn_id = join_message["conn"]
+        proxies[conn_id] = ws
+
+        try:
+            delivered = await backplane.publish(owner, join_message)
+            while delivered:
+                data = await receive(ws)
+                if data is None:
+                    return
+                message = {"type": "message", "conn": conn_id}
+                message.update(Backplane.pack(data))
+                delivered = await backplane.publish(owner, message)
+
+            await ws.close(1013, "Salle indisponible, réessayez")
+        finally:
+            proxies.pop(conn_id, None)
+            await backplane.publish(owner, {"type": "leave", "conn": conn_id})
+
+    async def on_backplane_message(message):
+        """Traite un message reçu d'un autre worker.
+
+        Messages destinés au worker propriétaire d'une salle : `join`,
+        `message` et `leave`. Messages destinés au worker qui tient le
+        WebSocket d'un client : `send` et `close`.
+
+        Args:
+            message (dict): Message reçu par le bus.
+        """
+        kind = message["type"]
+        conn_id = message["conn"]
+
+        if kind == "send":
+            ws = proxies.get(conn_id)
+            if ws is not None:
+                outbox = Outbox.of(ws)
+                if outbox.push(Backplane.unpack(message)):
+                    asyncio.ensure_future(outbox.drain())
                 else:
-                    game.current_player = "X"
+                    outbox.close()
+
+        elif kind == "close":
+            ws = proxies.get(conn_id)
+            if ws is not None:
+                asyncio.ensure_future(
+                    ws.close(message["code"], message["reason"])
+                )
+
+        elif kind == "join":
+            conn = RemoteConnection(
+                backplane, message["worker"], conn_id,
+                user_id=message["user_id"],
+                username=message["username"],
+                delta=message["delta"],
+                binary=message["binary"],
+            )
+            room_id = message["room"]
+
+            # La salle a pu être libérée puis attribuée à un autre worker
+            if not backplane.owns(await backplane.claim(room_id)):
+                await conn.close(1013, "Salle indisponible, réessayez")
+                return
+
+            if await join(room_id, conn, message["options"]) is None:
+                await leave(room_id, conn)
+                return
+
+            remotes[conn_id] = (room_id, conn)
+
+        elif kind == "message":
+            if conn_id in remotes:
+                room_id, conn = remotes[conn_id]
+                game = rooms.get(room_id)
+                if game is not None:
+                    await play(game, conn, Backplane.unpack(message))
+
+        elif kind == "leave":
+            if conn_id in remotes:
+                room_id, conn = remotes.pop(conn_id)
+                await leave(room_id, conn)
 
-                # Diffusion du nouvel état du plateau
-                await wsh.broadcast(game.board_state())  # pragma: no cover
+    async def ws_handler(request, ws, room_id=rooms.DEFAULT_ROOM):
+        """Gestionnaire principal de la connexion WebSocket.
+
+        Ce handler :
+        - Assigne un symbole au client: X, O ou S (spectateur)
+        - Gère la réception et la validation des coups
+        - Met à jour l'état du plateau
+        - Détecte les victoires et égalités
+        - Enregistre les résultats en base de données
+        - Diffuse les mises à jour à tous les clients connectés
+        - Relaie le client vers le worker propriétaire de la salle
+
+        Args:
+            request (sanic.request.Request): Requête WebSocket initiale.
+            ws (sanic.websocket.WebSocketProtocol): Connexion WebSocket active.
+            room_id (str): Identifiant de la salle rejointe.
+        """
+        # Options de la salle (?size=15&win=5), utilisées à sa création
+        try:
+            options = parse_options(request.args)
+        except ValueError:
+            await ws.close(1008, "Options de salle invalides")
+            return
+
+        # Association de l'utilisateur connecté au websocket (jeton de
+        # session signé, vérifié sans accès à la base de données)
+        user = sessions.verify(request.cookies.get("session"))
+        ws.user_id = user["id"] if user else None
+        ws.username = user["username"] if user else None
+
+        # Protocole du client : état complet, dernier coup (delta) ou
+        # dernier coup au format binaire
+        proto = request.args.get("proto")
+        ws.binary = proto == "binary"
+        ws.delta = ws.binary or proto == "delta"
+
+        # Salle appartenant à un autre worker : relais du client
+        if backplane is not None:
+            owner = await backplane.claim(room_id)
+            if not backplane.owns(owner):
+                await proxy(ws, room_id, owner, {  # pragma: no cover
+                    "type": "join",
+                    "conn": uuid.uuid4().hex,
+                    "worker": backplane.worker_id,
+                    "room": room_id,
+                    "options": options,
+                    "user_id": ws.user_id,
+                    "username": ws.username,
+                    "delta": ws.delta,
+                    "binary": ws.binary,
+                })
+                return
+
+        game = await join(room_id, ws, options)
+        if game is None:
+            await leave(room_id, ws)
+            return
+
+        try:
+            while True:
+                # Réception d'un coup depuis le client, filtré avant tout
+                # décodage (taille et débit)
+                move = await receive(ws)
+                if move is None:
+                    break
+                await play(game, ws, move)
 
         finally:
-            # Nettoyage de la connexion websocket
-            game.connected.pop(ws, None)
+            # Nettoyage de la connexion websocket et de la salle vide
+            await leave(room_id, ws)
+
+    if backplane is not None:
+        backplane.subscribe(on_backplane_message)
+
+    app.add_websocket_route(ws_handler, "/ws")
+    app.add_websocket_route(
+        ws_handler,
+        "/ws/<room_id:[A-Za-z0-9_-]{1,32}>",
+        name="ws_room_handler"
+    )
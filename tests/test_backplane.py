@@ -0,0 +1,62 @@
+import asyncio
+import unittest
+
+from classes.Backplane import Backplane
+
+
+class TestBackplane(unittest.IsolatedAsyncioTestCase):
+
+    def test_worker_id_is_unique(self):
+        self.assertNotEqual(Backplane().worker_id, Backplane().worker_id)
+        self.assertEqual(Backplane("w1").worker_id, "w1")
+
+    def test_owns(self):
+        backplane = Backplane("w1")
+        self.assertTrue(backplane.owns("w1"))
+        self.assertFalse(backplane.owns("w2"))
+
+    def test_pack_text_and_binary(self):
+        self.assertEqual(Backplane.pack("YOU|X"), {"text": "YOU|X"})
+        self.assertEqual(Backplane.unpack(Backplane.pack("YOU|X")), "YOU|X")
+        self.assertEqual(
+            Backplane.unpack(Backplane.pack(b"\x01\x02")), b"\x01\x02"
+        )
+
+    async def test_messages_handled_in_order(self):
+        backplane = Backplane("w1")
+        received = []
+
+        async def handler(message):
+            await asyncio.sleep(0)
+            received.append(message["n"])
+
+        backplane.subscribe(handler)
+        await backplane.start()
+        for n in range(5):
+            backplane.deliver({"n": n})
+
+        await asyncio.sleep(0.05)
+        await backplane.close()
+        self.assertEqual(received, [0, 1, 2, 3, 4])
+
+    async def test_handler_error_does_not_stop_consumer(self):
+        backplane = Backplane("w1")
+        received = []
+
+        async def handler(message):
+            if message["n"] == 0:
+                raise RuntimeError("boom")
+            received.append(message["n"])
+
+        backplane.subscribe(handler)
+        await backplane.start()
+        backplane.deliver({"n": 0})
+        backplane.deliver({"n": 1})
+
+        await asyncio.sleep(0.05)
+        await backplane.close()
+        self.assertEqual(received, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
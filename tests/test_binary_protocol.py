@@ -0,0 +1,59 @@
+import unittest
+
+from classes.BinaryProtocol import BinaryProtocol
+
+
+class TestBinaryProtocol(unittest.TestCase):
+
+    ### Tests pour encode_snapshot() ###
+    def test_encode_snapshot(self):
+        board = ["X","O","","","","","","","O"]
+        data = BinaryProtocol.encode_snapshot(7, board, "X")
+
+        # type, seq, taille, joueur courant
+        self.assertEqual(data[:7], b"\x02\x00\x00\x00\x07\x03\x01")
+        # X=1, O=2 : cases 0-3 -> 0b00001001, case 8 -> 0b10
+        self.assertEqual(data[7:], b"\x09\x00\x02")
+
+    def test_encode_snapshot_large_board(self):
+        data = BinaryProtocol.encode_snapshot(0, [""] * 225, "X")
+
+        self.assertEqual(data[5], 15)
+        self.assertEqual(len(data), 7 + 57)
+
+    ### Tests pour encode_delta() ###
+    def test_encode_delta(self):
+        data = BinaryProtocol.encode_delta(70000, 224, "O", "X")
+        self.assertEqual(data, b"\x03\x00\x01\x11\x70\x00\xe0\x02\x01")
+
+    ### Tests pour encode_text() ###
+    def test_encode_text_control_messages(self):
+        self.assertEqual(BinaryProtocol.encode_text("YOU|S"), b"\x01\x03")
+        self.assertEqual(BinaryProtocol.encode_text("WIN|O"), b"\x04\x02")
+        self.assertEqual(BinaryProtocol.encode_text("DRAW"), b"\x05")
+        self.assertEqual(BinaryProtocol.encode_text("WAIT|X"), b"\x07\x01")
+        self.assertEqual(BinaryProtocol.encode_text("BACK|O"), b"\x08\x02")
+        self.assertEqual(
+            BinaryProtocol.encode_text("DISC|perdu"), b"\x06perdu"
+        )
+
+    def test_encode_text_unknown(self):
+        self.assertIsNone(BinaryProtocol.encode_text(",,,,,,,,|X"))
+        self.assertIsNone(BinaryProtocol.encode_text("WIN|Z"))
+
+    ### Tests pour decode() ###
+    def test_decode_move(self):
+        self.assertEqual(BinaryProtocol.decode(b"\x10\x00\x04"), 4)
+        self.assertEqual(BinaryProtocol.decode(b"\x10\x00\xe0"), 224)
+
+    def test_decode_sync(self):
+        self.assertEqual(BinaryProtocol.decode(b"\x11"), "SYNC")
+
+    def test_decode_invalid(self):
+        self.assertIsNone(BinaryProtocol.decode(b""))
+        self.assertIsNone(BinaryProtocol.decode(b"\x10\x04"))
+        self.assertIsNone(BinaryProtocol.decode(b"\x12\x00\x04"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+from classes.BitboardGame import BitboardGame, FULL_MASK, WIN_MASKS
+from classes.Game import Game
+
+
+class TestBitboardGame(unittest.TestCase):
+
+    def setUp(self):
+        self.game = BitboardGame()
+
+    ### Tests pour la représentation en bits ###
+    def test_new_game_is_empty(self):
+        self.assertEqual(self.game.x_bits, 0)
+        self.assertEqual(self.game.o_bits, 0)
+        self.assertEqual(self.game.board, [""] * 9)
+
+    def test_win_masks_match_win_lines(self):
+        self.assertEqual(len(WIN_MASKS), len(Game.WIN_LINES))
+        self.assertIn(0b000000111, WIN_MASKS)
+        self.assertIn(0b100010001, WIN_MASKS)
+
+    def test_board_setter_converts_to_bits(self):
+        self.game.board = ["X","O","","","X","","","","O"]
+
+        self.assertEqual(self.game.x_bits, 0b000010001)
+        self.assertEqual(self.game.o_bits, 0b100000010)
+        self.assertEqual(self.game.board, ["X","O","","","X","","","","O"])
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.game, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.game.unknown = 1
+
+    ### Tests pour validate_move() et play_move() ###
+    def test_validate_move_valid(self):
+        self.assertEqual(self.game.validate_move("X", "4"), 4)
+
+    def test_validate_move_invalid(self):
+        self.assertIsNone(self.game.validate_move("X", "abc"))
+        self.assertIsNone(self.game.validate_move("X", None))
+        self.assertIsNone(self.game.validate_move("X", 9))
+        self.assertIsNone(self.game.validate_move("X", -1))
+        self.assertIsNone(self.game.validate_move("S", 3))
+
+    def test_validate_move_wrong_player(self):
+        self.game.current_player = "O"
+        self.assertIsNone(self.game.validate_move("X", 3))
+
+    def test_validate_move_cell_taken(self):
+        self.game.play_move(3, "O")
+        self.assertIsNone(self.game.validate_move("X", 3))
+
+    def test_play_move_sets_bit(self):
+        self.game.play_move(0, "X")
+        self.game.play_move(8, "O")
+
+        self.assertEqual(self.game.x_bits, 0b000000001)
+        self.assertEqual(self.game.o_bits, 0b100000000)
+        self.assertEqual(self.game.board[0], "X")
+        self.assertEqual(self.game.board[8], "O")
+
+    ### Tests pour winner() et check_winner() ###
+    def test_winner_row(self):
+        for cell in (3, 4, 5):
+            self.game.play_move(cell, "X")
+        self.assertEqual(self.game.winner(), "X")
+
+    def test_winner_column(self):
+        for cell in (2, 5, 8):
+            self.game.play_move(cell, "O")
+        self.assertEqual(self.game.winner(), "O")
+
+    def test_winner_diagonal(self):
+        for cell in (2, 4, 6):
+            self.game.play_move(cell, "X")
+        self.assertEqual(self.game.winner(), "X")
+
+    def test_winner_none(self):
+        self.game.board = ["X","O","X","X","O","O","O","X","X"]
+        self.assertIsNone(self.game.winner())
+
+    def test_check_winner_list(self):
+        self.assertEqual(
+            self.game.check_winner(["O","","","","O","","","","O"]), "O"
+        )
+        self.assertIsNone(self.game.check_winner([""] * 9))
+
+    def test_check_winner_same_as_game(self):
+        boards = [
+            ["X","X","X","O","O","","","",""],
+            ["O","X","","O","X","","O","",""],
+            ["X","O","X","X","O","O","O","X","X"],
+            ["","","X","","X","","X","O","O"],
+        ]
+        for board in boards:
+            self.assertEqual(
+                self.game.check_winner(board), Game().check_winner(board)
+            )
+
+    ### Tests pour is_full() ###
+    def test_is_full(self):
+        self.assertFalse(self.game.is_full())
+
+        self.game.board = ["X","O","X","X","O","O","O","X","X"]
+
+        self.assertEqual(self.game.x_bits | self.game.o_bits, FULL_MASK)
+        self.assertTrue(self.game.is_full())
+
+    ### Tests pour board_state() ###
+    def test_board_state_format(self):
+        self.game.play_move(0, "X")
+        self.game.play_move(4, "O")
+        self.game.current_player = "X"
+
+        self.assertEqual(self.game.board_state(), "X,,,,O,,,,|X")
+
+    def test_board_state_invalidated_by_move(self):
+        before = self.game.board_state()
+        self.assertIs(self.game.board_state(), before)
+
+        self.game.play_move(1, "X")
+
+        self.assertEqual(self.game.board_state(), ",X,,,,,,,|X")
+        self.assertEqual(str(self.game.board_message()), ",X,,,,,,,|X")
+
+    def test_delta_message(self):
+        self.game.play_move(7, "X")
+        self.game.current_player = "O"
+
+        self.assertEqual(self.game.delta_message().text, "D|1|7|X|O")
+        self.assertEqual(
+            self.game.snapshot_message().text, "SNAP|1|,,,,,,,X,|O"
+        )
+
+    ### Tests pour reset_game() ###
+    def test_reset_game(self):
+        self.game.play_move(0, "X")
+        self.game.current_player = "O"
+
+        self.game.reset_game()
+
+        self.assertEqual(self.game.x_bits, 0)
+        self.assertEqual(self.game.o_bits, 0)
+        self.assertEqual(self.game.current_player, "X")
+        self.assertEqual(self.game.board_state(), ",,,,,,,,|X")
+
+
+if __name__ == "__main__":
+    unittest.main()
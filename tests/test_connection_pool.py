@@ -0,0 +1,72 @@
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from classes.ConnectionPool import ConnectionPool
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        # Fichier temporaire pour la base de données
+        self.db_file = tempfile.NamedTemporaryFile(delete=True)
+        self.db_path = self.db_file.name
+        self.db_file.close()
+
+        self.pool = ConnectionPool(self.db_path, max_idle=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_get_returns_shared_pool(self):
+        self.assertIs(ConnectionPool.get(self.db_path),
+                      ConnectionPool.get(self.db_path))
+
+    def test_connection_is_reused(self):
+        with self.pool.connection() as conn1:
+            pass
+        with self.pool.connection() as conn2:
+            pass
+        self.assertIs(conn1, conn2)
+
+    def test_wal_mode_enabled(self):
+        with self.pool.connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), "wal")
+
+    def test_commit_and_rollback(self):
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise ValueError("boom")
+
+        with sqlite3.connect(self.db_path) as other:
+            rows = other.execute("SELECT v FROM t").fetchall()
+        self.assertEqual(rows, [(1,)])
+
+    def test_row_factory_is_reset(self):
+        with self.pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+        with self.pool.connection() as conn:
+            self.assertIsNone(conn.row_factory)
+
+    def test_max_idle(self):
+        with self.pool.connection(), self.pool.connection(), \
+                self.pool.connection():
+            pass
+        self.assertEqual(self.pool._idle.qsize(), 2)
+
+    def test_ensure_schema_runs_once(self):
+        create_schema = MagicMock()
+        self.pool.ensure_schema("Test", create_schema)
+        self.pool.ensure_schema("Test", create_schema)
+        create_schema.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from classes.DBExecutor import DBExecutor
+
+
+class TestDBExecutor(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executor = DBExecutor(max_workers=2)
+
+    async def asyncTearDown(self):
+        self.executor.shutdown()
+
+    async def test_run_returns_result(self):
+        result = await self.executor.run(sum, [1, 2, 3])
+        self.assertEqual(result, 6)
+
+    async def test_run_with_kwargs(self):
+        result = await self.executor.run(int, "ff", base=16)
+        self.assertEqual(result, 255)
+
+    async def test_run_outside_event_loop_thread(self):
+        name = await self.executor.run(lambda: threading.current_thread().name)
+        self.assertNotEqual(name, threading.current_thread().name)
+        self.assertTrue(name.startswith("db"))
+
+    async def test_thread_name_prefix(self):
+        executor = DBExecutor(max_workers=1, thread_name_prefix="hash")
+        try:
+            name = await executor.run(
+                lambda: threading.current_thread().name
+            )
+        finally:
+            executor.shutdown()
+        self.assertTrue(name.startswith("hash"))
+
+    async def test_run_propagates_exception(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            await self.executor.run(fail)
+
+    async def test_default_is_shared(self):
+        self.assertIs(DBExecutor.default(), DBExecutor.default())
+
+
+if __name__ == "__main__":
+    unittest.main()
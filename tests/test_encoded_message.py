@@ -0,0 +1,83 @@
+import unittest
+
+from sanic import Sanic
+from sanic_testing import TestManager
+
+from classes.EncodedMessage import EncodedMessage
+
+
+class FakeWS:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(message)
+
+
+class TestEncodedMessage(unittest.IsolatedAsyncioTestCase):
+
+    def test_text_message(self):
+        message = EncodedMessage("DRAW")
+        self.assertEqual(message.text, "DRAW")
+        self.assertEqual(str(message), "DRAW")
+
+    async def test_send_shares_payload(self):
+        message = EncodedMessage(b"\x04\x01")
+        first, second = FakeWS(), FakeWS()
+        await message.send(first)
+        await message.send(second)
+
+        self.assertEqual(first.sent, [b"\x04\x01"])
+        self.assertIs(first.sent[0], second.sent[0])
+
+
+class TestEncodedMessageSanic(unittest.TestCase):
+
+    def test_send_text(self):
+        """Le message partagé est reçu comme un message texte"""
+        app = Sanic("test_app_encoded_message", configure_logging=False)
+        TestManager(app)
+        message = EncodedMessage("X,,O,,,,,,|O")
+
+        @app.websocket("/ws")
+        async def handler(request, ws):
+            await message.send(ws)
+            await ws.send("plain")
+            await message.send(ws)
+            await ws.recv()
+
+        received = []
+
+        async def client(ws):
+            for _ in range(3):
+                received.append(await ws.recv())
+            await ws.send("bye")
+
+        app.test_client.websocket("/ws", mimic=client)
+        self.assertEqual(
+            received, ["X,,O,,,,,,|O", "plain", "X,,O,,,,,,|O"]
+        )
+
+
+    def test_send_binary(self):
+        """Le message binaire partagé est reçu comme des octets"""
+        app = Sanic("test_app_encoded_binary", configure_logging=False)
+        TestManager(app)
+        message = EncodedMessage(b"\x03\x00\x01")
+
+        @app.websocket("/ws")
+        async def handler(request, ws):
+            await message.send(ws)
+            await ws.recv()
+
+        received = []
+
+        async def client(ws):
+            received.append(await ws.recv())
+            await ws.send("bye")
+
+        app.test_client.websocket("/ws", mimic=client)
+        self.assertEqual(received, [b"\x03\x00\x01"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from classes.Game import Game
 
 ## Dépendances
@@ -15,10 +15,11 @@ from classes.Game import Game
 
 
 class FakeWS:
-    def __init__(self, user_id=None):
+    def __init__(self, user_id=None, username=None):
         self.user_id = user_id
+        self.username = username
 
-class TestGame(unittest.TestCase):
+class TestGame(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
         self.game = Game()
@@ -46,6 +47,122 @@ class TestGame(unittest.TestCase):
         s3 = self.game.assign_symbol(ws3)
 
         self.assertEqual(s3, "S")
+        self.assertEqual(self.game.seats, {"X": ws2, "O": ws1})
+        self.assertEqual(self.game.spectators, {ws3})
+
+    def test_assign_symbol_reuses_free_seat(self):
+        ws1 = FakeWS()
+        ws2 = FakeWS()
+        spectators = [FakeWS() for _ in range(100)]
+
+        self.game.assign_symbol(ws1)
+        self.game.assign_symbol(ws2)
+        for ws in spectators:
+            self.game.assign_symbol(ws)
+
+        self.assertEqual(self.game.remove_connection(ws1), "O")
+        self.assertIsNone(self.game.seats["O"])
+
+        ws3 = FakeWS()
+        self.assertEqual(self.game.assign_symbol(ws3), "O")
+        self.assertIs(self.game.seats["O"], ws3)
+        self.assertEqual(len(self.game.spectators), 100)
+
+    ### Tests pour reserve(), release() et seat_of() ###
+    def test_reserved_seat_returns_to_its_user(self):
+        ws_o = FakeWS(user_id=1)
+        ws_x = FakeWS(user_id=2)
+        self.game.assign_symbol(ws_o)
+        self.game.assign_symbol(ws_x)
+
+        self.game.remove_connection(ws_x)
+        self.game.reserve("X", 2)
+
+        # Une place réservée n'est pas attribuée à un autre utilisateur
+        self.assertEqual(self.game.assign_symbol(FakeWS(user_id=3)), "S")
+        self.assertEqual(self.game.assign_symbol(FakeWS()), "S")
+
+        back = FakeWS(user_id=2)
+        self.assertEqual(self.game.assign_symbol(back), "X")
+        self.assertIs(self.game.seats["X"], back)
+        self.assertEqual(self.game.reserved, {})
+
+    def test_release_frees_reserved_seat(self):
+        self.game.reserve("O", 1)
+        self.assertEqual(self.game.assign_symbol(FakeWS(user_id=2)), "X")
+
+        self.game.release("O")
+        self.assertEqual(self.game.assign_symbol(FakeWS(user_id=3)), "O")
+
+    def test_second_tab_of_seated_user_is_spectator(self):
+        first = FakeWS(user_id=1)
+        self.game.assign_symbol(first)
+
+        self.assertEqual(self.game.assign_symbol(FakeWS(user_id=1)), "S")
+        self.assertIs(self.game.seats["O"], first)
+        self.assertIsNone(self.game.seats["X"])
+
+    def test_seat_of(self):
+        self.game.assign_symbol(FakeWS(user_id=1))
+        self.game.assign_symbol(FakeWS())
+
+        self.assertEqual(self.game.seat_of(1), "O")
+        self.assertIsNone(self.game.seat_of(2))
+        self.assertIsNone(self.game.seat_of(None))
+        self.assertIsNone(self.game.reserved_seat(None))
+
+    ### Tests pour remove_connection() et opponent() ###
+    def test_remove_connection_spectator(self):
+        ws1 = FakeWS()
+        ws2 = FakeWS()
+        ws3 = FakeWS()
+        for ws in (ws1, ws2, ws3):
+            self.game.assign_symbol(ws)
+
+        self.assertEqual(self.game.remove_connection(ws3), "S")
+        self.assertEqual(self.game.spectators, set())
+        self.assertEqual(self.game.seats, {"X": ws2, "O": ws1})
+        self.assertNotIn(ws3, self.game.connected)
+
+    def test_remove_connection_unknown(self):
+        self.assertIsNone(self.game.remove_connection(FakeWS()))
+
+    def test_opponent(self):
+        ws1 = FakeWS()
+        ws2 = FakeWS()
+        self.game.assign_symbol(ws1)
+
+        self.assertIsNone(self.game.opponent("O"))
+
+        self.game.assign_symbol(ws2)
+
+        self.assertIs(self.game.opponent("O"), ws2)
+        self.assertIs(self.game.opponent("X"), ws1)
+        self.assertIsNone(self.game.opponent("S"))
+
+    ### Tests pour last_active et memory_size() ###
+    def test_last_active_updated_by_join_and_move(self):
+        self.game.last_active = 0
+        self.game.assign_symbol(FakeWS())
+        joined = self.game.last_active
+        self.assertGreater(joined, 0)
+
+        self.game.last_active = 0
+        self.game.play_move(4, "X")
+        self.assertGreater(self.game.last_active, 0)
+
+    def test_memory_size_excludes_connections(self):
+        size = self.game.memory_size()
+        self.assertGreater(size, 0)
+
+        # Les messages encodés en cache sont comptés
+        self.game.board_message()
+        self.assertGreater(self.game.memory_size(), size)
+
+        # Un objet déjà compté ne l'est pas une seconde fois
+        seen = set()
+        self.game.memory_size(seen)
+        self.assertLess(self.game.memory_size(seen), size)
 
     ### Tests pour validate_move() ###
     def test_validate_move_valid(self):
@@ -114,51 +231,187 @@ class TestGame(unittest.TestCase):
         state = self.game.board_state()
         self.assertEqual(state, "X,,O,,,,,,|O")
 
+    def test_board_state_is_cached(self):
+        state = self.game.board_state()
+        self.assertIs(self.game.board_state(), state)
+        self.assertIs(self.game.board_message(), self.game.board_message())
+
+    def test_board_state_invalidated_by_move(self):
+        message = self.game.board_message()
+        self.game.play_move(4, "X")
+
+        self.assertEqual(self.game.board_state(), ",,,,X,,,,|X")
+        self.assertIsNot(self.game.board_message(), message)
+        self.assertEqual(self.game.board_message().text, ",,,,X,,,,|X")
+
+    def test_board_state_invalidated_by_player_change(self):
+        self.game.board_state()
+        self.game.current_player = "O"
+        self.assertEqual(self.game.board_state(), ",,,,,,,,|O")
+
+    def test_board_state_invalidated_by_reset(self):
+        self.game.play_move(0, "X")
+        self.game.board_state()
+        self.game.reset_game()
+        self.assertEqual(self.game.board_state(), ",,,,,,,,|X")
+
+    ### Tests pour snapshot_message() et delta_message() ###
+    def test_snapshot_message(self):
+        self.assertEqual(self.game.snapshot_message().text, "SNAP|0|,,,,,,,,|X")
+        self.assertIs(self.game.snapshot_message(), self.game.snapshot_message())
+
+    def test_play_move_increments_seq(self):
+        self.game.play_move(4, "X")
+        self.game.play_move(0, "O")
+
+        self.assertEqual(self.game.seq, 2)
+        self.assertEqual(self.game.last_move, 0)
+        self.assertEqual(self.game.snapshot_message().text, "SNAP|2|O,,,,X,,,,|X")
+
+    def test_delta_message(self):
+        self.game.play_move(4, "X")
+        self.game.current_player = "O"
+
+        self.assertEqual(self.game.delta_message().text, "D|1|4|X|O")
+        self.assertIs(self.game.delta_message(), self.game.delta_message())
+
+        self.game.play_move(8, "O")
+        self.game.current_player = "X"
+        self.assertEqual(self.game.delta_message().text, "D|2|8|O|X")
+
+    def test_binary_messages(self):
+        self.game.play_move(4, "X")
+        self.game.current_player = "O"
+
+        self.assertEqual(
+            self.game.delta_message(binary=True).text,
+            b"\x03\x00\x00\x00\x01\x00\x04\x01\x02"
+        )
+        self.assertEqual(
+            self.game.snapshot_message(binary=True).text,
+            b"\x02\x00\x00\x00\x01\x03\x02\x00\x01\x00"
+        )
+        self.assertIsNot(
+            self.game.snapshot_message(binary=True),
+            self.game.snapshot_message()
+        )
+
+    def test_reset_keeps_seq(self):
+        self.game.play_move(4, "X")
+        self.game.reset_game()
+
+        self.assertEqual(self.game.seq, 1)
+        self.assertIsNone(self.game.last_move)
+
     ### Tests pour insert_game() ###
     @patch("classes.Game.GameDAO")
-    def test_insert_game_X_wins(self, MockDAO):
+    async def test_insert_game_X_wins(self, MockDAO):
         wsX = FakeWS(user_id=1)
         wsO = FakeWS(user_id=2)
 
-        self.game.connected = {
-            wsX: "X",
-            wsO: "O"
-        }
+        self.game.add_connection(wsX, "X")
+        self.game.add_connection(wsO, "O")
 
         mock_dao = MockDAO.return_value
 
-        self.game.insert_game("X")
+        await self.game.insert_game("X")
 
         mock_dao.insert_game.assert_called_once_with(1, 2, 1)
 
     @patch("classes.Game.GameDAO")
-    def test_insert_game_O_wins(self, MockDAO):
+    async def test_insert_game_O_wins(self, MockDAO):
         wsX = FakeWS(user_id=1)
         wsO = FakeWS(user_id=2)
 
-        self.game.connected = {
-            wsX: "X",
-            wsO: "O"
-        }
+        self.game.add_connection(wsX, "X")
+        self.game.add_connection(wsO, "O")
 
         mock_dao = MockDAO.return_value
 
-        self.game.insert_game("O")
+        await self.game.insert_game("O")
 
         mock_dao.insert_game.assert_called_once_with(1, 2, 2)
 
     @patch("classes.Game.GameDAO")
-    def test_insert_game_draw(self, MockDAO):
+    async def test_insert_game_draw(self, MockDAO):
         wsX = FakeWS(user_id=1)
         wsO = FakeWS(user_id=2)
 
-        self.game.connected = {
-            wsX: "X",
-            wsO: "O"
-        }
+        self.game.add_connection(wsX, "X")
+        self.game.add_connection(wsO, "O")
 
         mock_dao = MockDAO.return_value
 
-        self.game.insert_game(None)
+        await self.game.insert_game(None)
 
         mock_dao.insert_game.assert_called_once_with(1, 2, 0)
+
+    @patch("classes.Game.GameDAO")
+    async def test_insert_game_updates_leaderboard(self, MockDAO):
+        leaderboard = MagicMock()
+        leaderboard.refresh = AsyncMock(return_value=True)
+        leaderboard.persist_leaderboard = AsyncMock()
+        game = Game(leaderboard=leaderboard)
+        game.add_connection(FakeWS(user_id=1, username="Alice"), "X")
+        game.add_connection(FakeWS(user_id=2, username="Bob"), "O")
+
+        await game.insert_game("O")
+
+        # Le leaderboard lit la partie après son écriture
+        MockDAO.return_value.insert_game.assert_called_once_with(1, 2, 2)
+        leaderboard.refresh.assert_awaited_once_with()
+        leaderboard.record_game.assert_not_called()
+        # Le fichier est écrit en arrière-plan, sans attente
+        leaderboard.schedule_persist.assert_called_once_with()
+        leaderboard.persist_leaderboard.assert_not_awaited()
+
+    @patch("classes.Game.GameDAO")
+    async def test_insert_game_with_writer_waits_for_write(self, MockDAO):
+        leaderboard = MagicMock()
+        leaderboard.refresh = AsyncMock(return_value=True)
+        writer = MagicMock()
+        game = Game(leaderboard=leaderboard, writer=writer)
+        game.add_connection(FakeWS(user_id=1, username="Alice"), "X")
+        game.add_connection(FakeWS(user_id=2, username="Bob"), "O")
+
+        await game.insert_game(None)
+
+        # Partie seulement mise en attente : pas encore comptée
+        writer.add.assert_called_once_with(1, 2, 0)
+        leaderboard.refresh.assert_not_awaited()
+        leaderboard.record_game.assert_not_called()
+
+    @patch("classes.Game.GameDAO")
+    async def test_insert_game_uses_writer(self, MockDAO):
+        writer = MagicMock()
+        game = Game(writer=writer)
+        game.add_connection(FakeWS(user_id=1), "X")
+        game.add_connection(FakeWS(user_id=2), "O")
+
+        await game.insert_game("X")
+
+        writer.add.assert_called_once_with(1, 2, 1)
+        MockDAO.assert_not_called()
+
+    @patch("classes.Game.GameDAO")
+    async def test_insert_game_missing_player(self, MockDAO):
+        writer = MagicMock()
+        game = Game(writer=writer)
+        game.add_connection(FakeWS(user_id=1), "X")
+
+        await game.insert_game("X")
+
+        writer.add.assert_not_called()
+
+    @patch("classes.Game.GameDAO")
+    async def test_insert_game_ignores_spectators(self, MockDAO):
+        writer = MagicMock()
+        game = Game(writer=writer)
+        for user_id in range(10, 60):
+            game.add_connection(FakeWS(user_id=user_id), "S")
+        game.add_connection(FakeWS(user_id=1), "X")
+        game.add_connection(FakeWS(user_id=2), "O")
+
+        await game.insert_game("O")
+
+        writer.add.assert_called_once_with(1, 2, 2)
@@ -41,16 +41,73 @@ class TestGameDAO(unittest.TestCase):
         self.assertIsInstance(game_id, int)
 
     def test_get_leaderboard_empty(self):
-        leaderboard = self.lbh.get_leaderboard_file()
-        self.assertIsInstance(leaderboard, str)
-        # self.assertEqual(len(leaderboard), 0)
+        self.lbh.load_scores(self.dao)
+        self.assertEqual(self.lbh.get_leaders(), [])
 
     def test_get_leaderboard_with_games(self):
         self.dao.insert_game(1, 2, 1)
         self.dao.insert_game(1, 2, 0)
         self.dao.insert_game(1, 3, 3)
 
-        self.lbh.set_leaderboard_file(self.dao)
-        leaderboard = self.lbh.get_leaderboard_file()
+        self.lbh.load_scores(self.dao)
+        leaderboard = self.lbh.get_leaders()
         self.assertEqual(leaderboard[0]["username"], "Alice")
         self.assertEqual(leaderboard[0]["points"], 150)
+
+    def test_get_scores_one_row_per_player(self):
+        self.dao.insert_game(1, 2, 1)  # Alice gagne contre Bob
+        self.dao.insert_game(1, 2, 0)  # Nulle Alice / Bob
+        self.dao.insert_game(3, 2, 2)  # Bob gagne contre Charlie
+
+        self.assertEqual(
+            sorted(self.dao.get_scores()),
+            [("Alice", 150), ("Bob", 150), ("Charlie", 0)]
+        )
+
+    def test_get_scores_matches_per_game_results(self):
+        for x, o, w in [(1, 2, 1), (2, 3, 0), (3, 1, 1), (2, 1, 2)]:
+            self.dao.insert_game(x, o, w)
+
+        expected = self.lbh.aggregate_scores(self.dao.get_game_results())
+        self.assertEqual(dict(self.dao.get_scores()), expected)
+
+    def test_get_scores_after_last_game(self):
+        self.assertEqual(self.dao.get_last_game_id(), 0)
+        self.dao.insert_game(1, 2, 1)
+        first = self.dao.get_last_game_id()
+        self.dao.insert_game(3, 2, 0)
+        last = self.dao.get_last_game_id()
+
+        # Seules les parties enregistrées après `first` sont comptées
+        self.assertEqual(
+            sorted(self.dao.get_scores(after=first, until=last)),
+            [("Bob", 50), ("Charlie", 50)]
+        )
+        self.assertEqual(self.dao.get_scores(after=last, until=last), [])
+
+    def test_get_top_players(self):
+        self.dao.insert_game(1, 2, 1)  # Alice gagne contre Bob
+        self.dao.insert_game(1, 2, 0)  # Nulle Alice / Bob
+        self.dao.insert_game(3, 2, 2)  # Bob gagne contre Charlie
+
+        top = self.dao.get_top_players()
+        self.assertEqual(top, [("Alice", 150), ("Bob", 150), ("Charlie", 0)])
+
+    def test_get_top_players_limit(self):
+        self.dao.insert_game(1, 2, 1)
+        self.dao.insert_game(3, 2, 3)
+
+        top = self.dao.get_top_players(limit=2)
+        self.assertEqual(len(top), 2)
+        self.assertEqual([points for _, points in top], [100, 100])
+
+    def test_indexes_created(self):
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            ).fetchall()
+        names = {row[0] for row in rows}
+        self.assertTrue(
+            {"idx_games_playerX", "idx_games_playerO", "idx_games_winner"}
+            <= names
+        )
@@ -1,9 +1,11 @@
 # tests/test_game_routes_simple.py
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 from sanic import Sanic
-from sanic.response import text
 from sanic_testing import TestManager
+from classes.SessionManager import SessionManager
 from routes import game_routes
 
 class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
@@ -13,44 +15,60 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
         self.app = Sanic(f"test-app-{id(self)}")
         TestManager(self.app)
 
+        # Base de données temporaire : tictactoe.db n'est pas modifiée
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.db_dir.cleanup)
+        db_path = os.path.join(self.db_dir.name, "tictactoe.db")
+
         # Register routes
-        game_routes.register_game_routes(self.app)
+        self.sessions = SessionManager(b"secret")
+        game_routes.register_game_routes(
+            self.app, sessions=self.sessions, db_path=db_path
+        )
 
-    @patch("routes.game_routes.render")
+    @patch("classes.TemplateCache.TemplateCache.render")
     async def test_index_with_cookie(self, mock_render):
-        mock_render.return_value = text("fake game page")
+        mock_render.return_value = "fake game page"
 
-        headers = {"cookie": "username=Alice; id=1"}
+        token = self.sessions.issue(1, "Alice")
+        headers = {"cookie": f"session={token}"}
         request, response = await self.app.asgi_client.get("/", headers=headers)
 
-        mock_render.assert_called_with("game.html", context={"username": "Alice"})
+        mock_render.assert_called_with("game.html", {"username": "Alice"})
         self.assertEqual(response.status, 200)
         self.assertEqual(response.text, "fake game page")
 
-    @patch("routes.game_routes.render")
+    @patch("classes.TemplateCache.TemplateCache.render")
+    async def test_index_with_unsigned_cookie(self, mock_render):
+        """Les anciens cookies non signés ne suffisent plus"""
+        mock_render.return_value = "fake login page"
+
+        headers = {"cookie": "username=Alice; id=1; session=forged.token"}
+        await self.app.asgi_client.get("/", headers=headers)
+
+        mock_render.assert_called_with("login.html", {"page": "login"})
+
+    @patch("classes.TemplateCache.TemplateCache.render")
     async def test_index_without_cookie(self, mock_render):
-        mock_render.return_value = text("fake login page")
+        mock_render.return_value = "fake login page"
 
         request, response = await self.app.asgi_client.get("/")
 
-        mock_render.assert_called_with("login.html", context={"page": "login"})
+        mock_render.assert_called_with("login.html", {"page": "login"})
         self.assertEqual(response.status, 200)
         self.assertEqual(response.text, "fake login page")
 
     async def test_leaderboard_get(self):
         leaderboard_data = [{"username": "Alice", "points": 300}]
 
-        with patch.object(game_routes.LeaderboardHelper, "set_leaderboard_file", return_value=None), \
-             patch.object(game_routes.LeaderboardHelper, "get_leaderboard_file", return_value=leaderboard_data), \
-             patch("routes.game_routes.render") as mock_render:
+        with patch.object(game_routes.LeaderboardHelper, "get_leaderboard", return_value=leaderboard_data), \
+             patch("classes.TemplateCache.TemplateCache.render") as mock_render:
 
-            mock_render.return_value = text("leaderboard page")
+            mock_render.return_value = "leaderboard page"
 
             request, response = await self.app.asgi_client.get("/leaderboard")
 
-            mock_render.assert_called_with(
-                "leaderboard.html",
-                context={
+            mock_render.assert_called_with("leaderboard.html", {
                     "leaders": leaderboard_data,
                     "game_result": None,
                     "message": None
@@ -63,17 +81,14 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
         leaderboard_data = [{"username": "Alice", "points": 3}]
         data = {"result_value": "🎉 You WIN!"}
 
-        with patch.object(game_routes.LeaderboardHelper, "set_leaderboard_file", return_value=None), \
-             patch.object(game_routes.LeaderboardHelper, "get_leaderboard_file", return_value=leaderboard_data), \
-             patch("routes.game_routes.render") as mock_render:
+        with patch.object(game_routes.LeaderboardHelper, "get_leaderboard", return_value=leaderboard_data), \
+             patch("classes.TemplateCache.TemplateCache.render") as mock_render:
 
-            mock_render.return_value = text("leaderboard post page")
+            mock_render.return_value = "leaderboard post page"
 
             request, response = await self.app.asgi_client.post("/leaderboard", data=data)
 
-            mock_render.assert_called_with(
-                "leaderboard.html",
-                context={
+            mock_render.assert_called_with("leaderboard.html", {
                     "leaders": leaderboard_data,
                     "game_result": "🎉 You WIN!",
                     "message": None
@@ -85,17 +100,14 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
     async def test_leaderboard_post_without_result(self):
         leaderboard_data = [{"username": "Alice", "points": 300}]
 
-        with patch.object(game_routes.LeaderboardHelper, "set_leaderboard_file", return_value=None), \
-             patch.object(game_routes.LeaderboardHelper, "get_leaderboard_file", return_value=leaderboard_data), \
-             patch("routes.game_routes.render") as mock_render:
+        with patch.object(game_routes.LeaderboardHelper, "get_leaderboard", return_value=leaderboard_data), \
+             patch("classes.TemplateCache.TemplateCache.render") as mock_render:
 
-            mock_render.return_value = text("leaderboard post page")
+            mock_render.return_value = "leaderboard post page"
 
             request, response = await self.app.asgi_client.post("/leaderboard", data={})
 
-            mock_render.assert_called_with(
-                "leaderboard.html",
-                context={
+            mock_render.assert_called_with("leaderboard.html", {
                     "leaders": leaderboard_data,
                     "game_result": None,
                     "message": None
@@ -104,26 +116,23 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(response.status, 200)
             self.assertEqual(response.text, "leaderboard post page")
 
-    async def test_leaderboard_uses_leaderboard_file(self):
+    async def test_leaderboard_uses_memory_leaderboard(self):
         leaderboard_data = [
             {"username": "Alice", "points": 300},
             {"username": "Bob", "points": 100},
         ]
 
-        with patch.object(game_routes.LeaderboardHelper, "set_leaderboard_file", return_value=None), \
-             patch.object(game_routes.LeaderboardHelper, "get_leaderboard_file", return_value=leaderboard_data), \
-             patch("routes.game_routes.render") as mock_render:
+        with patch.object(game_routes.LeaderboardHelper, "get_leaderboard", return_value=leaderboard_data), \
+             patch("classes.TemplateCache.TemplateCache.render") as mock_render:
 
-            mock_render.return_value = text("leaderboard page")
+            mock_render.return_value = "leaderboard page"
 
             request, response = await self.app.asgi_client.get("/leaderboard")
 
-            # Ensure the DAO method was called
-            game_routes.LeaderboardHelper.get_leaderboard_file.assert_called_once()
+            # Ensure the in-memory leaderboard was read
+            game_routes.LeaderboardHelper.get_leaderboard.assert_called_once()
 
-            mock_render.assert_called_with(
-                "leaderboard.html",
-                context={
+            mock_render.assert_called_with("leaderboard.html", {
                     "leaders": leaderboard_data,
                     "game_result": None,
                     "message": None
@@ -132,19 +141,17 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(response.status, 200)
             self.assertEqual(response.text, "leaderboard page")
 
-    @patch("routes.game_routes.render")
-    @patch("routes.game_routes.LeaderboardHelper.get_leaderboard_file")
+    @patch("classes.TemplateCache.TemplateCache.render")
+    @patch("routes.game_routes.LeaderboardHelper.get_leaderboard")
     async def test_leaderboard_file_missing(self, mock_get_file, mock_render):
         message = "Le tableau des meneurs n'est pas disponible en ce moment."
 
         mock_get_file.return_value = message
-        mock_render.return_value = text("leaderboard page")
+        mock_render.return_value = "leaderboard page"
 
         request, response = await self.app.asgi_client.get("/leaderboard")
 
-        mock_render.assert_called_with(
-            "leaderboard.html",
-            context={
+        mock_render.assert_called_with("leaderboard.html", {
                 "leaders": None,
                 "game_result": None,
                 "message": message,
@@ -157,17 +164,14 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
         leaderboard_data = [{"username": "Alice", "points": 500}]
         data = {"result_value": "🎉 Victoire !"}
 
-        with patch.object(game_routes.LeaderboardHelper, "set_leaderboard_file", return_value=None), \
-             patch.object(game_routes.LeaderboardHelper, "get_leaderboard_file", return_value=leaderboard_data), \
-             patch("routes.game_routes.render") as mock_render:
+        with patch.object(game_routes.LeaderboardHelper, "get_leaderboard", return_value=leaderboard_data), \
+             patch("classes.TemplateCache.TemplateCache.render") as mock_render:
 
-            mock_render.return_value = text("leaderboard post page")
+            mock_render.return_value = "leaderboard post page"
 
             request, response = await self.app.asgi_client.post("/leaderboard", data=data)
 
-            mock_render.assert_called_with(
-                "leaderboard.html",
-                context={
+            mock_render.assert_called_with("leaderboard.html", {
                     "leaders": leaderboard_data,
                     "game_result": "🎉 Victoire !",
                     "message": None,
@@ -176,6 +180,167 @@ class TestGameRoutes(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(response.status, 200)
             self.assertEqual(response.text, "leaderboard post page")
 
+    async def test_leaderboard_rendered_once_per_version(self):
+        lbh = game_routes.LeaderboardHelper()
+        lbh.scores = {"Alice": 300}
+        app = Sanic(f"test-app-lb-cache-{id(self)}")
+        TestManager(app)
+        game_routes.register_game_routes(app, lbh)
+
+        with patch("classes.TemplateCache.TemplateCache.render") as mock_render:
+            mock_render.return_value = "leaderboard page"
+
+            await app.asgi_client.get("/leaderboard")
+            await app.asgi_client.get("/leaderboard")
+            self.assertEqual(mock_render.call_count, 1)
+
+            # Une partie terminée change la version : nouveau rendu
+            lbh.record_game([("Bob", "win")])
+            await app.asgi_client.get("/leaderboard")
+            self.assertEqual(mock_render.call_count, 2)
+
+            # Un résultat envoyé par le client n'est jamais mis en cache
+            await app.asgi_client.post(
+                "/leaderboard", data={"result_value": "WIN"}
+            )
+            await app.asgi_client.post(
+                "/leaderboard", data={"result_value": "WIN"}
+            )
+            self.assertEqual(mock_render.call_count, 4)
+
+    async def test_user_and_leaderboard_pages_keep_login_cached(self):
+        """Pages par utilisateur et par version hors du cache LRU"""
+        lbh = game_routes.LeaderboardHelper()
+        lbh.scores = {"Alice": 300}
+        pages = game_routes.TemplateCache(max_entries=2)
+        app = Sanic(f"test-app-lb-lru-{id(self)}")
+        TestManager(app)
+        game_routes.register_game_routes(app, lbh, self.sessions, pages)
+
+        with patch("classes.TemplateCache.TemplateCache.render") as mock_render:
+            mock_render.return_value = "page"
+            await app.asgi_client.get("/")
+
+            for n in range(5):
+                token = self.sessions.issue(n, f"user{n}")
+                await app.asgi_client.get(
+                    "/", headers={"cookie": f"session={token}"}
+                )
+                lbh.record_game([(f"user{n}", "win")])
+                await app.asgi_client.get("/leaderboard")
+
+            calls = mock_render.call_count
+            await app.asgi_client.get("/")
+            self.assertEqual(mock_render.call_count, calls)
+
+        self.assertEqual(len(pages.pages), 1)
+        self.assertEqual(len(pages.latest), 1)
+
+    async def test_leaderboard_api(self):
+        lbh = game_routes.LeaderboardHelper()
+        lbh.scores = {"Alice": 300, "Bob": 100}
+        app = Sanic(f"test-app-lb-api-{id(self)}")
+        TestManager(app)
+        game_routes.register_game_routes(app, lbh)
+
+        _, response = await app.asgi_client.get("/api/leaderboard")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.content_type, "application/json")
+        self.assertEqual(response.json, [
+            {"username": "Alice", "points": 300},
+            {"username": "Bob", "points": 100},
+        ])
+
+        etag = response.headers["ETag"]
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 304)
+
+        lbh.record_game([("Bob", "win")] * 3)
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.json[0], {"username": "Bob", "points": 400})
+
+    @patch("routes.game_routes.LeaderboardHelper.get_leaderboard")
+    async def test_leaderboard_api_unavailable(self, mock_get):
+        mock_get.return_value = "indisponible"
+
+        _, response = await self.app.asgi_client.get("/api/leaderboard")
+        self.assertEqual(response.status, 503)
+        self.assertEqual(response.json, {"message": "indisponible"})
+
+    def ranked_app(self):
+        lbh = game_routes.LeaderboardHelper()
+        lbh.scores = {f"user{i:03}": i * 50 for i in range(120)}
+        app = Sanic(f"test-app-lb-ranks-{id(self)}")
+        TestManager(app)
+        game_routes.register_game_routes(app, lbh)
+        return app
+
+    async def test_leaderboard_ranks_pagination(self):
+        app = self.ranked_app()
+
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard/ranks?start=101&count=15"
+        )
+        self.assertEqual(response.status, 200)
+        data = response.json
+        self.assertEqual(data["total"], 120)
+        self.assertEqual(data["next"], 116)
+        self.assertEqual(len(data["players"]), 15)
+        self.assertEqual(
+            data["players"][0],
+            {"rank": 101, "username": "user019", "points": 950}
+        )
+
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard/ranks?start=116&count=10"
+        )
+        self.assertEqual(len(response.json["players"]), 5)
+        self.assertIsNone(response.json["next"])
+
+        _, response = await app.asgi_client.get("/api/leaderboard/ranks")
+        self.assertEqual(response.json["players"][0]["username"], "user119")
+
+    async def test_leaderboard_ranks_invalid_params(self):
+        app = self.ranked_app()
+        for query in ("start=0", "count=101", "count=abc"):
+            _, response = await app.asgi_client.get(
+                f"/api/leaderboard/ranks?{query}"
+            )
+            self.assertEqual(response.status, 400)
+
+    async def test_leaderboard_player_rank_window(self):
+        app = self.ranked_app()
+
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard/players/user100?around=2"
+        )
+        self.assertEqual(response.status, 200)
+        data = response.json
+        self.assertEqual(data["rank"], 20)
+        self.assertEqual(data["points"], 5000)
+        self.assertEqual(
+            [player["rank"] for player in data["players"]],
+            [18, 19, 20, 21, 22]
+        )
+
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard/players/user119?around=3"
+        )
+        self.assertEqual(
+            [player["rank"] for player in response.json["players"]],
+            [1, 2, 3, 4]
+        )
+
+        _, response = await app.asgi_client.get(
+            "/api/leaderboard/players/nobody"
+        )
+        self.assertEqual(response.status, 404)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,222 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from classes.GameDAO import GameDAO
+from classes.GameWriter import GameWriter
+from classes.LeaderboardHelper import LeaderboardHelper
+
+
+class TestGameWriter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # Fichier temporaire pour la base de données
+        self.db_file = tempfile.NamedTemporaryFile(delete=True)
+        self.db_path = self.db_file.name
+        self.db_file.close()
+
+        GameDAO(self.db_path)
+
+    def count_games(self):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    async def test_add_does_not_write_immediately(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=60)
+        writer.add(1, 2, 1)
+
+        self.assertEqual(writer.stats()["queue_depth"], 1)
+        self.assertEqual(self.count_games(), 0)
+        await writer.close()
+
+    async def test_flush_writes_batch(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=60)
+        writer.add(1, 2, 1)
+        writer.add(1, 2, 0)
+        writer.add(2, 1, 2)
+
+        written = await writer.flush()
+
+        self.assertEqual(written, 3)
+        self.assertEqual(self.count_games(), 3)
+        stats = writer.stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["flush_count"], 1)
+        self.assertEqual(stats["games_written"], 3)
+
+    async def test_flush_on_batch_size(self):
+        writer = GameWriter(self.db_path, max_batch=2, max_delay=60)
+        writer.add(1, 2, 1)
+        writer.add(1, 2, 2)
+        await asyncio.gather(*writer._tasks)
+
+        self.assertEqual(self.count_games(), 2)
+
+    async def test_flush_on_delay(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=0.01)
+        writer.add(1, 2, 1)
+        await asyncio.sleep(0.05)
+        await asyncio.gather(*writer._tasks)
+
+        self.assertEqual(self.count_games(), 1)
+
+    async def test_close_flushes_pending(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=60)
+        writer.add(1, 2, 1)
+        await writer.close()
+
+        self.assertEqual(self.count_games(), 1)
+        self.assertIsNone(writer._timer)
+
+    async def test_flush_error_requeues(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=60)
+        writer.add(1, 2, 1)
+
+        with patch.object(
+            GameDAO, "insert_games", side_effect=sqlite3.OperationalError
+        ):
+            written = await writer.flush()
+
+        self.assertEqual(written, 0)
+        self.assertEqual(writer.pending, [(1, 2, 1)])
+        await writer.close()
+        self.assertEqual(self.count_games(), 1)
+
+    async def test_flush_error_schedules_retry_with_backoff(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=0.01,
+                            max_retry_delay=0.02)
+        writer.add(1, 2, 1)
+
+        with patch.object(
+            GameDAO, "insert_games", side_effect=sqlite3.OperationalError
+        ):
+            await writer.flush()
+            self.assertEqual(writer._retry_delay, 0.01)
+            self.assertIsNotNone(writer._timer)
+            await writer.flush()
+            await writer.flush()
+            self.assertEqual(writer._retry_delay, 0.02)
+
+        # La tentative planifiée écrit la partie, sans nouvel ajout
+        await asyncio.sleep(0.05)
+        await asyncio.gather(*writer._tasks)
+
+        self.assertEqual(self.count_games(), 1)
+        self.assertIsNone(writer._retry_delay)
+        await writer.close()
+
+    async def test_no_immediate_flush_while_retrying(self):
+        writer = GameWriter(self.db_path, max_batch=2, max_delay=60)
+        writer.add(1, 2, 1)
+
+        with patch.object(
+            GameDAO, "insert_games", side_effect=sqlite3.OperationalError
+        ):
+            await writer.flush()
+
+        writer.add(1, 2, 2)
+        self.assertEqual(writer._tasks, set())
+        self.assertEqual(len(writer.pending), 2)
+        await writer.close()
+
+    async def test_pending_is_capped(self):
+        writer = GameWriter(self.db_path, max_batch=100, max_delay=60,
+                            max_pending=3)
+        for winner in range(5):
+            writer.add(1, 2, winner)
+
+        self.assertEqual(writer.pending, [(1, 2, 2), (1, 2, 3), (1, 2, 4)])
+        self.assertEqual(writer.stats()["games_dropped"], 2)
+        await writer.close()
+
+    async def test_requeue_is_capped(self):
+        writer = GameWriter(self.db_path, max_batch=100, max_delay=60,
+                            max_pending=2)
+        writer.add(1, 2, 1)
+        writer.add(1, 2, 2)
+
+        with patch.object(
+            GameDAO, "insert_games", side_effect=sqlite3.OperationalError
+        ):
+            flush = asyncio.ensure_future(writer.flush())
+            await asyncio.sleep(0)
+            self.assertEqual(writer.pending, [])
+            writer.add(1, 2, 0)  # Ajoutée pendant l'écriture
+            await flush
+
+        # La partie la plus ancienne est abandonnée
+        self.assertEqual(writer.pending, [(1, 2, 2), (1, 2, 0)])
+        self.assertEqual(writer.games_dropped, 1)
+        await writer.close()
+
+    async def test_flush_rejected_batch_is_dropped(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=60)
+        writer.add(None, 2, 0)  # playerX NOT NULL
+
+        written = await writer.flush()
+
+        self.assertEqual(written, 0)
+        self.assertEqual(writer.pending, [])
+        self.assertEqual(self.count_games(), 0)
+        self.assertEqual(writer.stats()["games_rejected"], 1)
+
+    async def test_flush_rejected_batch_keeps_valid_games(self):
+        writer = GameWriter(self.db_path, max_batch=10, max_delay=60)
+        writer.add(1, 2, 1)
+        writer.add(None, 2, 0)  # playerX NOT NULL
+        writer.add(2, 1, 0)
+
+        written = await writer.flush()
+
+        self.assertEqual(written, 2)
+        self.assertEqual(writer.pending, [])
+        self.assertEqual(self.count_games(), 2)
+        self.assertEqual(writer.stats()["games_rejected"], 1)
+
+    async def test_on_write_called_with_written_games(self):
+        written = []
+        writer = GameWriter(
+            self.db_path, max_batch=10, max_delay=60, on_write=written.append
+        )
+        writer.add(None, 2, 0)  # playerX NOT NULL
+        await writer.flush()
+        self.assertEqual(written, [])
+
+        writer.add(1, 2, 1)
+        writer.add(None, 2, 0)
+        await writer.flush()
+        self.assertEqual(written, [1])
+
+    async def test_leaderboard_counts_only_written_games(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO users (username, password) VALUES (?, '')",
+                [("Alice",), ("Bob",)]
+            )
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        lbh = LeaderboardHelper(
+            os.path.join(tmp.name, "leaderboard.json"), self.db_path
+        )
+        await lbh.get_leaderboard()
+        writer = GameWriter(
+            self.db_path, max_batch=10, max_delay=60,
+            on_write=lambda written: lbh.schedule_refresh()
+        )
+
+        writer.add(1, 2, 1)
+        writer.add(None, 2, 0)  # Partie refusée : jamais comptée
+        self.assertEqual(lbh.scores, {})
+
+        await writer.flush()
+        await lbh.stop()
+
+        self.assertEqual(lbh.scores, {"Alice": 100, "Bob": 0})
+        await lbh.persist_leaderboard()  # Écriture lancée par la lecture
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+from classes.BitboardGame import BitboardGame
+from classes.GridGame import GridGame, create_game, parse_options
+
+
+class TestGridGame(unittest.TestCase):
+
+    def setUp(self):
+        self.game = GridGame(size=15, win_length=5)
+
+    ### Tests pour la configuration ###
+    def test_new_game_board_size(self):
+        self.assertEqual(len(self.game.board), 225)
+        self.assertEqual(self.game.board_state(), "," * 224 + "|X")
+
+    def test_default_win_length_is_size(self):
+        game = GridGame(size=4)
+        self.assertEqual(game.win_length, 4)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            GridGame(size=2)
+        with self.assertRaises(ValueError):
+            GridGame(size=GridGame.MAX_SIZE + 1)
+        with self.assertRaises(ValueError):
+            GridGame(size=5, win_length=6)
+        with self.assertRaises(ValueError):
+            GridGame(size=5, win_length=2)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.game, "__dict__"))
+
+    ### Tests pour line_table() ###
+    def test_line_table_is_shared(self):
+        other = GridGame(size=15, win_length=5)
+        self.assertIs(self.game.lines, other.lines)
+
+    def test_line_table_corner(self):
+        row, column, diagonal, anti_diagonal = self.game.lines[0]
+
+        self.assertEqual(row, ((), (1, 2, 3, 4)))
+        self.assertEqual(column, ((), (15, 30, 45, 60)))
+        self.assertEqual(diagonal, ((), (16, 32, 48, 64)))
+        self.assertEqual(anti_diagonal, ((), ()))
+
+    def test_line_table_is_bounded_by_win_length(self):
+        for before, after in self.game.lines[112]:  # Case centrale
+            self.assertEqual(len(before), 4)
+            self.assertEqual(len(after), 4)
+
+    ### Tests pour validate_move() ###
+    def test_validate_move_range(self):
+        self.assertEqual(self.game.validate_move("X", "224"), 224)
+        self.assertIsNone(self.game.validate_move("X", 225))
+        self.assertIsNone(self.game.validate_move("X", -1))
+        self.assertIsNone(self.game.validate_move("X", "abc"))
+
+    def test_validate_move_rules(self):
+        self.assertIsNone(self.game.validate_move("S", 3))
+        self.assertIsNone(self.game.validate_move("O", 3))
+
+        self.game.play_move(3, "X")
+        self.assertIsNone(self.game.validate_move("X", 3))
+
+    ### Tests pour winner() ###
+    def play(self, cells, player):
+        for cell in cells:
+            self.game.play_move(cell, player)
+
+    def test_winner_row(self):
+        self.play((20, 21, 22, 23), "X")
+        self.assertIsNone(self.game.winner())
+
+        self.play((24,), "X")
+        self.assertEqual(self.game.winner(), "X")
+
+    def test_winner_from_middle_of_line(self):
+        self.play((0, 30, 45, 60), "O")
+        self.assertIsNone(self.game.winner())
+
+        self.play((15,), "O")
+        self.assertEqual(self.game.winner(), "O")
+
+    def test_winner_diagonals(self):
+        self.play((16, 32, 48, 64, 80), "X")
+        self.assertEqual(self.game.winner(), "X")
+
+        self.game.reset_game()
+        self.play((14, 28, 42, 56, 70), "O")
+        self.assertEqual(self.game.winner(), "O")
+
+    def test_no_wrap_around_rows(self):
+        # Cases 12 à 16 : fin du rang 0 et début du rang 1
+        self.play((12, 13, 14, 15, 16), "X")
+        self.assertIsNone(self.game.winner())
+
+    def test_winner_ignores_other_symbol(self):
+        self.play((0, 1, 3, 4), "X")
+        self.play((2,), "O")
+        self.assertIsNone(self.game.winner())
+
+    def test_winner_after_board_assignment(self):
+        board = [""] * 225
+        for cell in (100, 101, 102, 103, 104):
+            board[cell] = "O"
+        self.game.board = board
+
+        self.assertEqual(self.game.winner(), "O")
+        self.assertEqual(self.game.check_winner(board), "O")
+
+    def test_classic_board(self):
+        game = GridGame(size=3)
+        board = ["X","O","X","X","O","O","O","X","X"]
+
+        self.assertIsNone(game.check_winner(board))
+        self.assertEqual(
+            game.check_winner(["","","X","","X","","X","O","O"]), "X"
+        )
+
+    def test_delta_message(self):
+        self.play((200,), "X")
+        self.game.current_player = "O"
+
+        self.assertEqual(self.game.delta_message().text, "D|1|200|X|O")
+
+    ### Tests pour is_full() ###
+    def test_is_full(self):
+        game = GridGame(size=3)
+        for cell in range(8):
+            game.play_move(cell, "X" if cell % 2 else "O")
+        self.assertFalse(game.is_full())
+
+        game.play_move(8, "O")
+        self.assertTrue(game.is_full())
+
+    ### Tests pour reset_game() ###
+    def test_reset_game(self):
+        self.play((0, 1), "X")
+        self.game.current_player = "O"
+
+        self.game.reset_game()
+
+        self.assertEqual(self.game.board, [""] * 225)
+        self.assertEqual(self.game.current_player, "X")
+        self.assertIsNone(self.game.last_move)
+        self.assertEqual(self.game.moves, 0)
+
+
+class TestCreateGame(unittest.TestCase):
+
+    def test_classic_board_uses_bitboard(self):
+        self.assertIsInstance(create_game(), BitboardGame)
+        self.assertIsInstance(create_game(3, 3), BitboardGame)
+
+    def test_other_board_uses_grid(self):
+        game = create_game(size=15, win_length=5, writer="writer")
+
+        self.assertIsInstance(game, GridGame)
+        self.assertEqual(game.size, 15)
+        self.assertEqual(game.win_length, 5)
+        self.assertEqual(game.writer, "writer")
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            create_game(size=50)
+
+    def test_parse_options(self):
+        self.assertEqual(parse_options({}), {})
+        self.assertEqual(
+            parse_options({"size": "15", "win": "5"}),
+            {"size": 15, "win_length": 5}
+        )
+        with self.assertRaises(ValueError):
+            parse_options({"size": "abc"})
+
+
+if __name__ == "__main__":
+    unittest.main()
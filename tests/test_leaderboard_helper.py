@@ -0,0 +1,292 @@
+import asyncio
+import json
+import os
+import tempfile
+import random
+import sqlite3
+import unittest
+from unittest.mock import MagicMock, patch
+
+from classes.Game import Game
+from classes.GameDAO import GameDAO
+from classes.GameWriter import GameWriter
+from classes.LeaderboardHelper import LeaderboardHelper
+
+
+class TestLeaderboardHelper(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        # Fichier temporaire pour le leaderboard
+        self.lb_file = tempfile.NamedTemporaryFile(delete=True)
+        self.lb_path = self.lb_file.name
+        self.lb_file.close()
+
+        self.dao = MagicMock()
+        self.dao.get_scores.return_value = [("Alice", 150), ("Bob", 50)]
+        self.dao.get_last_game_id.return_value = 4
+        self.lbh = LeaderboardHelper(self.lb_path)
+
+    def tearDown(self):
+        if os.path.exists(self.lb_path):
+            os.remove(self.lb_path)
+
+    def test_score_game(self):
+        self.assertEqual(self.lbh.score_game(("A", "win")), ("A", 100))
+        self.assertEqual(self.lbh.score_game(("A", "draw")), ("A", 50))
+        self.assertEqual(self.lbh.score_game(("A", "loss")), ("A", 0))
+
+    def test_score_game_unknown_result(self):
+        self.assertEqual(self.lbh.score_game(("A", "???")), ("A", 0))
+
+    def test_aggregate_scores_matches_per_game_sum(self):
+        players = [f"user{i}" for i in range(50)]
+        results = ["win", "draw", "loss"]
+        games = [
+            (random.choice(players), random.choice(results))
+            for _ in range(2000)
+        ]
+
+        expected = {}
+        for player, points in map(self.lbh.score_game, games):
+            expected[player] = expected.get(player, 0) + points
+        self.assertEqual(self.lbh.aggregate_scores(games), expected)
+
+    def test_aggregate_scores_updates_in_place(self):
+        scores = {"Alice": 100}
+        result = self.lbh.aggregate_scores([("Alice", "draw")], scores)
+
+        self.assertIs(result, scores)
+        self.assertEqual(scores["Alice"], 150)
+
+    def test_load_scores(self):
+        self.lbh.load_scores(self.dao)
+        self.assertEqual(self.lbh.scores, {"Alice": 150, "Bob": 50})
+        self.assertEqual(self.lbh.last_game_id, 4)
+
+    async def test_get_leaderboard_loads_once(self):
+        first = await self.lbh.get_leaderboard(self.dao)
+        second = await self.lbh.get_leaderboard(self.dao)
+
+        self.assertEqual(first, second)
+        self.dao.get_scores.assert_called_once()
+        self.assertEqual(first[0], {"username": "Alice", "points": 150})
+
+    async def test_get_leaderboard_database_error(self):
+        self.dao.get_scores.side_effect = sqlite3.OperationalError
+        result = await self.lbh.get_leaderboard(self.dao)
+        self.assertEqual(result, LeaderboardHelper.message)
+        self.assertIsNone(self.lbh.scores)
+
+    async def test_refresh_reads_new_games_only(self):
+        self.lbh.load_scores(self.dao)
+        self.dao.get_scores.assert_called_once_with(
+            until=4, win=100, draw=50, loss=0
+        )
+
+        version = self.lbh.version
+
+        # Aucune nouvelle partie : les scores ne sont pas relus
+        self.assertFalse(await self.lbh.refresh(self.dao))
+        self.assertEqual(self.dao.get_scores.call_count, 1)
+        self.assertEqual(self.lbh.version, version)
+
+        self.dao.get_last_game_id.return_value = 6
+        self.dao.get_scores.return_value = [("Bob", 200), ("Carol", 50)]
+        self.assertTrue(await self.lbh.refresh(self.dao))
+
+        self.dao.get_scores.assert_called_with(
+            after=4, until=6, win=100, draw=50, loss=0
+        )
+        self.assertEqual(self.lbh.last_game_id, 6)
+        self.assertEqual(
+            self.lbh.scores, {"Alice": 150, "Bob": 250, "Carol": 50}
+        )
+        self.assertEqual(self.lbh.get_rank("Bob"), 1)
+        self.assertEqual(self.lbh.version, version + 1)
+
+    async def test_refresh_before_load_is_ignored(self):
+        self.assertFalse(await self.lbh.refresh(self.dao))
+        self.dao.get_scores.assert_not_called()
+
+    def test_record_game_before_load_is_ignored(self):
+        updated = self.lbh.record_game([("Alice", "win"), ("Bob", "loss")])
+        self.assertFalse(updated)
+        self.assertIsNone(self.lbh.scores)
+
+    def test_version_changes_with_scores(self):
+        self.assertEqual(self.lbh.version, 0)
+        self.lbh.record_game([("Alice", "win")])
+        self.assertEqual(self.lbh.version, 0)
+
+        self.lbh.load_scores(self.dao)
+        self.lbh.record_game([("Alice", "win")])
+        self.assertEqual(self.lbh.version, 2)
+
+    async def test_record_game_updates_scores_and_file(self):
+        self.lbh.load_scores(self.dao)
+        self.assertTrue(
+            self.lbh.record_game([("Bob", "win"), ("Carol", "loss")])
+        )
+        self.lbh.record_game([("Bob", "win"), ("Carol", "draw")])
+        await self.lbh.persist_leaderboard()
+
+        self.assertEqual(self.lbh.scores["Bob"], 250)
+        self.assertEqual(self.lbh.scores["Carol"], 50)
+        self.dao.get_scores.assert_called_once()
+
+        with open(self.lb_path) as f:
+            data = json.load(f)
+        self.assertEqual(data[0], {"username": "Bob", "points": 250})
+
+    def test_snapshot_serialized_once_per_version(self):
+        self.lbh.load_scores(self.dao)
+        first = self.lbh.snapshot()
+
+        self.assertIs(self.lbh.snapshot(), first)
+        self.assertEqual(json.loads(first.body), first.leaders)
+        self.assertEqual(first.version, self.lbh.version)
+
+        self.lbh.record_game([("Bob", "win"), ("Bob", "win")])
+        second = self.lbh.snapshot()
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second.etag, first.etag)
+        self.assertEqual(second.leaders[0], {"username": "Bob", "points": 250})
+
+    async def test_get_leaderboard_uses_snapshot(self):
+        leaders = await self.lbh.get_leaderboard(self.dao)
+        self.assertIs(leaders, self.lbh.snapshot().leaders)
+
+    async def test_persist_coalesces_versions(self):
+        self.lbh.load_scores(self.dao)
+
+        with patch.object(
+            self.lbh, "_write_file", wraps=self.lbh._write_file
+        ) as write:
+            for _ in range(20):
+                self.lbh.record_game([("Carol", "win")])
+                task = self.lbh.schedule_persist()
+            await task
+
+            # Rien à écrire : le fichier est à jour
+            await self.lbh.persist_leaderboard()
+
+        self.assertLessEqual(write.call_count, 2)
+        with open(self.lb_path, "rb") as f:
+            self.assertEqual(f.read(), self.lbh.snapshot().body)
+
+    def test_write_file_is_atomic(self):
+        directory = os.path.dirname(self.lb_path)
+        before = set(os.listdir(directory))
+
+        with patch("classes.LeaderboardHelper.os.replace",
+                   side_effect=OSError("disque plein")):
+            self.lbh._write_file(b'[{"username": "A", "points": 1}]')
+
+        # Le fichier temporaire est supprimé après l'échec
+        self.assertEqual(set(os.listdir(directory)) - before, set())
+
+        self.lbh._write_file(b'[{"username": "A", "points": 1}]')
+        with open(self.lb_path) as f:
+            self.assertEqual(json.load(f), [{"username": "A", "points": 1}])
+
+    def test_get_leaders_top_and_ties(self):
+        self.lbh.scores = {"b": 100, "a": 100, "c": 300, "d": 0}
+        leaders = self.lbh.get_leaders(3)
+
+        self.assertEqual(
+            [leader["username"] for leader in leaders], ["c", "a", "b"]
+        )
+
+    def test_ranks_follow_recorded_games(self):
+        self.lbh.load_scores(self.dao)
+        self.assertEqual(self.lbh.get_rank("Bob"), 2)
+
+        self.lbh.record_game(
+            [("Bob", "win"), ("Bob", "win"), ("Carol", "loss")]
+        )
+        self.assertEqual(self.lbh.get_rank("Bob"), 1)
+        self.assertEqual(self.lbh.get_rank("Carol"), 3)
+        self.assertIsNone(self.lbh.get_rank("Nobody"))
+
+        self.assertEqual(self.lbh.get_ranks(2, 5), [
+            {"rank": 2, "username": "Alice", "points": 150},
+            {"rank": 3, "username": "Carol", "points": 0},
+        ])
+
+    def test_get_leaders_limit(self):
+        self.lbh.scores = {f"user{i}": i for i in range(20)}
+        self.assertEqual(len(self.lbh.get_leaders()), 10)
+
+
+# Faux websocket d'un joueur connecté
+class FakeWS:
+    def __init__(self, user_id, username):
+        self.user_id = user_id
+        self.username = username
+
+
+class TestSharedLeaderboard(unittest.IsolatedAsyncioTestCase):
+    """Deux workers partageant la même base de données."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, "games.db")
+        GameDAO(self.db_path)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT INTO users (username, password) VALUES (?, '')",
+                [("Alice",), ("Bob",)]
+            )
+
+        self.workers = [
+            LeaderboardHelper(
+                os.path.join(self.tmp.name, f"leaderboard{n}.json"),
+                self.db_path, refresh_interval=0.01
+            )
+            for n in (1, 2)
+        ]
+
+    async def asyncTearDown(self):
+        for lbh in self.workers:
+            await lbh.stop()
+
+    async def test_game_finished_on_other_worker_is_seen(self):
+        lbh1, lbh2 = self.workers
+        for lbh in self.workers:
+            await lbh.get_leaderboard()
+
+        # Partie terminée sur le premier worker
+        writer = GameWriter(self.db_path)
+        game = Game(leaderboard=lbh1, writer=writer)
+        game.add_connection(FakeWS(1, "Alice"), "X")
+        game.add_connection(FakeWS(2, "Bob"), "O")
+        await game.insert_game("X")
+        await writer.flush()
+
+        self.assertTrue(await lbh2.refresh())
+        self.assertEqual(lbh2.get_leaders()[0], {
+            "username": "Alice", "points": 100
+        })
+
+        # La partie n'est comptée qu'une fois par chaque worker
+        self.assertTrue(await lbh1.refresh())
+        self.assertFalse(await lbh1.refresh())
+        self.assertEqual(lbh1.scores, {"Alice": 100, "Bob": 0})
+        self.assertEqual(lbh1.snapshot().etag, lbh2.snapshot().etag)
+
+    async def test_periodic_refresh_updates_file(self):
+        lbh = self.workers[1]
+        await lbh.get_leaderboard()
+        lbh.start()
+
+        GameDAO(self.db_path).insert_game(1, 2, 0)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(lbh.scores, {"Alice": 50, "Bob": 50})
+        with open(lbh.file_path) as f:
+            self.assertEqual(json.load(f)[0]["points"], 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+
+from classes.LocalBackplane import LocalBackplane, LocalHub
+
+
+class TestLocalBackplane(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.hub = LocalHub()
+        self.w1 = LocalBackplane(self.hub, "w1")
+        self.w2 = LocalBackplane(self.hub, "w2")
+
+    async def test_publish_to_worker(self):
+        received = []
+
+        async def handler(message):
+            received.append(message)
+
+        self.w2.subscribe(handler)
+        await self.w2.start()
+
+        self.assertTrue(await self.w1.publish("w2", {"type": "send"}))
+        await asyncio.sleep(0.01)
+        await self.w2.close()
+
+        self.assertEqual(received, [{"type": "send"}])
+
+    async def test_publish_to_unknown_worker(self):
+        self.assertFalse(await self.w1.publish("w3", {"type": "send"}))
+
+    async def test_claim_and_release(self):
+        self.assertEqual(await self.w1.claim("room"), "w1")
+        self.assertEqual(await self.w2.claim("room"), "w1")
+
+        # Seul le propriétaire peut libérer la salle
+        await self.w2.release("room")
+        self.assertEqual(await self.w2.claim("room"), "w1")
+
+        await self.w1.release("room")
+        self.assertEqual(await self.w2.claim("room"), "w2")
+
+    async def test_close_releases_rooms(self):
+        await self.w1.claim("a")
+        await self.w1.claim("b")
+        await self.w1.close()
+
+        self.assertNotIn("w1", self.hub.workers)
+        self.assertEqual(self.hub.owners, {})
+
+    def test_default_hub_is_private(self):
+        self.assertIsNot(LocalBackplane().hub, LocalBackplane().hub)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
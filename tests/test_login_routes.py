@@ -1,9 +1,11 @@
 # tests/test_login_routes.py
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, AsyncMock, MagicMock
 from sanic import Sanic
-from sanic.response import text, redirect
 from sanic_testing import TestManager
+from classes.SessionManager import SessionManager
 from routes import login_routes
 
 class TestLoginRoutes(unittest.IsolatedAsyncioTestCase):
@@ -13,81 +15,123 @@ class TestLoginRoutes(unittest.IsolatedAsyncioTestCase):
         self.app = Sanic(f"test-app-login-{id(self)}")
         TestManager(self.app)
 
+        # Base de données temporaire : tictactoe.db n'est pas modifiée
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.db_dir.cleanup)
+        self.db_path = os.path.join(self.db_dir.name, "tictactoe.db")
+
         # Enregistre les routes avec page de login fictive
-        login_routes.register_login_routes(self.app)
+        self.sessions = SessionManager(b"secret")
+        login_routes.register_login_routes(
+            self.app, self.sessions, db_path=self.db_path
+        )
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
-    async def test_login_get(self, mock_render):
-        mock_render.return_value = text("login page")
+    async def test_login_get(self):
         _, response = await self.app.asgi_client.get("/login")
 
-        mock_render.assert_awaited_with("login.html", context={"page": "login"})
         self.assertEqual(response.status, 200)
-        self.assertEqual(response.text, "login page")
+        self.assertIn('action="/login"', response.text)
+        self.assertIn("ETag", response.headers)
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
     @patch("routes.login_routes.UserDAO.get_user")
-    async def test_login_post_success(self, mock_get_user, mock_render):
+    async def test_login_post_success(self, mock_get_user):
         mock_get_user.return_value = {"id": 1, "username": "Alice"}
 
-        # Le render ne doit pas être appelé si connexion OK
-        mock_render.return_value = text("unused")
         data = {"username": "Alice", "password": "1234"}
 
         _, response = await self.app.asgi_client.post("/login", data=data)
 
         self.assertEqual(response.status, 302)
         self.assertIn("/" , response.headers["location"])
-        self.assertEqual(response.cookies["username"], "Alice")
-        self.assertEqual(response.cookies["id"], "1")
+        self.assertEqual(
+            self.sessions.verify(response.cookies["session"]),
+            {"id": 1, "username": "Alice"}
+        )
+        self.assertNotIn("username", response.cookies)
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
     @patch("routes.login_routes.UserDAO.get_user")
-    async def test_login_post_failure_wrong_credentials(self, mock_get_user, mock_render):
+    async def test_login_post_failure_wrong_credentials(self, mock_get_user):
         mock_get_user.return_value = None
-        mock_render.return_value = text("login failed page")
 
         data = {"username": "Bob", "password": "wrong"}
         _, response = await self.app.asgi_client.post("/login", data=data)
 
-        mock_render.assert_awaited()
         self.assertEqual(response.status, 200)
-        self.assertEqual(response.text, "login failed page")
+        self.assertIn('action="/login"', response.text)
+        self.assertIn('id="modal"', response.text)
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
-    async def test_login_post_failure_missing_fields(self, mock_render):
-        mock_render.return_value = text("login failed page")
+    async def test_login_post_failure_missing_fields(self):
 
         # username manquant
         data = {"password": "1234"}
         _, response = await self.app.asgi_client.post("/login", data=data)
 
-        mock_render.assert_awaited()
         self.assertEqual(response.status, 200)
-        self.assertEqual(response.text, "login failed page")
+        self.assertIn('action="/login"', response.text)
+        self.assertIn('id="modal"', response.text)
+
+    async def test_login_get_not_modified(self):
+        """La page est revalidée avec son ETag (réponse 304)"""
+        _, first = await self.app.asgi_client.get("/login")
+        etag = first.headers["ETag"]
+
+        _, response = await self.app.asgi_client.get(
+            "/login", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.body, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        # Les pages de login et d'inscription ont des ETag différents
+        _, response = await self.app.asgi_client.get(
+            "/register", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    async def test_login_get_served_from_memory(self):
+        with patch("classes.TemplateCache.TemplateCache.render",
+                   autospec=True, side_effect=lambda self, name, context:
+                   "page") as render:
+            pages = login_routes.TemplateCache()
+            app = Sanic(f"test-app-login-cache-{id(self)}")
+            TestManager(app)
+            login_routes.register_login_routes(
+                app, self.sessions, pages, self.db_path
+            )
+
+            for _ in range(3):
+                _, response = await app.asgi_client.get("/login")
+                self.assertEqual(response.text, "page")
+
+        self.assertEqual(render.call_count, 1)
 
     async def test_logout(self):
-        _, response = await self.app.asgi_client.get("/logout")
+        token = self.sessions.issue(1, "Alice")
+        headers = {"cookie": f"session={token}"}
+
+        _, response = await self.app.asgi_client.get("/logout", headers=headers)
         self.assertEqual(response.status, 302)
         self.assertIn("/login", response.headers["location"])
-        self.assertNotIn("username", response.cookies)
-        self.assertNotIn("id", response.cookies)
+        self.assertNotIn("session", response.cookies)
+        # Le jeton est révoqué, même s'il est présenté de nouveau
+        self.assertIsNone(self.sessions.verify(token))
+
+    async def test_logout_without_session(self):
+        _, response = await self.app.asgi_client.get("/logout")
+        self.assertEqual(response.status, 302)
 
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
-    async def test_register_get(self, mock_render):
-        mock_render.return_value = text("register page")
+    async def test_register_get(self):
         _, response = await self.app.asgi_client.get("/register")
 
-        mock_render.assert_awaited_with("login.html", context={"page": "register"})
         self.assertEqual(response.status, 200)
-        self.assertEqual(response.text, "register page")
+        self.assertIn('action="/register"', response.text)
+        self.assertIn("ETag", response.headers)
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
     @patch("routes.login_routes.UserDAO.insert_user")
-    async def test_register_post_success(self, mock_insert_user, mock_render):
+    async def test_register_post_success(self, mock_insert_user):
         mock_insert_user.return_value = 5
-        mock_render.return_value = text("unused")
 
         data = {"username": "NewUser", "password": "1234", "password2": "1234"}
         _, response = await self.app.asgi_client.post("/register", data=data)
@@ -95,29 +139,25 @@ class TestLoginRoutes(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(response.status, 302)
         self.assertIn("/login", response.headers["location"])
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
     @patch("routes.login_routes.UserDAO.insert_user")
-    async def test_register_post_failure_existing_user(self, mock_insert_user, mock_render):
+    async def test_register_post_failure_existing_user(self, mock_insert_user):
         mock_insert_user.return_value = 0
-        mock_render.return_value = text("register failed page")
 
         data = {"username": "ExistingUser", "password": "1234", "password2": "1234"}
         _, response = await self.app.asgi_client.post("/register", data=data)
 
-        mock_render.assert_awaited()
         self.assertEqual(response.status, 200)
-        self.assertEqual(response.text, "register failed page")
+        self.assertIn('action="/register"', response.text)
+        self.assertIn('id="modal"', response.text)
 
-    @patch("routes.login_routes.render", new_callable=AsyncMock)
-    async def test_register_post_failure_invalid_input(self, mock_render):
-        mock_render.return_value = text("register failed page")
+    async def test_register_post_failure_invalid_input(self):
         # mot de passe trop court ou mismatch
         data = {"username": "aa", "password": "1", "password2": "2"}
         _, response = await self.app.asgi_client.post("/register", data=data)
 
-        mock_render.assert_awaited()
         self.assertEqual(response.status, 200)
-        self.assertEqual(response.text, "register failed page")
+        self.assertIn('action="/register"', response.text)
+        self.assertIn('id="modal"', response.text)
 
 
 if __name__ == "__main__":
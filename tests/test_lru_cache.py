@@ -0,0 +1,70 @@
+import threading
+import unittest
+
+from classes.LRUCache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LRUCache(maxsize=2)
+
+    def test_get_missing_returns_default(self):
+        self.assertIsNone(self.cache.get("absent"))
+        self.assertEqual(self.cache.get("absent", 0), 0)
+
+    def test_put_and_get(self):
+        self.cache.put("a", 1)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIn("a", self.cache)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        # "a" devient le plus récent
+        self.cache.get("a")
+        self.cache.put("c", 3)
+
+        self.assertIn("a", self.cache)
+        self.assertNotIn("b", self.cache)
+        self.assertIn("c", self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_put_replaces_value(self):
+        self.cache.put("a", 1)
+        self.cache.put("a", 2)
+        self.assertEqual(self.cache.get("a"), 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_pop_and_clear(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.pop("a")
+        self.cache.pop("absent")
+        self.assertNotIn("a", self.cache)
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_concurrent_access_stays_bounded(self):
+        cache = LRUCache(maxsize=10)
+
+        def fill(offset):
+            for i in range(500):
+                cache.put(offset + i, i)
+                cache.get(offset + i // 2)
+
+        threads = [
+            threading.Thread(target=fill, args=(n * 1000,)) for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(cache), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
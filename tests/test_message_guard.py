@@ -0,0 +1,81 @@
+import unittest
+
+from classes.MessageGuard import MessageGuard
+
+
+class FakeWS:
+    def __init__(self, user_id=None):
+        self.user_id = user_id
+
+
+class TestMessageGuard(unittest.TestCase):
+
+    def setUp(self):
+        self.guard = MessageGuard(
+            rate=1, burst=2, user_rate=1, user_burst=3,
+            max_frame_size=8, max_rejected=2
+        )
+
+    def test_accepts_small_messages(self):
+        ws = FakeWS()
+
+        self.assertIsNone(self.guard.check(ws, "4", now=0))
+        self.assertIsNone(self.guard.check(ws, b"\x10\x00\x04", now=0))
+        self.assertEqual(self.guard.stats()["accepted"], 2)
+
+    def test_rejects_large_message_before_rate(self):
+        ws = FakeWS()
+
+        self.assertEqual(
+            self.guard.check(ws, "x" * 9, now=0), MessageGuard.TOO_LARGE
+        )
+        self.assertEqual(self.guard.rejected[MessageGuard.TOO_LARGE], 1)
+        self.assertEqual(self.guard.closed, 1)
+        # Le message refusé n'a pas consommé de jeton
+        self.assertFalse(hasattr(ws, "bucket"))
+
+    def test_rate_limit_per_websocket(self):
+        ws = FakeWS()
+        results = [self.guard.check(ws, "4", now=0) for _ in range(3)]
+
+        self.assertEqual(results, [None, None, MessageGuard.RATE_LIMITED])
+        self.assertEqual(self.guard.rejected["ws_rate"], 1)
+
+        # Un autre client n'est pas affecté
+        self.assertIsNone(self.guard.check(FakeWS(), "4", now=0))
+
+        # Le seau se remplit avec le temps
+        self.assertIsNone(self.guard.check(ws, "4", now=1))
+
+    def test_rate_limit_per_user(self):
+        tabs = [FakeWS(user_id=7) for _ in range(3)]
+        results = [self.guard.check(ws, "4", now=0) for ws in tabs * 2]
+
+        # 3 messages permis pour l'utilisateur, tous onglets confondus
+        self.assertEqual(results.count(None), 3)
+        self.assertEqual(self.guard.rejected["user_rate"], 3)
+        self.assertEqual(self.guard.stats()["users"], 1)
+
+    def test_abusive_client(self):
+        ws = FakeWS()
+        results = [self.guard.check(ws, "4", now=0) for _ in range(5)]
+
+        self.assertEqual(results, [
+            None, None, MessageGuard.RATE_LIMITED,
+            MessageGuard.RATE_LIMITED, MessageGuard.ABUSIVE
+        ])
+        self.assertEqual(self.guard.closed, 1)
+
+    def test_stats(self):
+        self.guard.check(FakeWS(), "4", now=0)
+
+        self.assertEqual(self.guard.stats(), {
+            "accepted": 1,
+            "rejected": {"too_large": 0, "ws_rate": 0, "user_rate": 0},
+            "closed": 0,
+            "users": 0,
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from classes.Outbox import Outbox
+
+
+class FakeWS:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self.gate = None
+
+    async def send(self, message):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(message)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestOutbox(unittest.IsolatedAsyncioTestCase):
+
+    async def test_of_returns_same_outbox(self):
+        ws = FakeWS()
+        self.assertIs(Outbox.of(ws), Outbox.of(ws))
+
+    async def test_drain_sends_in_order(self):
+        ws = FakeWS()
+        outbox = Outbox.of(ws)
+        outbox.push("a")
+        outbox.push("b")
+
+        self.assertTrue(await outbox.drain())
+        self.assertEqual(ws.sent, ["a", "b"])
+
+    async def test_replaceable_messages_are_coalesced(self):
+        ws = FakeWS()
+        outbox = Outbox.of(ws)
+        outbox.push("state1", True)
+        outbox.push("state2", True)
+        outbox.push("WIN|X")
+        outbox.push("state3", True)
+
+        await outbox.drain()
+        self.assertEqual(ws.sent, ["state2", "WIN|X", "state3"])
+
+    async def test_push_while_sending_is_sent_by_current_drain(self):
+        ws = FakeWS()
+        ws.gate = asyncio.Event()
+        outbox = Outbox.of(ws)
+
+        outbox.push("state1", True)
+        first = asyncio.ensure_future(outbox.drain())
+        await asyncio.sleep(0)
+
+        # Un second drain pendant l'envoi retourne immédiatement
+        outbox.push("state2", True)
+        outbox.push("state3", True)
+        self.assertTrue(await outbox.drain())
+
+        ws.gate.set()
+        self.assertTrue(await first)
+        self.assertEqual(ws.sent, ["state1", "state3"])
+
+    async def test_push_overflow(self):
+        outbox = Outbox.of(FakeWS())
+        with patch.object(Outbox, "MAX_PENDING", 2):
+            self.assertTrue(outbox.push("a"))
+            self.assertTrue(outbox.push("b"))
+            self.assertFalse(outbox.push("c"))
+
+    async def test_drain_timeout(self):
+        ws = FakeWS()
+        ws.gate = asyncio.Event()
+        outbox = Outbox.of(ws)
+        outbox.push("a")
+
+        with patch.object(Outbox, "SEND_TIMEOUT", 0.01):
+            self.assertFalse(await outbox.drain())
+        self.assertFalse(outbox.sending)
+
+    async def test_close(self):
+        ws = FakeWS()
+        outbox = Outbox.of(ws)
+        outbox.close()
+        await outbox.close_task
+        self.assertTrue(ws.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
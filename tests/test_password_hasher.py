@@ -0,0 +1,55 @@
+import unittest
+
+from classes.PasswordHasher import PasswordHasher
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def setUp(self):
+        # Coût réduit pour garder les tests rapides
+        self.hasher = PasswordHasher(iterations=1000)
+
+    def test_hash_format(self):
+        encoded = self.hasher.hash("secret")
+        algorithm, iterations, salt, digest = encoded.split("$")
+
+        self.assertEqual(algorithm, "pbkdf2_sha256")
+        self.assertEqual(iterations, "1000")
+        self.assertTrue(salt)
+        self.assertTrue(digest)
+        self.assertNotIn("secret", encoded)
+
+    def test_hash_is_salted(self):
+        self.assertNotEqual(
+            self.hasher.hash("secret"), self.hasher.hash("secret")
+        )
+
+    def test_verify(self):
+        encoded = self.hasher.hash("secret")
+        self.assertTrue(self.hasher.verify("secret", encoded))
+        self.assertFalse(self.hasher.verify("wrong", encoded))
+
+    def test_verify_other_cost(self):
+        """Une empreinte d'un autre coût reste vérifiable"""
+        encoded = PasswordHasher(iterations=500).hash("secret")
+        self.assertTrue(self.hasher.verify("secret", encoded))
+        self.assertTrue(self.hasher.needs_rehash(encoded))
+
+    def test_verify_legacy_plaintext(self):
+        self.assertTrue(self.hasher.verify("test1234", "test1234"))
+        self.assertFalse(self.hasher.verify("wrong", "test1234"))
+        self.assertTrue(self.hasher.needs_rehash("test1234"))
+
+    def test_verify_unknown_user(self):
+        self.assertFalse(self.hasher.verify("secret", None))
+
+    def test_needs_rehash_current_cost(self):
+        self.assertFalse(self.hasher.needs_rehash(self.hasher.hash("secret")))
+
+    def test_invalid_iterations(self):
+        with self.assertRaises(ValueError):
+            PasswordHasher(iterations=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
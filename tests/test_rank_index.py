@@ -0,0 +1,91 @@
+import random
+import unittest
+
+from classes.RankIndex import RankIndex
+
+
+def expected_order(scores):
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TestRankIndex(unittest.TestCase):
+
+    def test_empty(self):
+        index = RankIndex()
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.rank("Alice"))
+        self.assertEqual(index.top(), [])
+        self.assertEqual(index.page(1, 5), [])
+
+    def test_order_and_ties(self):
+        index = RankIndex({"b": 100, "a": 100, "c": 300, "d": 0})
+
+        self.assertEqual(
+            index.top(3), [(1, "c", 300), (2, "a", 100), (3, "b", 100)]
+        )
+        self.assertEqual(index.rank("d"), 4)
+        self.assertIn("a", index)
+
+    def test_update_moves_player(self):
+        index = RankIndex({"a": 100, "b": 50})
+        index.update("b", 150)
+
+        self.assertEqual(index.rank("b"), 1)
+        self.assertEqual(index.rank("a"), 2)
+        self.assertEqual(len(index), 2)
+
+        index.update("b", 150)
+        self.assertEqual(len(index), 2)
+
+    def test_remove(self):
+        index = RankIndex({"a": 100, "b": 50, "c": 0})
+        index.remove("a")
+        index.remove("absent")
+
+        self.assertIsNone(index.rank("a"))
+        self.assertEqual(index.top(), [(1, "b", 50), (2, "c", 0)])
+
+    def test_page_bounds(self):
+        index = RankIndex({f"u{i}": i for i in range(5)})
+
+        self.assertEqual(index.page(5, 10), [(5, "u0", 0)])
+        self.assertEqual(index.page(6, 10), [])
+        self.assertEqual(index.page(0, 10), [])
+        self.assertEqual(index.page(1, 0), [])
+
+    def test_matches_sorted_scores(self):
+        """Comparaison avec un tri complet après des mises à jour"""
+        rng = random.Random(42)
+        scores = {}
+        index = RankIndex()
+
+        for _ in range(3000):
+            player = f"user{rng.randrange(400)}"
+            if rng.random() < 0.05 and player in scores:
+                del scores[player]
+                index.remove(player)
+            else:
+                scores[player] = scores.get(player, 0) + rng.choice(
+                    (0, 50, 100)
+                )
+                index.update(player, scores[player])
+
+        order = expected_order(scores)
+        self.assertEqual(len(index), len(order))
+
+        for rank, (player, points) in enumerate(order, start=1):
+            self.assertEqual(index.rank(player), rank)
+
+        for start in (1, 7, 100, len(order) - 3):
+            self.assertEqual(
+                index.page(start, 25),
+                [
+                    (rank, player, points)
+                    for rank, (player, points)
+                    in enumerate(order, start=1)
+                ][start - 1:start + 24]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
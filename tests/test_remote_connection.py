@@ -0,0 +1,57 @@
+import unittest
+
+from classes.RemoteConnection import RemoteConnection
+
+
+class FakeBackplane:
+    def __init__(self, reachable=True):
+        self.reachable = reachable
+        self.published = []
+
+    async def publish(self, worker_id, message):
+        self.published.append((worker_id, message))
+        return self.reachable
+
+
+class TestRemoteConnection(unittest.IsolatedAsyncioTestCase):
+
+    async def test_send_text(self):
+        backplane = FakeBackplane()
+        conn = RemoteConnection(backplane, "w2", "c1", user_id=3)
+
+        await conn.send("YOU|X")
+
+        self.assertEqual(
+            backplane.published,
+            [("w2", {"type": "send", "conn": "c1", "text": "YOU|X"})]
+        )
+        self.assertEqual(conn.user_id, 3)
+
+    async def test_send_binary(self):
+        backplane = FakeBackplane()
+        conn = RemoteConnection(backplane, "w2", "c1", binary=True)
+
+        await conn.send(b"\x04\x01")
+
+        self.assertEqual(backplane.published[0][1]["binary"], "BAE=")
+
+    async def test_send_unreachable_worker(self):
+        conn = RemoteConnection(FakeBackplane(reachable=False), "w2", "c1")
+        with self.assertRaises(ConnectionError):
+            await conn.send("YOU|X")
+
+    async def test_close(self):
+        backplane = FakeBackplane()
+        conn = RemoteConnection(backplane, "w2", "c1")
+
+        await conn.close(1008, "invalide")
+
+        self.assertEqual(
+            backplane.published,
+            [("w2", {"type": "close", "conn": "c1", "code": 1008,
+                     "reason": "invalide"})]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+
+from classes.Game import Game
+from classes.RoomManager import RoomLimitError, RoomManager
+
+
+class FakeWS:
+    def __init__(self, user_id=None):
+        self.user_id = user_id
+
+
+# Faux délai de reconnexion (asyncio.Task)
+class FakeTimer:
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestRoomManager(unittest.TestCase):
+
+    def setUp(self):
+        self.rooms = RoomManager()
+
+    def test_get_or_create_creates_game(self):
+        game = self.rooms.get_or_create("abc")
+        self.assertIsInstance(game, Game)
+        self.assertIn("abc", self.rooms)
+        self.assertEqual(len(self.rooms), 1)
+
+    def test_get_or_create_returns_same_game(self):
+        g1 = self.rooms.get_or_create("abc")
+        g2 = self.rooms.get_or_create("abc")
+        self.assertIs(g1, g2)
+
+    def test_rooms_are_independent(self):
+        g1 = self.rooms.get_or_create("a")
+        g2 = self.rooms.get_or_create("b")
+        self.assertIsNot(g1, g2)
+
+        # Chaque salle attribue ses propres symboles
+        self.assertEqual(g1.assign_symbol(FakeWS()), "O")
+        self.assertEqual(g2.assign_symbol(FakeWS()), "O")
+
+    def test_get_unknown_room(self):
+        self.assertIsNone(self.rooms.get("unknown"))
+
+    def test_remove(self):
+        game = self.rooms.get_or_create("abc")
+        self.assertIs(self.rooms.remove("abc"), game)
+        self.assertNotIn("abc", self.rooms)
+        self.assertIsNone(self.rooms.remove("abc"))
+
+    def test_cleanup_empty_room(self):
+        self.rooms.get_or_create("abc")
+        self.assertTrue(self.rooms.cleanup("abc"))
+        self.assertNotIn("abc", self.rooms)
+
+    def test_cleanup_keeps_active_room(self):
+        game = self.rooms.get_or_create("abc")
+        game.assign_symbol(FakeWS())
+        self.assertFalse(self.rooms.cleanup("abc"))
+        self.assertIn("abc", self.rooms)
+
+    def test_remove_cancels_timers(self):
+        self.rooms.get_or_create("abc")
+        self.rooms.get_or_create("other")
+        timer, other = FakeTimer(), FakeTimer()
+        self.rooms.timers[("abc", "X")] = timer
+        self.rooms.timers[("other", "X")] = other
+
+        self.rooms.remove("abc")
+
+        self.assertTrue(timer.cancelled)
+        self.assertNotIn(("abc", "X"), self.rooms.timers)
+        self.assertFalse(other.cancelled)
+
+    def test_cleanup_cancels_timers(self):
+        self.rooms.get_or_create("abc")
+        timer = FakeTimer()
+        self.rooms.timers[("abc", "O")] = timer
+
+        self.assertTrue(self.rooms.cleanup("abc"))
+        self.assertTrue(timer.cancelled)
+        self.assertEqual(self.rooms.timers, {})
+
+    def test_custom_factory(self):
+        rooms = RoomManager(game_factory=lambda: "fake game")
+        self.assertEqual(rooms.get_or_create("abc"), "fake game")
+
+    def test_options_used_on_creation_only(self):
+        rooms = RoomManager(game_factory=lambda **options: options)
+
+        self.assertEqual(rooms.get_or_create("abc", size=15), {"size": 15})
+        self.assertEqual(rooms.get_or_create("abc", size=4), {"size": 15})
+
+    def test_max_rooms(self):
+        rooms = RoomManager(max_rooms=2)
+        rooms.get_or_create("a")
+        rooms.get_or_create("b")
+
+        with self.assertRaises(RoomLimitError):
+            rooms.get_or_create("c")
+        self.assertNotIn("c", rooms)
+
+        # Une salle existante reste accessible
+        self.assertIsNotNone(rooms.get_or_create("a"))
+
+        rooms.remove("b")
+        self.assertIsNotNone(rooms.get_or_create("c"))
+
+    def test_spectators_full(self):
+        rooms = RoomManager(max_spectators=1)
+        game = rooms.get_or_create("abc")
+        for _ in range(3):
+            game.assign_symbol(FakeWS())
+        self.assertFalse(rooms.spectators_full(game))
+
+        game.assign_symbol(FakeWS())
+        self.assertTrue(rooms.spectators_full(game))
+        self.assertFalse(self.rooms.spectators_full(game))
+
+    def test_stats(self):
+        game = self.rooms.get_or_create("a")
+        for _ in range(4):
+            game.assign_symbol(FakeWS())
+        self.rooms.get_or_create("b")
+
+        stats = self.rooms.stats()
+        self.assertEqual(stats["rooms"], 2)
+        self.assertEqual(stats["connections"], 4)
+        self.assertEqual(stats["spectators"], 2)
+        self.assertIsNone(stats["max_rooms"])
+        # Mémoire estimée par le nettoyage (RoomReaper), pas à chaque appel
+        self.assertIsNone(stats["memory_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
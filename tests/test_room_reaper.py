@@ -0,0 +1,166 @@
+import asyncio
+import unittest
+
+from classes.RoomManager import RoomManager
+from classes.RoomReaper import RoomReaper
+
+
+# Faux websocket local, qui répond (ou non) aux pings
+class FakeWS:
+    def __init__(self, user_id=None, responsive=True):
+        self.user_id = user_id
+        self.responsive = responsive
+        self.closed = False
+        self.close_code = None
+        self.pings = 0
+
+    async def send(self, message):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        self.closed = True
+        self.close_code = code
+
+    async def ping(self):
+        self.pings += 1
+        pong = asyncio.get_running_loop().create_future()
+        if self.responsive:
+            pong.set_result(None)
+        return pong
+
+
+# Faux client relayé par un autre worker (pas de ping)
+class FakeRemote:
+    user_id = None
+
+    async def send(self, message):
+        pass
+
+    async def close(self, code=1000, reason=""):
+        pass
+
+
+class TestRoomReaper(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.rooms = RoomManager()
+        self.reaper = RoomReaper(
+            self.rooms, idle_timeout=100, waiting_timeout=10,
+            ping_timeout=0.05, interval=0.01
+        )
+
+    def room(self, room_id, *clients):
+        game = self.rooms.get_or_create(room_id)
+        for ws in clients:
+            game.assign_symbol(ws)
+        return game
+
+    async def test_active_rooms_are_kept(self):
+        game = self.room("a", FakeWS(), FakeWS())
+
+        reaped = await self.reaper.sweep(now=game.last_active + 50)
+
+        self.assertEqual(reaped, 0)
+        self.assertIn("a", self.rooms)
+
+    async def test_half_filled_room_expires_first(self):
+        waiting = FakeWS()
+        half = self.room("half", waiting)
+        self.room("full", FakeWS(), FakeWS())
+
+        reaped = await self.reaper.sweep(now=half.last_active + 50)
+
+        self.assertEqual(reaped, 1)
+        self.assertNotIn("half", self.rooms)
+        self.assertIn("full", self.rooms)
+        self.assertTrue(waiting.closed)
+        self.assertEqual(half.connected, {})
+
+    async def test_reaped_room_is_closed_for_good(self):
+        """Code 4000 (pas de reconnexion) et délais annulés"""
+        ws = FakeWS()
+        game = self.room("a", ws)
+        timer = asyncio.ensure_future(asyncio.sleep(10))
+        self.rooms.timers[("a", "X")] = timer
+
+        await self.reaper.sweep(now=game.last_active + 50)
+        await asyncio.sleep(0)
+
+        self.assertEqual(ws.close_code, RoomReaper.CLOSE_CODE)
+        self.assertEqual(RoomReaper.CLOSE_CODE, 4000)
+        self.assertTrue(timer.cancelled())
+        self.assertEqual(self.rooms.timers, {})
+
+    async def test_idle_full_room_expires(self):
+        clients = [FakeWS(), FakeWS(), FakeWS()]
+        game = self.room("a", *clients)
+
+        await self.reaper.sweep(now=game.last_active + 101)
+
+        self.assertNotIn("a", self.rooms)
+        self.assertTrue(all(ws.closed for ws in clients))
+        self.assertEqual(
+            self.reaper.stats(),
+            {"sweeps": 1, "rooms_reaped": 1, "connections_reaped": 3}
+        )
+
+    async def test_sweep_estimates_memory(self):
+        kept = self.room("kept", FakeWS(), FakeWS())
+        idle = self.room("idle", FakeWS())
+        kept.last_active = idle.last_active + 40
+
+        await self.reaper.sweep(now=idle.last_active + 50)
+
+        memory = self.rooms.stats()["memory_bytes"]
+        self.assertGreater(memory, kept.memory_size())
+        self.assertLess(memory, kept.memory_size() + idle.memory_size())
+
+    async def test_move_keeps_room_alive(self):
+        game = self.room("a", FakeWS())
+        start = game.last_active
+        game.play_move(4, "X")
+        game.last_active = start + 40
+
+        await self.reaper.sweep(now=start + 45)
+
+        self.assertIn("a", self.rooms)
+
+    async def test_unresponsive_client_is_dropped(self):
+        player = FakeWS()
+        silent = FakeWS(responsive=False)
+        remote = FakeRemote()
+        game = self.room("a", player, FakeWS(), silent, remote)
+
+        await self.reaper.sweep(now=game.last_active)
+
+        self.assertEqual(player.pings, 1)
+        self.assertNotIn(silent, game.connected)
+        self.assertNotIn(silent, game.spectators)
+        self.assertIn(player, game.connected)
+        self.assertIn(remote, game.connected)
+        self.assertEqual(self.reaper.connections_reaped, 1)
+
+    async def test_ping_disabled(self):
+        silent = FakeWS(responsive=False)
+        game = self.room("a", silent)
+        self.reaper.ping_timeout = None
+
+        await self.reaper.sweep(now=game.last_active)
+
+        self.assertEqual(silent.pings, 0)
+        self.assertIn(silent, game.connected)
+
+    async def test_start_and_stop(self):
+        self.room("a", FakeWS())
+        self.reaper.start()
+        await asyncio.sleep(0.05)
+        await self.reaper.stop()
+
+        sweeps = self.reaper.sweeps
+        self.assertGreater(sweeps, 0)
+        await asyncio.sleep(0.03)
+        self.assertEqual(self.reaper.sweeps, sweeps)
+
+
+if __name__ == "__main__":
+    unittest.main()
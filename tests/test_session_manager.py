@@ -0,0 +1,157 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from classes.ConnectionPool import ConnectionPool
+from classes.SessionManager import SessionManager
+
+
+class TestSessionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.sessions = SessionManager(b"secret", max_age=60)
+
+    def test_issue_and_verify(self):
+        token = self.sessions.issue(7, "Alice")
+        self.assertEqual(
+            self.sessions.verify(token), {"id": 7, "username": "Alice"}
+        )
+
+    def test_username_with_separator(self):
+        token = self.sessions.issue(1, "a|b.c")
+        self.assertEqual(self.sessions.verify(token)["username"], "a|b.c")
+
+    def test_tokens_are_unique(self):
+        self.assertNotEqual(
+            self.sessions.issue(1, "Alice"), self.sessions.issue(1, "Alice")
+        )
+
+    def test_verify_missing_or_malformed(self):
+        for token in (None, "", "abc", "abc.def", "é.é", "..."):
+            self.assertIsNone(self.sessions.verify(token))
+
+    def test_verify_tampered_token(self):
+        token = self.sessions.issue(1, "Alice")
+        forged = SessionManager(b"secret").issue(2, "Bob").split(".")[0]
+        self.assertIsNone(
+            self.sessions.verify(forged + "." + token.split(".")[1])
+        )
+
+    def test_verify_other_secret(self):
+        token = SessionManager(b"other").issue(1, "Alice")
+        self.assertIsNone(self.sessions.verify(token))
+
+    def test_expired_token(self):
+        token = self.sessions.issue(1, "Alice", now=1000)
+        self.assertIsNotNone(self.sessions.verify(token, now=1059))
+        self.assertIsNone(self.sessions.verify(token, now=1060))
+
+    def test_revoke(self):
+        token = self.sessions.issue(1, "Alice")
+        other = self.sessions.issue(1, "Alice")
+
+        self.sessions.revoke(token)
+        self.sessions.revoke(None)
+
+        self.assertIsNone(self.sessions.verify(token))
+        self.assertIsNotNone(self.sessions.verify(other))
+
+    def test_revoked_tokens_are_purged(self):
+        token = self.sessions.issue(1, "Alice", now=1000)
+        self.sessions.revoke(token, now=1000)
+        self.assertEqual(len(self.sessions._revoked), 1)
+
+        self.sessions.revoke(None, now=2000)
+        self.assertEqual(len(self.sessions._revoked), 0)
+
+    def test_concurrent_revocations(self):
+        """Révocations simultanées depuis plusieurs threads (DBExecutor)"""
+        self.sessions._revoked = {f"old{i}": 1000 for i in range(5000)}
+        tokens = [self.sessions.issue(1, "Alice") for _ in range(200)]
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(self.sessions.revoke, tokens))
+
+        self.assertEqual(len(self.sessions._revoked), 200)
+        self.assertTrue(
+            all(self.sessions.verify(token) is None for token in tokens)
+        )
+
+    def test_string_secret(self):
+        token = SessionManager("secret").issue(1, "Alice")
+        self.assertIsNotNone(self.sessions.verify(token))
+
+    def test_load_secret_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.key")
+            first = SessionManager.load_secret(path)
+            second = SessionManager.load_secret(path)
+
+        self.assertTrue(first)
+        self.assertEqual(first, second)
+
+
+class TestSharedRevocations(unittest.IsolatedAsyncioTestCase):
+    """Deux workers partageant la base des révocations"""
+
+    def setUp(self):
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.db_dir.name, "tictactoe.db")
+        self.w1 = SessionManager(b"secret", db_path=self.db_path)
+        self.w2 = SessionManager(
+            b"secret", db_path=self.db_path, refresh_interval=0.01
+        )
+
+    def tearDown(self):
+        ConnectionPool.get(self.db_path).close()
+        self.db_dir.cleanup()
+
+    def test_revocation_reaches_other_workers(self):
+        token = self.w1.issue(1, "Alice")
+        self.w2.refresh()
+
+        self.w1.revoke(token)
+        self.assertIsNone(self.w1.verify(token))
+        self.assertIsNotNone(self.w2.verify(token))
+
+        self.w2.refresh()
+        self.assertIsNone(self.w2.verify(token))
+
+    def test_refresh_reads_only_new_revocations(self):
+        self.w1.revoke(self.w1.issue(1, "Alice"))
+        self.w2.refresh()
+        last_id = self.w2._last_id
+
+        self.w2._revoked.clear()
+        self.w2.refresh()
+        self.assertEqual(self.w2._revoked, {})
+        self.assertEqual(self.w2._last_id, last_id)
+
+    def test_expired_revocations_are_deleted(self):
+        token = self.w1.issue(1, "Alice", now=1000)
+        self.w1.revoke(token, now=1000)
+        self.w1.revoke(self.w1.issue(2, "Bob"))
+
+        with ConnectionPool.get(self.db_path).connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM revoked_sessions"
+            ).fetchone()[0]
+        self.assertEqual(count, 1)
+
+    async def test_start_refreshes_periodically(self):
+        token = self.w1.issue(1, "Alice")
+        self.w2.start()
+        await asyncio.sleep(0.02)
+
+        self.w1.revoke(token)
+        await asyncio.sleep(0.05)
+        await self.w2.stop()
+
+        self.assertIsNone(self.w2.verify(token))
+        self.assertIsNone(self.w2._refresher)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from classes.ConnectionPool import ConnectionPool
+from classes.SQLiteBackplane import SQLiteBackplane
+
+
+class TestSQLiteBackplane(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        # Fichier temporaire partagé par les deux workers
+        self.db_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.db_dir.name, "backplane.db")
+
+        self.w1 = SQLiteBackplane(self.db_path, worker_id="w1")
+        self.w2 = SQLiteBackplane(self.db_path, worker_id="w2")
+
+    def tearDown(self):
+        ConnectionPool.get(self.db_path).close()
+        self.db_dir.cleanup()
+
+    async def test_publish_and_poll(self):
+        received = []
+
+        async def handler(message):
+            received.append(message)
+
+        self.w2.subscribe(handler)
+        await self.w2.start()
+
+        for n in range(3):
+            self.assertTrue(await self.w1.publish("w2", {"n": n}))
+        await asyncio.sleep(0.1)
+        await self.w2.close()
+
+        self.assertEqual(received, [{"n": 0}, {"n": 1}, {"n": 2}])
+
+    async def test_messages_are_consumed_once(self):
+        await self.w1.publish("w2", {"n": 0})
+
+        self.assertEqual(self.w2._fetch(), ['{"n": 0}'])
+        self.assertEqual(self.w2._fetch(), [])
+
+    async def test_messages_are_per_worker(self):
+        await self.w1.publish("w2", {"n": 0})
+        self.assertEqual(self.w1._fetch(), [])
+
+    async def test_claim_and_release(self):
+        self.assertEqual(await self.w1.claim("room"), "w1")
+        self.assertEqual(await self.w2.claim("room"), "w1")
+
+        await self.w2.release("room")
+        self.assertEqual(await self.w2.claim("room"), "w1")
+
+        await self.w1.release("room")
+        self.assertEqual(await self.w2.claim("room"), "w2")
+
+    async def test_close_releases_rooms(self):
+        await self.w1.start()
+        await self.w1.claim("a")
+        await self.w1.claim("b")
+        await self.w1.close()
+
+        self.assertEqual(await self.w2.claim("a"), "w2")
+        self.assertEqual(await self.w2.claim("b"), "w2")
+
+    async def test_dead_owner_rooms_are_taken_over(self):
+        """Un worker arrêté sans close() perd ses salles à l'expiration"""
+        dead = SQLiteBackplane(self.db_path, worker_id="dead", lease=0.05)
+        self.assertEqual(await dead.claim("default"), "dead")
+        self.assertTrue(await self.w1.publish("dead", {"n": 0}))
+        self.assertEqual(await self.w1.claim("default"), "dead")
+
+        await asyncio.sleep(0.1)
+
+        self.assertFalse(await self.w1.publish("dead", {"n": 1}))
+        self.assertEqual(await self.w1.claim("default"), "w1")
+
+    async def test_start_purges_expired_workers(self):
+        dead = SQLiteBackplane(self.db_path, worker_id="dead", lease=0.05)
+        await dead.claim("a")
+        await self.w1.publish("dead", {"n": 0})
+        await asyncio.sleep(0.1)
+
+        await self.w2.start()
+        await self.w2.close()
+
+        with ConnectionPool.get(self.db_path).connection() as conn:
+            for table in ("backplane_workers", "backplane_rooms",
+                          "backplane_messages"):
+                rows = conn.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE worker = 'dead'"
+                ).fetchone()
+                self.assertEqual(rows[0], 0, table)
+
+    async def test_lease_is_renewed_while_polling(self):
+        worker = SQLiteBackplane(self.db_path, worker_id="w3", lease=0.06)
+        await worker.start()
+        await worker.claim("room")
+        await asyncio.sleep(0.15)
+
+        self.assertEqual(await self.w1.claim("room"), "w3")
+        self.assertTrue(await self.w1.publish("w3", {"n": 0}))
+        await worker.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from classes.StaticAssets import StaticAssets
+
+
+class TestStaticAssets(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.write("fonts/font.ttf", b"\x00\x01" * 10)
+        self.write("css/site.css", (
+            "@font-face { src: url('../fonts/font.ttf'); }\n"
+            "body { background: url(\"/img/missing.jpg\"); }\n"
+            + "p { color: red; }\n" * 50
+        ).encode())
+        self.write("js/app.js", b"console.log(1);")
+        self.write("big/secret.txt", b"secret")
+        self.write("app.py", b"print('secret')")
+
+        self.assets = StaticAssets(self.root)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, path, body):
+        full = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, "wb") as f:
+            f.write(body)
+
+    def request(self, **headers):
+        request = MagicMock()
+        request.headers = {k.replace("_", "-"): v for k, v in headers.items()}
+        return request
+
+    def test_manifest_contains_only_served_directories(self):
+        self.assertEqual(
+            sorted(self.assets.manifest),
+            ["css/site.css", "fonts/font.ttf", "js/app.js"]
+        )
+        self.assertIsNone(self.assets.get("app.py"))
+        self.assertIsNone(self.assets.get("big/secret.txt"))
+
+    def test_hashed_url(self):
+        url = self.assets.url("js/app.js")
+        self.assertRegex(url, r"^/js/app\.[0-9a-f]{12}\.js$")
+        self.assertIs(
+            self.assets.get(url.lstrip("/")), self.assets.get("js/app.js")
+        )
+        self.assertEqual(self.assets.url("js/unknown.js"), "/js/unknown.js")
+
+    def test_css_urls_are_rewritten(self):
+        body = self.assets.get("css/site.css").body.decode()
+        self.assertIn(f"url('{self.assets.url('fonts/font.ttf')}')", body)
+        self.assertIn('url("/img/missing.jpg")', body)
+
+    def test_content_type(self):
+        self.assertEqual(
+            self.assets.get("css/site.css").content_type,
+            "text/css; charset=utf-8"
+        )
+
+    def test_small_files_are_not_compressed(self):
+        self.assertEqual(self.assets.get("js/app.js").encodings, {})
+        self.assertIn("gzip", self.assets.get("css/site.css").encodings)
+
+    async def test_response_immutable_for_hashed_url(self):
+        asset = self.assets.get("js/app.js")
+        path = asset.url.lstrip("/")
+
+        response = await self.assets.response(self.request(), asset, path)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, b"console.log(1);")
+        self.assertIn("immutable", response.headers["Cache-Control"])
+
+        response = await self.assets.response(
+            self.request(), asset, "js/app.js"
+        )
+        self.assertNotIn("immutable", response.headers["Cache-Control"])
+
+    async def test_response_gzip(self):
+        asset = self.assets.get("css/site.css")
+
+        response = await self.assets.response(
+            self.request(accept_encoding="br;q=1.0, gzip"), asset,
+            "css/site.css"
+        )
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.body), asset.body)
+
+        response = await self.assets.response(
+            self.request(accept_encoding="gzip;q=0"), asset, "css/site.css"
+        )
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.body, asset.body)
+
+    async def test_response_not_modified(self):
+        asset = self.assets.get("js/app.js")
+        response = await self.assets.response(
+            self.request(if_none_match=asset.etag), asset, "js/app.js"
+        )
+        self.assertEqual(response.status, 304)
+
+    async def test_large_file_served_from_disk(self):
+        assets = StaticAssets(self.root, max_memory_size=4)
+        asset = assets.get("js/app.js")
+        self.assertIsNone(asset.body)
+
+        response = await assets.response(self.request(), asset, "js/app.js")
+        self.assertEqual(response.body, b"console.log(1);")
+
+
+if __name__ == "__main__":
+    unittest.main()
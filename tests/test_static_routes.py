@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from sanic import Sanic
+from sanic_testing import TestManager
+
+from classes.StaticAssets import StaticAssets
+from routes.static_routes import register_static_routes
+
+
+class TestStaticRoutes(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for path, body in (("css/a.css", b"body {}"), ("db.sqlite", b"x")):
+            full = os.path.join(self.directory.name, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "wb") as f:
+                f.write(body)
+
+        self.assets = StaticAssets(self.directory.name)
+        self.app = Sanic(f"test-app-static-{id(self)}")
+        TestManager(self.app)
+        register_static_routes(self.app, self.assets)
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def test_serves_file_and_hashed_url(self):
+        for url in ("/css/a.css", self.assets.url("css/a.css")):
+            _, response = await self.app.asgi_client.get(url)
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.body, b"body {}")
+            self.assertIn("ETag", response.headers)
+
+    async def test_unknown_or_private_files(self):
+        for url in ("/css/b.css", "/db.sqlite", "/css/../db.sqlite",
+                    "/img/a.png"):
+            _, response = await self.app.asgi_client.get(url)
+            self.assertEqual(response.status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock
+
+from sanic import Sanic
+from sanic_testing import TestManager
+
+from routes import stats_routes
+
+AUTH = {"Authorization": "Bearer secret"}
+
+
+class TestStatsRoutes(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.app = Sanic(f"test-app-stats-{id(self)}")
+        TestManager(self.app)
+
+        self.writer = MagicMock()
+        self.writer.stats.return_value = {"queue_depth": 3}
+        stats_routes.register_stats_routes(
+            self.app, self.writer, token="secret"
+        )
+
+    async def test_stats(self):
+        _, response = await self.app.asgi_client.get(
+            "/stats", headers=AUTH
+        )
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.json["game_writer"], {"queue_depth": 3})
+        self.assertNotIn("rooms", response.json)
+
+    async def test_stats_rooms_and_reaper(self):
+        app = Sanic(f"test-app-stats-rooms-{id(self)}")
+        TestManager(app)
+        rooms = MagicMock()
+        rooms.stats.return_value = {"rooms": 2, "memory_bytes": 4096}
+        reaper = MagicMock()
+        reaper.stats.return_value = {"rooms_reaped": 1}
+        guard = MagicMock()
+        guard.stats.return_value = {"accepted": 5}
+        stats_routes.register_stats_routes(
+            app, self.writer, rooms, reaper, guard, token="secret"
+        )
+
+        _, response = await app.asgi_client.get("/stats", headers=AUTH)
+
+        self.assertEqual(
+            response.json["rooms"], {"rooms": 2, "memory_bytes": 4096}
+        )
+        self.assertEqual(response.json["reaper"], {"rooms_reaped": 1})
+        self.assertEqual(response.json["messages"], {"accepted": 5})
+
+    async def test_stats_requires_token(self):
+        for headers in ({}, {"Authorization": "Bearer wrong"}):
+            _, response = await self.app.asgi_client.get(
+                "/stats", headers=headers
+            )
+            self.assertEqual(response.status, 403)
+        self.writer.stats.assert_not_called()
+
+    async def test_stats_closed_without_token(self):
+        app = Sanic(f"test-app-stats-closed-{id(self)}")
+        TestManager(app)
+        stats_routes.register_stats_routes(app, self.writer)
+
+        _, response = await app.asgi_client.get("/stats", headers=AUTH)
+
+        self.assertEqual(response.status, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
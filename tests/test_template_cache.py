@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from classes.TemplateCache import TemplateCache
+
+
+class TestTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.directory.name, "hello.html"), "w") as f:
+            f.write("Bonjour {{ name }}")
+        self.pages = TemplateCache(self.directory.name, max_entries=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def request(self, etag=None):
+        request = MagicMock()
+        request.headers = {"if-none-match": etag} if etag else {}
+        return request
+
+    def test_templates_compiled_at_startup(self):
+        self.assertIn("hello.html", self.pages.templates)
+
+    def test_asset_function(self):
+        with open(os.path.join(self.directory.name, "a.html"), "w") as f:
+            f.write("{{ asset('css/a.css') }}")
+
+        assets = MagicMock()
+        assets.url.return_value = "/css/a.123.css"
+
+        self.assertEqual(
+            TemplateCache(self.directory.name).render("a.html"),
+            "/css/a.css"
+        )
+        self.assertEqual(
+            TemplateCache(self.directory.name, assets=assets).render("a.html"),
+            "/css/a.123.css"
+        )
+
+    def test_render_escapes_html(self):
+        self.assertEqual(
+            self.pages.render("hello.html", {"name": "<b>"}),
+            "Bonjour &lt;b&gt;"
+        )
+
+    def test_page_is_cached_by_context(self):
+        first = self.pages.page("hello.html", {"name": "Alice"})
+        second = self.pages.page("hello.html", {"name": "Alice"})
+        other = self.pages.page("hello.html", {"name": "Bob"})
+
+        self.assertIs(first, second)
+        self.assertEqual(first.body, b"Bonjour Alice")
+        self.assertNotEqual(first.etag, other.etag)
+
+    def test_page_with_explicit_key(self):
+        first = self.pages.page("hello.html", {"name": ["A"]}, key=1)
+        second = self.pages.page("hello.html", {"name": ["B"]}, key=1)
+        self.assertIs(first, second)
+
+    def test_cache_is_bounded(self):
+        for name in ("A", "B", "C"):
+            self.pages.page("hello.html", {"name": name})
+        self.assertEqual(len(self.pages.pages), 2)
+
+    def test_uncached_page_is_not_stored(self):
+        self.pages.page("hello.html", {"name": "Anonyme"})
+        page = self.pages.page("hello.html", {"name": "Alice"}, cache=None)
+
+        self.assertEqual(page.body, b"Bonjour Alice")
+        self.assertEqual(len(self.pages.pages), 1)
+        self.assertEqual(self.pages.latest, {})
+
+    def test_latest_keeps_only_last_version(self):
+        anonymous = self.pages.page("hello.html", {"name": "Anonyme"})
+        for version in range(10):
+            first = self.pages.page(
+                "hello.html", {"name": str(version)}, key=version,
+                cache=TemplateCache.LATEST
+            )
+            second = self.pages.page(
+                "hello.html", {"name": "?"}, key=version,
+                cache=TemplateCache.LATEST
+            )
+            self.assertIs(first, second)
+
+        self.assertEqual(first.body, b"Bonjour 9")
+        self.assertEqual(len(self.pages.latest), 1)
+        # Les versions successives ne chassent pas les pages du cache LRU
+        self.assertIs(
+            self.pages.page("hello.html", {"name": "Anonyme"}), anonymous
+        )
+
+    def test_response_without_request(self):
+        response = self.pages.response("hello.html", {"name": "Alice"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.body, b"Bonjour Alice")
+        self.assertNotIn("ETag", response.headers)
+
+    def test_response_with_etag(self):
+        response = self.pages.response(
+            "hello.html", {"name": "Alice"}, request=self.request()
+        )
+        etag = response.headers["ETag"]
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+
+        for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            response = self.pages.response(
+                "hello.html", {"name": "Alice"}, request=self.request(header)
+            )
+            self.assertEqual(response.status, 304)
+            self.assertEqual(response.headers["ETag"], etag)
+
+        response = self.pages.response(
+            "hello.html", {"name": "Alice"}, request=self.request('"other"')
+        )
+        self.assertEqual(response.status, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from classes.TokenBucket import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_refused(self):
+        bucket = TokenBucket(rate=1, capacity=3, now=0)
+
+        self.assertEqual([bucket.consume(now=0) for _ in range(4)],
+                         [True, True, True, False])
+
+    def test_refill_over_time(self):
+        bucket = TokenBucket(rate=2, capacity=2, now=0)
+        bucket.consume(now=0)
+        bucket.consume(now=0)
+        self.assertFalse(bucket.consume(now=0.1))
+
+        # 0,5 s à 2 jetons par seconde : un jeton disponible
+        self.assertTrue(bucket.consume(now=0.6))
+        self.assertFalse(bucket.consume(now=0.6))
+
+    def test_capacity_is_bounded(self):
+        bucket = TokenBucket(rate=10, capacity=2, now=0)
+
+        self.assertTrue(bucket.consume(now=100))
+        self.assertTrue(bucket.consume(now=100))
+        self.assertFalse(bucket.consume(now=100))
+
+    def test_cost(self):
+        bucket = TokenBucket(rate=1, capacity=5, now=0)
+
+        self.assertTrue(bucket.consume(now=0, cost=4))
+        self.assertFalse(bucket.consume(now=0, cost=2))
+        self.assertTrue(bucket.consume(now=0, cost=1))
+
+    def test_clock_going_backwards(self):
+        bucket = TokenBucket(rate=1, capacity=1, now=10)
+        self.assertTrue(bucket.consume(now=10))
+        self.assertFalse(bucket.consume(now=5))
+        self.assertEqual(bucket.updated, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 import tempfile
 import os
+from unittest.mock import patch
+from classes.PasswordHasher import PasswordHasher
 from classes.UserDAO import UserDAO
 
 class TestUserDAO(unittest.TestCase):
@@ -11,7 +13,8 @@ class TestUserDAO(unittest.TestCase):
         self.db_file.close()
 
         # Instancie UserDAO, qui crée la table users
-        self.dao = UserDAO(self.db_path)
+        # (coût de hachage réduit pour garder les tests rapides)
+        self.dao = UserDAO(self.db_path, hasher=PasswordHasher(1000))
 
     def test_insert_user_success(self):
         """Insertion réussie retourne un id entier"""
@@ -60,3 +63,77 @@ class TestUserDAO(unittest.TestCase):
             user = self.dao.get_user(username, pwd)
             self.assertEqual(user["id"], uid)
             self.assertEqual(user["username"], username)
+
+
+class TestUserDAOPasswords(unittest.TestCase):
+    def setUp(self):
+        self.db_file = tempfile.NamedTemporaryFile(delete=True)
+        self.db_path = self.db_file.name
+        self.db_file.close()
+
+        self.dao = UserDAO(
+            self.db_path, hasher=PasswordHasher(1000), cache_size=2
+        )
+
+    def stored_password(self, username):
+        with self.dao._connect() as conn:
+            return conn.execute(
+                "SELECT password FROM users WHERE username = ?", (username,)
+            ).fetchone()[0]
+
+    def test_password_is_hashed(self):
+        """Le mot de passe n'est pas stocké en clair"""
+        self.dao.insert_user("Alice", "password123")
+        stored = self.stored_password("Alice")
+        self.assertNotEqual(stored, "password123")
+        self.assertTrue(stored.startswith("pbkdf2_sha256$1000$"))
+
+    def test_get_user_uses_cache(self):
+        """Les connexions suivantes ne lisent pas la base"""
+        uid = self.dao.insert_user("Bob", "secret")
+        self.dao.credentials.clear()
+
+        with patch.object(
+            self.dao, "_connect", wraps=self.dao._connect
+        ) as connect:
+            self.assertEqual(self.dao.get_user("Bob", "secret")["id"], uid)
+            self.assertEqual(self.dao.get_user("Bob", "secret")["id"], uid)
+            self.assertIsNone(self.dao.get_user("Bob", "wrong"))
+
+        self.assertEqual(connect.call_count, 1)
+
+    def test_cache_is_bounded(self):
+        for name in ("Eve", "Frank", "Grace"):
+            self.dao.insert_user(name, "pass")
+
+        self.assertEqual(len(self.dao.credentials), 2)
+        self.assertNotIn("Eve", self.dao.credentials)
+        # L'utilisateur évincé est relu dans la base
+        self.assertIsNotNone(self.dao.get_user("Eve", "pass"))
+
+    def test_legacy_plaintext_password_is_upgraded(self):
+        """Un ancien mot de passe en clair est haché à la connexion"""
+        with self.dao._connect() as conn:
+            conn.execute(
+                "INSERT INTO users (username, password) VALUES (?, ?)",
+                ("Legacy", "test1234")
+            )
+
+        self.assertIsNone(self.dao.get_user("Legacy", "wrong"))
+        self.assertEqual(self.stored_password("Legacy"), "test1234")
+
+        user = self.dao.get_user("Legacy", "test1234")
+        self.assertEqual(user["username"], "Legacy")
+        self.assertTrue(
+            self.stored_password("Legacy").startswith("pbkdf2_sha256$")
+        )
+        self.assertIsNotNone(self.dao.get_user("Legacy", "test1234"))
+
+    def test_rehash_on_cost_change(self):
+        self.dao.insert_user("Heidi", "pass")
+        dao = UserDAO(self.db_path, hasher=PasswordHasher(2000))
+
+        self.assertIsNotNone(dao.get_user("Heidi", "pass"))
+        self.assertTrue(
+            self.stored_password("Heidi").startswith("pbkdf2_sha256$2000$")
+        )
@@ -1,6 +1,8 @@
 import unittest
+import unittest.mock
 import asyncio
 
+from classes.Outbox import Outbox
 from classes.WebsocketHelper import WebsocketHelper
 
 # Faux websocket pour les tests
@@ -12,16 +14,41 @@ class FakeWS:
     async def send(self, message):
         self.sent.append(message)
 
-    async def close(self):
+    async def close(self, code=1000, reason=""):
         self.closed = True
 
+# Faux websocket qui ne termine jamais ses envois
+class SlowWS(FakeWS):
+    async def send(self, message):
+        await asyncio.sleep(3600)
+
+# Faux websocket dont la connexion est rompue
+class BrokenWS(FakeWS):
+    async def send(self, message):
+        raise ConnectionError("closed")
+
 # Faux Game pour injecter dans WebsocketHelper
 class FakeGame:
     def __init__(self):
         self.connected = {}
+        self.seats = {"X": None, "O": None}
         self.board = [""] * 9
         self.current_player = "X"
 
+    def add_connection(self, ws, player):
+        self.connected[ws] = player
+        if player in self.seats:
+            self.seats[player] = ws
+
+    def remove_connection(self, ws):
+        player = self.connected.pop(ws, None)
+        if self.seats.get(player) is ws:
+            self.seats[player] = None
+        return player
+
+    def opponent(self, player):
+        return self.seats.get({"X": "O", "O": "X"}.get(player))
+
     def reset_game(self):
         self.board = [""] * 9
         self.current_player = "X"
@@ -29,70 +56,183 @@ class FakeGame:
     def board_state(self):
         return ",".join(self.board) + "|" + self.current_player
 
+    def board_message(self):
+        return self.board_state()
+
+    def snapshot_message(self, binary=False):
+        if binary:
+            return b"\x02snapshot"
+        return "SNAP|0|" + self.board_state()
+
+    def delta_message(self, binary=False):
+        if binary:
+            return b"\x03delta"
+        return "D|1|4|X|O"
+
+# Faux websocket en mode delta
+class DeltaWS(FakeWS):
+    delta = True
+
+# Faux websocket en mode binaire
+class BinaryWS(DeltaWS):
+    binary = True
+
 class TestWebsocketHelper(unittest.IsolatedAsyncioTestCase):
 
-    async def test_check_disconnect_no_disconnect(self):
-        """Pas de déconnexion → retourne False et n'envoie rien"""
+    async def test_end_abandoned_seat_taken_again(self):
+        """Place reprise → retourne False et n'envoie rien"""
         game = FakeGame()
         ws_x = FakeWS()
         ws_o = FakeWS()
-        game.connected[ws_x] = "X"
-        game.connected[ws_o] = "O"
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
+        game.board[4] = "X"
         helper = WebsocketHelper(game)
 
-        result = await helper.check_disconnect(ws_x, "X")
+        result = await helper.end_abandoned("O")
         self.assertFalse(result)
         self.assertEqual(ws_x.sent, [])
         self.assertEqual(ws_o.sent, [])
+        self.assertEqual(game.board[4], "X")
 
-    async def test_check_disconnect_other_player_missing(self):
-        """Autre joueur absent → retourne True et envoie DISC"""
+    async def test_end_abandoned_resets_game(self):
+        """Place toujours libre → DISC à l'adversaire et réinitialisation"""
         game = FakeGame()
         ws_x = FakeWS()
-        game.connected[ws_x] = "X"  # seul joueur connecté
+        ws_s = FakeWS()
+        game.add_connection(ws_x, "X")  # seul joueur connecté
+        game.add_connection(ws_s, "S")
+        game.board[4] = "X"
+        game.current_player = "O"
         helper = WebsocketHelper(game)
 
-        result = await helper.check_disconnect(ws_x, "X")
+        result = await helper.end_abandoned("O")
         self.assertTrue(result)
 
-        # Vérifie qu'au moins un message DISC a été envoyé
-        self.assertTrue(any(msg.startswith("DISC|") for msg in ws_x.sent))
+        # Seul l'autre joueur reçoit le message DISC
+        self.assertTrue(ws_x.sent[0].startswith("DISC|"))
+        self.assertFalse(any(msg.startswith("DISC|") for msg in ws_s.sent))
 
-        # Vérifie que le jeu a été réinitialisé
+        # Vérifie que le jeu a été réinitialisé et diffusé
         self.assertEqual(game.board, [""] * 9)
         self.assertEqual(game.current_player, "X")
+        self.assertEqual(ws_x.sent[-1], ",,,,,,,,|X")
+        self.assertEqual(ws_s.sent, [",,,,,,,,|X"])
 
-    async def test_check_disconnect_spectator(self):
-        """Spectateur → ne fait rien"""
+    async def test_notify_left_and_back(self):
+        """Départ et retour d'un joueur → WAIT puis BACK à tous"""
         game = FakeGame()
+        ws_x = FakeWS()
         ws_s = FakeWS()
-        game.connected[ws_s] = "S"
+        ws_b = BinaryWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_s, "S")
+        game.add_connection(ws_b, "S")
         helper = WebsocketHelper(game)
 
-        result = await helper.check_disconnect(ws_s, "S")
-        self.assertFalse(result)
-        self.assertEqual(ws_s.sent, [])
+        await helper.notify_left("O")
+        await helper.notify_back("O")
+
+        self.assertEqual(ws_x.sent, ["WAIT|O", "BACK|O"])
+        self.assertEqual(ws_s.sent, ["WAIT|O", "BACK|O"])
+        self.assertEqual(ws_b.sent, [b"\x07\x02", b"\x08\x02"])
 
     async def test_broadcast_multiple_ws(self):
         """Tous les websockets reçoivent le message"""
         game = FakeGame()
         ws_x = FakeWS()
         ws_o = FakeWS()
-        game.connected[ws_x] = "X"
-        game.connected[ws_o] = "O"
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
         helper = WebsocketHelper(game)
 
         await helper.broadcast("test message")
         self.assertIn("test message", ws_x.sent)
         self.assertIn("test message", ws_o.sent)
 
+    async def test_broadcast_update_by_protocol(self):
+        """Les clients delta reçoivent le coup, les autres l'état complet"""
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_o = DeltaWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
+        helper = WebsocketHelper(game)
+
+        await helper.broadcast_update()
+        self.assertEqual(ws_x.sent, [",,,,,,,,|X"])
+        self.assertEqual(ws_o.sent, ["D|1|4|X|O"])
+
+    async def test_broadcast_snapshot_on_join(self):
+        """À l'arrivée d'un client, seuls lui et les clients complets reçoivent l'état"""
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_o = DeltaWS()
+        ws_s = DeltaWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
+        game.add_connection(ws_s, "S")
+        helper = WebsocketHelper(game)
+
+        await helper.broadcast_snapshot(joined=ws_s)
+        self.assertEqual(ws_x.sent, [",,,,,,,,|X"])
+        self.assertEqual(ws_o.sent, [])
+        self.assertEqual(ws_s.sent, ["SNAP|0|,,,,,,,,|X"])
+
+        await helper.broadcast_snapshot()
+        self.assertEqual(ws_o.sent, ["SNAP|0|,,,,,,,,|X"])
+
+    async def test_binary_clients(self):
+        """Les clients binaires reçoivent les messages au format binaire"""
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_o = BinaryWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
+        helper = WebsocketHelper(game)
+
+        await helper.send(ws_o, "YOU|O")
+        await helper.broadcast_snapshot(joined=ws_o)
+        await helper.broadcast_update()
+        await helper.broadcast("WIN|X")
+
+        self.assertEqual(
+            ws_o.sent, [b"\x01\x02", b"\x02snapshot", b"\x03delta", b"\x04\x01"]
+        )
+        self.assertEqual(
+            ws_x.sent, [",,,,,,,,|X", ",,,,,,,,|X", "WIN|X"]
+        )
+
+    async def test_binary_client_text_fallback(self):
+        """Un message sans équivalent binaire est envoyé en texte"""
+        game = FakeGame()
+        ws_o = BinaryWS()
+        game.add_connection(ws_o, "O")
+        helper = WebsocketHelper(game)
+
+        await helper.broadcast("hello")
+        self.assertEqual(ws_o.sent, ["hello"])
+
+    async def test_send_single_client(self):
+        """send n'envoie qu'au client visé"""
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_o = FakeWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
+        helper = WebsocketHelper(game)
+
+        await helper.send(ws_o, "SNAP|0|state", True)
+        self.assertEqual(ws_x.sent, [])
+        self.assertEqual(ws_o.sent, ["SNAP|0|state"])
+
     async def test_close_all_connections(self):
         """Toutes les connections sont fermées et la liste cleared"""
         game = FakeGame()
         ws_x = FakeWS()
         ws_o = FakeWS()
-        game.connected[ws_x] = "X"
-        game.connected[ws_o] = "O"
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_o, "O")
         helper = WebsocketHelper(game)
 
         await helper.close_all_connections()
@@ -100,5 +240,55 @@ class TestWebsocketHelper(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(ws_o.closed)
         self.assertEqual(game.connected, {})
 
+    async def test_broadcast_slow_client_is_dropped(self):
+        """Un client lent est retiré sans bloquer les autres"""
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_slow = SlowWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_slow, "S")
+        helper = WebsocketHelper(game)
+
+        with unittest.mock.patch.object(Outbox, "SEND_TIMEOUT", 0.05):
+            await asyncio.wait_for(helper.broadcast("state"), 1)
+
+        self.assertIn("state", ws_x.sent)
+        self.assertNotIn(ws_slow, game.connected)
+        self.assertIn(ws_x, game.connected)
+        await ws_slow.outbox.close_task
+        self.assertTrue(ws_slow.closed)
+
+    async def test_broadcast_broken_client_is_dropped(self):
+        """Un envoi en erreur retire le client"""
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_broken = BrokenWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_broken, "O")
+        helper = WebsocketHelper(game)
+
+        await helper.broadcast("hello")
+        self.assertEqual(ws_x.sent, ["hello"])
+        self.assertEqual(game.connected, {ws_x: "X"})
+
+    async def test_close_all_connections_with_slow_close(self):
+        """Une fermeture lente ne bloque pas les autres"""
+        class SlowCloseWS(FakeWS):
+            async def close(self, code=1000, reason=""):
+                await asyncio.sleep(3600)
+
+        game = FakeGame()
+        ws_x = FakeWS()
+        ws_slow = SlowCloseWS()
+        game.add_connection(ws_x, "X")
+        game.add_connection(ws_slow, "O")
+        helper = WebsocketHelper(game)
+
+        with unittest.mock.patch.object(Outbox, "CLOSE_TIMEOUT", 0.05):
+            await asyncio.wait_for(helper.close_all_connections(), 1)
+
+        self.assertTrue(ws_x.closed)
+        self.assertEqual(game.connected, {})
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,18 @@
+import asyncio
+import socket
 import unittest
 
+import websockets
 from sanic import Sanic
 from sanic_testing import TestManager
+from websockets.exceptions import ConnectionClosed
 
 from routes.websocket_routes import register_websocket_routes
-from classes.Game import Game
+from classes.GridGame import create_game
+from classes.LocalBackplane import LocalBackplane, LocalHub
+from classes.MessageGuard import MessageGuard
+from classes.RoomManager import RoomManager
+from classes.SessionManager import SessionManager
 
 
 class TestWebsocketRoutes(unittest.TestCase):
@@ -13,8 +21,8 @@ class TestWebsocketRoutes(unittest.TestCase):
         self.app = Sanic("test_app_websocket", configure_logging=False)
         TestManager(self.app)
 
-        self.game = Game()
-        register_websocket_routes(self.app, self.game)
+        self.rooms = RoomManager()
+        register_websocket_routes(self.app, self.rooms)
 
     def test_ws_route_is_registered(self):
         """
@@ -23,6 +31,13 @@ class TestWebsocketRoutes(unittest.TestCase):
         routes = [route.path for route in self.app.router.routes]
         self.assertIn("ws", routes)  # Sanic stores paths without leading /
 
+    def test_ws_room_route_is_registered(self):
+        """
+        The /ws/<room_id> route exists in the router
+        """
+        routes = [route.path for route in self.app.router.routes]
+        self.assertTrue(any(path.startswith("ws/<room_id") for path in routes))
+
     def test_ws_handshake_does_not_crash(self):
         """
         Basic WebSocket handshake test.
@@ -36,6 +51,420 @@ class TestWebsocketRoutes(unittest.TestCase):
             # This still means the route was registered correctly
             self.assertTrue(True)
 
+    def test_ws_room_handshake_does_not_crash(self):
+        """
+        WebSocket handshake on a named room.
+        """
+        try:
+            ws, _ = self.app.test_client.websocket("/ws/room-1")
+            self.assertIsNotNone(ws)
+        except RuntimeError:
+            self.assertTrue(True)
+
+    def test_ws_room_options_configure_board(self):
+        """
+        Query options (?size=&win=) configure the board of a new room.
+        """
+        self.rooms.game_factory = create_game
+        received = []
+
+        async def client(ws):
+            received.append(await ws.recv())
+            received.append(await ws.recv())
+
+        self.app.test_client.websocket(
+            "/ws/big?size=15&win=5", mimic=client
+        )
+
+        self.assertEqual(received, ["YOU|O", "," * 224 + "|X"])
+
+    def test_ws_session_identifies_user(self):
+        """
+        The signed session cookie identifies the player; raw id/username
+        cookies are ignored.
+        """
+        sessions = SessionManager(b"secret")
+        token = sessions.issue(4, "Alice")
+        users = []
+
+        for n, cookie in enumerate(
+            (f"session={token}", "id=1; username=Mallory")
+        ):
+            app = Sanic(f"test_app_ws_session_{n}", configure_logging=False)
+            TestManager(app)
+            rooms = RoomManager()
+            register_websocket_routes(app, rooms, sessions=sessions)
+
+            async def client(ws):
+                await ws.recv()
+                game = rooms.get("auth")
+                users.extend((w.user_id, w.username) for w in game.connected)
+
+            app.test_client.websocket(
+                "/ws/auth", mimic=client, extra_headers={"cookie": cookie}
+            )
+
+        self.assertEqual(users, [(4, "Alice"), (None, None)])
+
+    def test_ws_delta_protocol_snapshot_and_resync(self):
+        """
+        Delta clients get a numbered snapshot on join and on SYNC.
+        """
+        received = []
+
+        async def client(ws):
+            received.append(await ws.recv())
+            received.append(await ws.recv())
+            await ws.send("SYNC")
+            received.append(await ws.recv())
+
+        self.app.test_client.websocket("/ws?proto=delta", mimic=client)
+
+        self.assertEqual(
+            received,
+            ["YOU|O", "SNAP|0|,,,,,,,,|X", "SNAP|0|,,,,,,,,|X"]
+        )
+
+    def test_ws_binary_protocol(self):
+        """
+        Binary clients get binary control and board messages.
+        """
+        received = []
+
+        async def client(ws):
+            received.append(await ws.recv())
+            received.append(await ws.recv())
+            await ws.send(b"\x11")
+            received.append(await ws.recv())
+
+        self.app.test_client.websocket("/ws?proto=binary", mimic=client)
+
+        snapshot = b"\x02\x00\x00\x00\x00\x03\x01\x00\x00\x00"
+        self.assertEqual(received, [b"\x01\x02", snapshot, snapshot])
+
+    def test_ws_room_with_invalid_options_is_closed(self):
+        """
+        A room requested with invalid board options is never created.
+        """
+        self.rooms.game_factory = create_game
+        received = []
+
+        async def client(ws):
+            try:
+                received.append(await ws.recv())
+            except ConnectionClosed as e:
+                received.append(e.rcvd.code)
+
+        try:
+            self.app.test_client.websocket("/ws/big?size=50", mimic=client)
+        except ValueError:
+            # sanic-testing re-raises the close frame sent by the server
+            pass
+
+        self.assertEqual(received, [1008])
+        self.assertNotIn("big", self.rooms)
+
+
+class TestWebsocketRoutesBackplane(unittest.IsolatedAsyncioTestCase):
+    """Two workers sharing a backplane, each with its own RoomManager."""
+
+    async def asyncSetUp(self):
+        self.hub = LocalHub()
+        self.sessions = SessionManager(b"secret")
+        self.workers = []
+        self.guards = []
+        self.servers = []
+
+        for name in ("w1", "w2"):
+            app = Sanic(f"test_app_backplane_{name}", configure_logging=False)
+            app.config.RECONNECT_GRACE = 0.2
+            rooms = RoomManager()
+            backplane = LocalBackplane(self.hub, name)
+            guard = MessageGuard(rate=1, burst=5, max_rejected=10)
+            app.config.WEBSOCKET_MAX_SIZE = 4 * guard.max_frame_size
+            register_websocket_routes(
+                app, rooms, backplane, sessions=self.sessions, guard=guard
+            )
+            await backplane.start()
+
+            # Port libre choisi par le système
+            sock = socket.socket()
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+            server = await app.create_server(
+                sock=sock, return_asyncio_server=True
+            )
+            await server.startup()
+
+            self.workers.append((rooms, backplane, port))
+            self.guards.append(guard)
+            self.servers.append(server)
+
+    async def asyncTearDown(self):
+        for server in self.servers:
+            await server.close()
+        for _, backplane, _ in self.workers:
+            await backplane.close()
+
+    def url(self, worker, path):
+        return f"ws://127.0.0.1:{self.workers[worker][2]}{path}"
+
+    def connect(self, worker, path, user_id=None):
+        headers = None
+        if user_id is not None:
+            token = self.sessions.issue(user_id, f"user{user_id}")
+            headers = {"cookie": f"session={token}"}
+        return websockets.connect(
+            self.url(worker, path), additional_headers=headers
+        )
+
+    async def recv_all(self, ws, timeout=0.2):
+        messages = []
+        try:
+            while True:
+                messages.append(await asyncio.wait_for(ws.recv(), timeout))
+        except (asyncio.TimeoutError, websockets.ConnectionClosed):
+            pass
+        return messages
+
+    async def test_players_on_different_workers_share_one_board(self):
+        rooms_1, _, _ = self.workers[0]
+        rooms_2, _, _ = self.workers[1]
+
+        async with websockets.connect(self.url(0, "/ws/r1")) as o, \
+                websockets.connect(self.url(1, "/ws/r1")) as x:
+            self.assertEqual(
+                await self.recv_all(o), ["YOU|O", ",,,,,,,,|X", ",,,,,,,,|X"]
+            )
+            self.assertEqual(await self.recv_all(x), ["YOU|X", ",,,,,,,,|X"])
+
+            # La salle n'existe que sur le worker propriétaire
+            self.assertIn("r1", rooms_1)
+            self.assertNotIn("r1", rooms_2)
+            self.assertEqual(len(rooms_1.get("r1").connected), 2)
+
+            for sock, cell in [(x, 0), (o, 3), (x, 1), (o, 4), (x, 2)]:
+                await sock.send(str(cell))
+                await asyncio.sleep(0.02)
+
+            final = ["X,X,X,O,O,,,,|X", "WIN|X"]
+            self.assertEqual((await self.recv_all(x))[-2:], final)
+            self.assertEqual((await self.recv_all(o))[-2:], final)
+
+        await asyncio.sleep(0.05)
+        self.assertNotIn("r1", rooms_1)
+        self.assertEqual(self.hub.owners, {})
+
+    async def test_remote_client_leaving_frees_its_seat(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with websockets.connect(self.url(0, "/ws/r2")) as o:
+            async with websockets.connect(self.url(1, "/ws/r2")):
+                await asyncio.sleep(0.05)
+                self.assertEqual(len(rooms_1.get("r2").connected), 2)
+
+            await asyncio.sleep(0.05)
+            self.assertEqual(
+                list(rooms_1.get("r2").connected.values()), ["O"]
+            )
+            self.assertEqual((await self.recv_all(o, 0.05))[-1], "WAIT|X")
+
+    async def test_client_of_dead_owner_is_closed(self):
+        """Propriétaire injoignable : le client est fermé avec 1013"""
+        self.hub.owners["r9"] = "ghost"
+
+        async with websockets.connect(self.url(0, "/ws/r9")) as ws:
+            await self.recv_all(ws, 0.1)
+            self.assertEqual(ws.close_code, 1013)
+
+    async def test_abandoned_game_is_reset_after_grace_period(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with websockets.connect(self.url(0, "/ws/r3")) as o:
+            async with websockets.connect(self.url(0, "/ws/r3")) as x:
+                await self.recv_all(x, 0.05)
+                await x.send("4")
+                await asyncio.sleep(0.05)
+
+            self.assertEqual(
+                await self.recv_all(o, 0.05),
+                ["YOU|O", ",,,,,,,,|X", ",,,,,,,,|X", ",,,,X,,,,|O",
+                 "WAIT|X"]
+            )
+
+            # Les coups attendent le retour de l'adversaire
+            await o.send("0")
+            self.assertEqual(await self.recv_all(o, 0.05), [])
+            self.assertEqual(rooms_1.get("r3").board[0], "")
+
+            messages = await self.recv_all(o, 0.3)
+            self.assertTrue(messages[0].startswith("DISC|"))
+            self.assertEqual(messages[1], ",,,,,,,,|X")
+
+    async def test_player_back_within_grace_period_keeps_the_game(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with websockets.connect(self.url(0, "/ws/r4")) as o:
+            async with websockets.connect(self.url(0, "/ws/r4")) as x:
+                await self.recv_all(x, 0.05)
+                await x.send("4")
+                await asyncio.sleep(0.05)
+
+            async with websockets.connect(self.url(1, "/ws/r4")) as x:
+                self.assertEqual(
+                    await self.recv_all(x, 0.05),
+                    ["YOU|X", ",,,,X,,,,|O", "BACK|X"]
+                )
+                self.assertEqual(
+                    (await self.recv_all(o, 0.05))[-3:],
+                    ["WAIT|X", ",,,,X,,,,|O", "BACK|X"]
+                )
+
+                # Le délai expiré ne réinitialise pas la partie reprise
+                await asyncio.sleep(0.3)
+                self.assertEqual(await self.recv_all(o, 0.05), [])
+                await o.send("0")
+                await asyncio.sleep(0.05)
+                self.assertEqual(rooms_1.get("r4").board[0], "O")
+
+    async def test_reconnecting_user_gets_reserved_seat_back(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with self.connect(0, "/ws/r5", user_id=1) as o:
+            async with self.connect(0, "/ws/r5", user_id=2) as x:
+                await self.recv_all(x, 0.05)
+                await x.send("4")
+                await asyncio.sleep(0.05)
+
+            self.assertEqual(rooms_1.get("r5").reserved, {"X": 2})
+
+            # La place réservée n'est pas attribuée à un autre client
+            async with self.connect(0, "/ws/r5") as other, \
+                    self.connect(0, "/ws/r5", user_id=3) as third:
+                for ws in (other, third):
+                    self.assertEqual((await self.recv_all(ws, 0.05))[0],
+                                     "YOU|S")
+
+            # Retour de l'utilisateur, relayé par l'autre worker
+            async with self.connect(1, "/ws/r5", user_id=2) as x:
+                self.assertEqual(
+                    await self.recv_all(x, 0.05),
+                    ["YOU|X", ",,,,X,,,,|O", "BACK|X"]
+                )
+                self.assertEqual(rooms_1.get("r5").reserved, {})
+
+                await o.send("0")
+                await asyncio.sleep(0.3)
+                self.assertEqual(rooms_1.get("r5").board[0], "O")
+                self.assertFalse(
+                    any(m.startswith("DISC|") for m in await self.recv_all(o))
+                )
+
+    async def test_second_tab_joins_as_spectator(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with self.connect(0, "/ws/r6", user_id=1) as o, \
+                self.connect(0, "/ws/r6", user_id=2) as first:
+            await self.recv_all(first, 0.05)
+            await first.send("4")
+            await asyncio.sleep(0.05)
+
+            # Le premier onglet est toujours ouvert : il garde sa place
+            async with self.connect(0, "/ws/r6", user_id=2) as second:
+                self.assertEqual(
+                    await self.recv_all(second, 0.05),
+                    ["YOU|S", ",,,,X,,,,|O"]
+                )
+                await self.recv_all(first, 0.05)
+                self.assertIsNone(first.close_code)
+
+                game = rooms_1.get("r6")
+                self.assertEqual(len(game.connected), 3)
+                self.assertEqual(game.connected[game.seats["X"]], "X")
+                self.assertEqual(len(game.spectators), 1)
+
+                # Les coups du second onglet sont ignorés
+                await o.send("0")
+                await asyncio.sleep(0.05)
+                await second.send("1")
+                await asyncio.sleep(0.05)
+                self.assertEqual(game.board[1], "")
+
+    async def test_room_and_spectator_limits(self):
+        rooms_1, _, _ = self.workers[0]
+        rooms_1.max_spectators = 1
+
+        async with self.connect(0, "/ws/r7") as o, \
+                self.connect(0, "/ws/r7") as x, \
+                self.connect(0, "/ws/r7") as s1, \
+                self.connect(1, "/ws/r7") as s2:
+            self.assertEqual((await self.recv_all(s1, 0.05))[0], "YOU|S")
+            self.assertEqual(await self.recv_all(s2, 0.05), [])
+            self.assertEqual(s2.close_code, 1013)
+            self.assertEqual(len(rooms_1.get("r7").spectators), 1)
+            await self.recv_all(o, 0.01)
+            await self.recv_all(x, 0.01)
+
+        rooms_1.max_rooms = 0
+        async with self.connect(0, "/ws/r8") as ws:
+            self.assertEqual(await self.recv_all(ws, 0.05), [])
+            self.assertEqual(ws.close_code, 1013)
+        self.assertNotIn("r8", rooms_1)
+        await asyncio.sleep(0.05)
+        self.assertNotIn("r8", self.hub.owners)
+
+    async def test_flooding_client_is_limited_then_closed(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with self.connect(0, "/ws/r9") as o, \
+                self.connect(1, "/ws/r9") as x:
+            await self.recv_all(o, 0.05)
+            await self.recv_all(x, 0.05)
+
+            # Rafale de 5 messages permise, les suivants sont ignorés
+            for _ in range(8):
+                await x.send("SYNC")
+            self.assertEqual(len(await self.recv_all(x, 0.05)), 5)
+            self.assertEqual(self.guards[1].rejected["ws_rate"], 3)
+
+            # Au-delà de 10 refus, le client est fermé
+            for _ in range(20):
+                await x.send("SYNC")
+            await self.recv_all(x, 0.1)
+            self.assertEqual(x.close_code, 1008)
+            self.assertEqual(self.guards[1].closed, 1)
+
+            # L'autre joueur n'est pas affecté
+            self.assertEqual((await self.recv_all(o, 0.05))[-1], "WAIT|X")
+            self.assertEqual(self.guards[0].stats()["rejected"]["ws_rate"], 0)
+
+    async def test_large_frame_closes_client(self):
+        rooms_1, _, _ = self.workers[0]
+
+        async with self.connect(0, "/ws/r10") as o:
+            await self.recv_all(o, 0.05)
+            await o.send("4" * 100)
+            await self.recv_all(o, 0.05)
+
+            self.assertEqual(o.close_code, 1009)
+            self.assertEqual(self.guards[0].rejected["too_large"], 1)
+            self.assertNotIn("r10", rooms_1)
+
+    async def test_oversized_frame_rejected_by_protocol(self):
+        """Trame au-delà de WEBSOCKET_MAX_SIZE : refusée avant le filtre"""
+        rooms_1, _, _ = self.workers[0]
+
+        async with self.connect(0, "/ws/r11") as o:
+            await self.recv_all(o, 0.05)
+            await o.send("4" * 100_000)
+            await self.recv_all(o, 0.1)
+            await asyncio.sleep(0.2)  # Fin de la fermeture côté serveur
+
+            self.assertEqual(o.close_code, 1009)
+            self.assertEqual(self.guards[0].rejected["too_large"], 0)
+            self.assertNotIn("r11", rooms_1)
+
 
 if __name__ == "__main__":
     unittest.main()